@@ -0,0 +1,73 @@
+"""Generates synthetic videos.txt catalogs of any size.
+
+The same count and seed always produce the same file. Title words and tags
+are drawn from fixed vocabularies with a Zipf-like popularity, so a few
+words and tags are very common and most are rare, as on a real site.
+
+Run from the python/ directory:
+    python3 -m benchmarks.catalog_generator number_of_videos FILE [seed]
+"""
+
+from itertools import accumulate
+import random
+import sys
+
+TITLE_WORDS = 5000
+TAGS = 2000
+# Exponent of the Zipf-like distributions of title words and tags.
+ZIPF_EXPONENT = 1.1
+MIN_TITLE_WORDS, MAX_TITLE_WORDS = 1, 8
+MAX_TAGS = 5
+
+_SYLLABLES = [consonant + vowel
+              for consonant in "bcdfghjklmnprstvwz"
+              for vowel in "aeiou"]
+
+
+def _vocabulary(rng, size, syllables):
+    """Returns size distinct made-up words, most popular first."""
+    words, seen = [], set()
+    while len(words) < size:
+        word = "".join(rng.choices(_SYLLABLES, k=rng.randint(*syllables)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def _zipf_weights(size):
+    return list(accumulate(1 / rank ** ZIPF_EXPONENT for rank in range(1, size + 1)))
+
+
+def generate_rows(count, seed=0):
+    """Yields (title, video_id, tags) for count synthetic videos.
+
+    Args:
+        count: The number of videos.
+        seed: Seed of the generator; the same seed gives the same rows.
+    """
+    rng = random.Random(seed)
+    words = [word.capitalize() for word in _vocabulary(rng, TITLE_WORDS, (1, 4))]
+    tags = ["#" + tag for tag in _vocabulary(rng, TAGS, (2, 3))]
+    word_weights = _zipf_weights(len(words))
+    tag_weights = _zipf_weights(len(tags))
+    choices, randint = rng.choices, rng.randint
+    for number in range(count):
+        title = " ".join(choices(words, cum_weights=word_weights,
+                                 k=randint(MIN_TITLE_WORDS, MAX_TITLE_WORDS)))
+        # Popular tags are drawn more than once; a video lists each tag once.
+        video_tags = list(dict.fromkeys(
+            choices(tags, cum_weights=tag_weights, k=randint(0, MAX_TAGS))))
+        yield title, f"video_{number:08d}_id", video_tags
+
+
+def write_catalog(path, count, seed=0):
+    """Writes count synthetic videos to path in the videos.txt format."""
+    with open(path, "w", encoding="utf-8") as video_file:
+        video_file.writelines(f"{title} | {video_id} | {' , '.join(tags)}\n"
+                              for title, video_id, tags in generate_rows(count, seed))
+
+
+if __name__ == "__main__":
+    write_catalog(sys.argv[2], int(sys.argv[1]),
+                  int(sys.argv[3]) if len(sys.argv) > 3 else 0)
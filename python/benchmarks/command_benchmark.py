@@ -0,0 +1,197 @@
+"""Times every VideoPlayer command on synthetic catalogs of growing size.
+
+Every command is run through CommandParser, as the prompt would, until it
+has run for at least --min-time seconds. The results are printed and, with
+--output, written as JSON so that runs on different commits can be compared
+with --compare.
+
+Run from the python/ directory:
+    python3 -m benchmarks.command_benchmark --sizes 1000 100000 --output new.json
+    python3 -m benchmarks.command_benchmark --compare old.json new.json
+"""
+
+from benchmarks.catalog_generator import generate_rows, write_catalog
+from src.command_parser import CommandParser
+from src.output import BufferWriter
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+from collections import Counter
+from pathlib import Path
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+FORMAT_VERSION = 1
+
+
+def _commit():
+    """Returns the commit the benchmark runs on, None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True,
+                              cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time_runs(run, min_time, max_runs):
+    """Calls run() until min_time seconds or max_runs calls, returns the timings."""
+    timings = []
+    total = 0.0
+    while total < min_time and len(timings) < max_runs:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        total += elapsed
+    return timings
+
+
+def _misspell(word):
+    """Returns word with its second letter dropped, as a typo would."""
+    return word[:1] + word[2:] if len(word) > 2 else word
+
+
+def _workload(count, seed):
+    """Returns the commands to time, as (name, [command, ...]) pairs.
+
+    The commands of a pair are run in turn, so that a pair such as flag
+    and allow leaves the player as it found it.
+    """
+    rows = generate_rows(min(count, 1000), seed)
+    words, tags = Counter(), Counter()
+    for title, _, video_tags in rows:
+        words.update(title.split())
+        tags.update(video_tags)
+    common_word, _ = words.most_common(1)[0]
+    rare_word, _ = words.most_common()[-1]
+    (common_tag, _), (second_tag, _) = tags.most_common(2)
+    rare_tag, _ = tags.most_common()[-1]
+    video_id = "video_00000000_id"
+    return [
+        ("NUMBER_OF_VIDEOS", [["NUMBER_OF_VIDEOS"]]),
+        ("SHOW_ALL_VIDEOS", [["SHOW_ALL_VIDEOS"]]),
+        ("PLAY + STOP", [["PLAY", video_id], ["STOP"]]),
+        ("PLAY_RANDOM", [["PLAY_RANDOM"]]),
+        ("SHOW_PLAYING", [["SHOW_PLAYING"]]),
+        ("SEARCH_VIDEOS common", [["SEARCH_VIDEOS", common_word]]),
+        ("SEARCH_VIDEOS rare", [["SEARCH_VIDEOS", rare_word]]),
+        ("SEARCH_VIDEOS common limit 10", [["SEARCH_VIDEOS", common_word, "10"]]),
+        ("SEARCH_VIDEOS_FUZZY common", [["SEARCH_VIDEOS_FUZZY", _misspell(common_word)]]),
+        ("SEARCH_VIDEOS_FUZZY rare", [["SEARCH_VIDEOS_FUZZY", _misspell(rare_word)]]),
+        ("SEARCH_VIDEOS_WITH_TAG common", [["SEARCH_VIDEOS_WITH_TAG", common_tag]]),
+        ("SEARCH_VIDEOS_WITH_TAG rare", [["SEARCH_VIDEOS_WITH_TAG", rare_tag]]),
+        ("SEARCH_VIDEOS_WITH_TAG common limit 10",
+         [["SEARCH_VIDEOS_WITH_TAG", common_tag, "10"]]),
+        ("SEARCH_VIDEOS_WITH_TAG_QUERY",
+         [["SEARCH_VIDEOS_WITH_TAG_QUERY", common_tag, "AND", "NOT", second_tag]]),
+        ("SEARCH_VIDEOS_WITH_TAG_QUERY rare",
+         [["SEARCH_VIDEOS_WITH_TAG_QUERY", rare_tag, "AND", "NOT", common_tag]]),
+        ("CREATE_PLAYLIST + DELETE_PLAYLIST",
+         [["CREATE_PLAYLIST", "benchmark"], ["DELETE_PLAYLIST", "benchmark"]]),
+        ("ADD_TO_PLAYLIST + REMOVE_FROM_PLAYLIST",
+         [["ADD_TO_PLAYLIST", "kept", video_id],
+          ["REMOVE_FROM_PLAYLIST", "kept", video_id]]),
+        ("SHOW_PLAYLIST", [["SHOW_PLAYLIST", "kept"]]),
+        ("SHOW_ALL_PLAYLISTS", [["SHOW_ALL_PLAYLISTS"]]),
+        ("FLAG_VIDEO + ALLOW_VIDEO",
+         [["FLAG_VIDEO", video_id, "benchmark"], ["ALLOW_VIDEO", video_id]]),
+    ]
+
+
+def benchmark(count, seed=0, min_time=0.2, max_runs=1000, directory=None):
+    """Times loading a catalog of count videos and every command on it.
+
+    Returns:
+        A list of result dicts, one per timed operation.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as directory:
+        video_file = Path(directory) / "videos.txt"
+        write_catalog(video_file, count, seed)
+        results = []
+
+        def record(name, timings):
+            results.append({
+                "videos": count, "command": name, "runs": len(timings),
+                "mean_s": statistics.fmean(timings),
+                "median_s": statistics.median(timings),
+                "min_s": min(timings),
+            })
+
+        record("load", _time_runs(lambda: VideoLibrary(video_file),
+                                  min_time, max(1, max_runs // 100)))
+        output = BufferWriter()
+        player = VideoPlayer(VideoLibrary(video_file), output, interactive=False)
+        parser = CommandParser(player)
+        parser.execute_command(["CREATE_PLAYLIST", "kept"])
+        for add in range(100):
+            parser.execute_command(["ADD_TO_PLAYLIST", "kept", f"video_{add + 1:08d}_id"])
+
+        for name, commands in _workload(count, seed):
+            def run():
+                for command in commands:
+                    parser.execute_command(command)
+                    if player.awaiting_answer:
+                        player.answer("")
+                output.drain()
+            # The first run warms up the lazily built structures.
+            run()
+            record(name, _time_runs(run, min_time, max_runs))
+        return results
+
+
+def compare(old, new):
+    """Prints the median time of every operation of new relative to old."""
+    old_medians = {(result["videos"], result["command"]): result["median_s"]
+                   for result in old["results"]}
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for result in new["results"]:
+        key = (result["videos"], result["command"])
+        before = old_medians.get(key)
+        ratio = "" if not before else f"{result['median_s'] / before:8.2f}x"
+        print(f"{result['videos']:>9} {result['command']:40} "
+              f"{result['median_s'] * 1e3:12.4f} ms {ratio}")
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("--sizes", type=int, nargs="+",
+                                 default=[1000, 10000, 100000],
+                                 help="catalog sizes to benchmark")
+    argument_parser.add_argument("--seed", type=int, default=0)
+    argument_parser.add_argument("--min-time", type=float, default=0.2,
+                                 help="seconds to spend timing each command")
+    argument_parser.add_argument("--output", metavar="FILE",
+                                 help="write the results to FILE as JSON")
+    argument_parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                                 help="compare two result files and exit")
+    arguments = argument_parser.parse_args(argv)
+    if arguments.compare:
+        old, new = (json.loads(Path(path).read_text()) for path in arguments.compare)
+        compare(old, new)
+        return
+
+    report = {
+        "format": FORMAT_VERSION,
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": arguments.seed,
+        "results": [],
+    }
+    for count in arguments.sizes:
+        results = benchmark(count, arguments.seed, arguments.min_time)
+        report["results"].extend(results)
+        for result in results:
+            print(f"{count:>9} {result['command']:40} "
+                  f"{result['median_s'] * 1e3:12.4f} ms ({result['runs']} runs)")
+    if arguments.output:
+        Path(arguments.output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
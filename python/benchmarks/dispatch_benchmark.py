@@ -0,0 +1,126 @@
+"""Measures CommandParser dispatch throughput, without the player's work.
+
+The registered command table is timed against the if/elif chain that
+CommandParser used before it, with the same no-op player behind both.
+
+Run from the python/ directory:
+    python3 -m benchmarks.dispatch_benchmark [number_of_commands]
+"""
+
+from src.command_parser import CommandException, CommandParser
+import sys
+import time
+
+COMMANDS = [
+    ["NUMBER_OF_VIDEOS"], ["show_all_videos"], ["PLAY", "id"], ["PLAY_RANDOM"],
+    ["STOP"], ["PAUSE"], ["CONTINUE"], ["SHOW_PLAYING"],
+    ["CREATE_PLAYLIST", "p"], ["ADD_TO_PLAYLIST", "p", "id"],
+    ["REMOVE_FROM_PLAYLIST", "p", "id"], ["CLEAR_PLAYLIST", "p"],
+    ["DELETE_PLAYLIST", "p"], ["SHOW_PLAYLIST", "p"], ["SHOW_ALL_PLAYLISTS"],
+    ["SEARCH_VIDEOS", "cat"], ["SEARCH_VIDEOS_WITH_TAG", "#cat"],
+    ["FLAG_VIDEO", "id", "reason"], ["ALLOW_VIDEO", "id"],
+]
+
+
+class _NullPlayer:
+    """A player whose commands do nothing, so only dispatch is timed."""
+
+    output = None
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+class _ChainParser:
+    """The if/elif dispatch CommandParser used before the command table."""
+
+    def __init__(self, video_player):
+        self._player = video_player
+
+    def execute_command(self, command):
+        if not command:
+            raise CommandException("Please enter a valid command.")
+        if command[0].upper() == "NUMBER_OF_VIDEOS":
+            self._player.number_of_videos()
+        elif command[0].upper() == "SHOW_ALL_VIDEOS":
+            self._player.show_all_videos()
+        elif command[0].upper() == "PLAY":
+            if len(command) != 2:
+                raise CommandException("Please enter PLAY command followed by video_id.")
+            self._player.play_video(command[1])
+        elif command[0].upper() == "PLAY_RANDOM":
+            self._player.play_random_video()
+        elif command[0].upper() == "STOP":
+            self._player.stop_video()
+        elif command[0].upper() == "PAUSE":
+            self._player.pause_video()
+        elif command[0].upper() == "CONTINUE":
+            self._player.continue_video()
+        elif command[0].upper() == "SHOW_PLAYING":
+            self._player.show_playing()
+        elif command[0].upper() == "CREATE_PLAYLIST":
+            if len(command) != 2:
+                raise CommandException("Please enter CREATE_PLAYLIST command.")
+            self._player.create_playlist(command[1])
+        elif command[0].upper() == "ADD_TO_PLAYLIST":
+            if len(command) != 3:
+                raise CommandException("Please enter ADD_TO_PLAYLIST command.")
+            self._player.add_to_playlist(command[1], command[2])
+        elif command[0].upper() == "REMOVE_FROM_PLAYLIST":
+            if len(command) != 3:
+                raise CommandException("Please enter REMOVE_FROM_PLAYLIST command.")
+            self._player.remove_from_playlist(command[1], command[2])
+        elif command[0].upper() == "CLEAR_PLAYLIST":
+            if len(command) != 2:
+                raise CommandException("Please enter CLEAR_PLAYLIST command.")
+            self._player.clear_playlist(command[1])
+        elif command[0].upper() == "DELETE_PLAYLIST":
+            if len(command) != 2:
+                raise CommandException("Please enter DELETE_PLAYLIST command.")
+            self._player.delete_playlist(command[1])
+        elif command[0].upper() == "SHOW_PLAYLIST":
+            if len(command) != 2:
+                raise CommandException("Please enter SHOW_PLAYLIST command.")
+            self._player.show_playlist(command[1])
+        elif command[0].upper() == "SHOW_ALL_PLAYLISTS":
+            self._player.show_all_playlists()
+        elif command[0].upper() == "SEARCH_VIDEOS":
+            if len(command) != 2:
+                raise CommandException("Please enter SEARCH_VIDEOS command.")
+            self._player.search_videos(command[1])
+        elif command[0].upper() == "SEARCH_VIDEOS_WITH_TAG":
+            if len(command) != 2:
+                raise CommandException("Please enter SEARCH_VIDEOS_WITH_TAG command.")
+            self._player.search_videos_tag(command[1])
+        elif command[0].upper() == "FLAG_VIDEO":
+            if len(command) == 3:
+                self._player.flag_video(command[1], command[2])
+            elif len(command) == 2:
+                self._player.flag_video(command[1])
+            else:
+                raise CommandException("Please enter FLAG_VIDEO command.")
+        elif command[0].upper() == "ALLOW_VIDEO":
+            if len(command) != 2:
+                raise CommandException("Please enter ALLOW_VIDEO command.")
+            self._player.allow_video(command[1])
+        elif command[0].upper() == "HELP":
+            pass
+        else:
+            pass
+
+
+def _time(parser, commands):
+    start = time.perf_counter()
+    for command in commands:
+        parser.execute_command(command)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    commands = (COMMANDS * (count // len(COMMANDS) + 1))[:count]
+    print(f"commands:        {count}")
+    for name, parser in [("if/elif chain", _ChainParser(_NullPlayer())),
+                         ("command table", CommandParser(_NullPlayer()))]:
+        elapsed = _time(parser, commands)
+        print(f"{name + ':':16} {count / elapsed:12,.0f} commands/s ({elapsed:.3f} s)")
@@ -0,0 +1,31 @@
+"""Measures how loading a catalog scales with the number of ingest workers.
+
+Run from the python/ directory:
+    python3 -m benchmarks.ingest_benchmark [number_of_videos] [max_workers]
+"""
+
+from benchmarks.catalog_generator import write_catalog
+from src.video_library import VideoLibrary
+from pathlib import Path
+import os
+import sys
+import tempfile
+import time
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    print(f"videos: {count}, cpus: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as directory:
+        video_file = Path(directory) / "videos.txt"
+        write_catalog(video_file, count)
+        baseline = None
+        workers = 1
+        while workers <= max_workers:
+            start = time.perf_counter()
+            VideoLibrary(video_file, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"workers {workers:>3}: {elapsed:8.3f} s  speedup {baseline / elapsed:5.2f}x")
+            workers *= 2
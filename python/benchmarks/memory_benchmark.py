@@ -0,0 +1,61 @@
+"""Compares the memory used by the columnar catalog with one object per video.
+
+Run from the python/ directory:
+    python3 -m benchmarks.memory_benchmark [number_of_videos]
+"""
+
+from src.video_catalog import ColumnarCatalog
+import random
+import sys
+import tracemalloc
+
+TAGS = [f"#tag{number}" for number in range(200)]
+
+
+class _DictVideo:
+    """The previous Video layout: one object with a __dict__ per video."""
+
+    def __init__(self, video_title, video_id, video_tags):
+        self._title = video_title
+        self._video_id = video_id
+        self._flagged = False
+        self._flagged_reason = None
+        self._tags = tuple(video_tags)
+
+
+def _rows(count):
+    rng = random.Random(0)
+    for number in range(count):
+        yield (f"Video number {number}", f"video_{number:08d}_id",
+               [f"{tag}" for tag in rng.sample(TAGS, rng.randint(0, 4))])
+
+
+def _measure(build, count):
+    rows = list(_rows(count))
+    tracemalloc.start()
+    store = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return size
+
+
+def _build_objects(rows):
+    return {url: _DictVideo(title, url, tags) for title, url, tags in rows}
+
+
+def _build_columns(rows):
+    catalog = ColumnarCatalog()
+    for title, url, tags in rows:
+        catalog.append(title, url, tags)
+    return catalog
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    objects = _measure(_build_objects, count)
+    columns = _measure(_build_columns, count)
+    print(f"videos:            {count}")
+    print(f"objects + dict:    {objects / 2 ** 20:8.1f} MiB")
+    print(f"columnar catalog:  {columns / 2 ** 20:8.1f} MiB")
+    print(f"saved:             {100 * (1 - columns / objects):8.1f} %")
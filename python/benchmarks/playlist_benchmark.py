@@ -0,0 +1,65 @@
+"""Times the positional operations of Playlist on playlists of growing size.
+
+Each operation is compared with the same operation on a plain list of
+video_ids, which is what reordering a dict-backed playlist amounts to.
+
+Run from the python/ directory:
+    python3 -m benchmarks.playlist_benchmark [size ...]
+"""
+
+from src.video_playlist import Playlist
+from collections import namedtuple
+import random
+import sys
+import time
+
+OPERATIONS = 2000
+
+# Only the video_id of a video is used by the playlist.
+_Video = namedtuple("_Video", "video_id")
+
+
+def _time(operation, rng, size):
+    start = time.perf_counter()
+    for _ in range(OPERATIONS):
+        operation(rng.randrange(size))
+    return (time.perf_counter() - start) / OPERATIONS
+
+
+def benchmark(size, seed=0):
+    """Returns (name, playlist seconds, list seconds) per operation."""
+    rng = random.Random(seed)
+    playlist, video_ids = Playlist("benchmark"), []
+    for number in range(size):
+        playlist.add_video(_Video(f"video_{number}"))
+        video_ids.append(f"video_{number}")
+    inserted = iter(range(size, size + 2 * OPERATIONS))
+
+    def playlist_move(position):
+        playlist.move_video(video_ids[position], rng.randrange(size))
+
+    def list_move(position):
+        video_id = video_ids.pop(position)
+        video_ids.insert(rng.randrange(size), video_id)
+
+    results = [
+        ("insert at", _time(lambda position: playlist.insert_video(
+            position, _Video(f"video_{next(inserted)}")), rng, size),
+         _time(lambda position: video_ids.insert(
+             position, f"video_{next(inserted)}"), rng, size)),
+        ("video at", _time(lambda position: playlist.range(position, 1), rng, size),
+         _time(lambda position: video_ids[position], rng, size)),
+        ("position of", _time(lambda position: playlist.position(video_ids[position]), rng, size),
+         _time(lambda position: video_ids.index(video_ids[position]), rng, size)),
+    ]
+    # Both structures hold the same ids in the same order from here on.
+    video_ids = playlist.video_ids()
+    results.append(("move", _time(playlist_move, rng, size), _time(list_move, rng, size)))
+    return results
+
+
+if __name__ == "__main__":
+    for size in [int(argument) for argument in sys.argv[1:]] or [10000, 100000, 1000000]:
+        for name, playlist_seconds, list_seconds in benchmark(size):
+            print(f"{size:>9} {name:12} {playlist_seconds * 1e6:10.2f} us "
+                  f"(list {list_seconds * 1e6:10.2f} us)")
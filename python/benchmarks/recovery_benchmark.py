@@ -0,0 +1,78 @@
+"""Measures how long it takes to restore the player state from the state log.
+
+Startup from the whole log is compared with startup from a snapshot plus
+the records appended after it.
+
+Run from the python/ directory:
+    python3 -m benchmarks.recovery_benchmark [number_of_records] [tail_records]
+"""
+
+from src.output import BufferWriter
+from src.persistence import WriteAheadLog, snapshot_path
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PLAYLISTS = 1000
+
+
+def append_records(log, count, video_ids, start=0):
+    """Appends count records, creating PLAYLISTS playlists first."""
+    for number in range(start, start + count):
+        if number < PLAYLISTS:
+            log.append("CREATE_PLAYLIST", f"playlist_{number}")
+            continue
+        number -= PLAYLISTS
+        video_id = video_ids[number // PLAYLISTS % len(video_ids)]
+        if number % 10 == 9:
+            # One record in ten flags or allows a video.
+            if number // 10 % 2 == 0:
+                log.append("FLAG_VIDEO", video_id, "benchmark")
+            else:
+                log.append("ALLOW_VIDEO", video_id)
+            continue
+        playlist = f"playlist_{number % PLAYLISTS}"
+        if number // (PLAYLISTS * len(video_ids)) % 2 == 0:
+            log.append("ADD_TO_PLAYLIST", playlist, video_id)
+        else:
+            log.append("REMOVE_FROM_PLAYLIST", playlist, video_id)
+
+
+def start_player(path):
+    """Restores a player from the log and returns it and the seconds taken."""
+    log = WriteAheadLog(path, fsync_every=0)
+    start = time.perf_counter()
+    player = VideoPlayer(VideoLibrary(), BufferWriter(), state_log=log)
+    return player, log, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tail = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    video_ids = [video.video_id for video in VideoLibrary().get_all_videos()]
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "state.log"
+        log = WriteAheadLog(path, fsync_every=0)
+        start = time.perf_counter()
+        append_records(log, count, video_ids)
+        written = time.perf_counter() - start
+        log.close()
+        print(f"records:          {count}")
+        print(f"log size:         {path.stat().st_size / 2 ** 20:.1f} MiB")
+        print(f"append:           {written:.3f} s ({count / written:,.0f} records/s)")
+
+        player, log, replayed = start_player(path)
+        print(f"full replay:      {replayed:.3f} s ({count / replayed:,.0f} records/s)")
+        start = time.perf_counter()
+        player.checkpoint()
+        print(f"snapshot write:   {time.perf_counter() - start:.3f} s "
+              f"({snapshot_path(path).stat().st_size / 2 ** 10:.1f} KiB)")
+        append_records(log, tail, video_ids, count)
+        log.close()
+
+        _, log, restored = start_player(path)
+        log.close()
+        print(f"snapshot + {tail} record tail: {restored:.3f} s")
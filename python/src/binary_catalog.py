@@ -0,0 +1,234 @@
+"""A compiled, memory-mapped catalog format for the video library.
+
+A compiled catalog holds the same videos as videos.txt in fixed-size
+little-endian tables, so it can be searched through mmap without parsing:
+
+    header       magic, table sizes and the offset of every section
+    order table  video_count x uint32, id table slot of every ordinal
+    id table     video_count x VIDEO_RECORD, sorted by video_id bytes
+    tag refs     uint32 tag name numbers, referenced by the id table
+    tag names    tag_name_count x STRING_REF, the distinct tag spellings
+    tag keys     tag_key_count x TAG_KEY_RECORD, sorted by normalized tag
+    postings     uint32 ordinals, referenced by the tag keys
+    strings      UTF-8 string table, referenced by everything above
+
+Run `python3 -m src.binary_catalog [videos.txt] [videos.ytc]` to compile.
+"""
+
+from .search_index import normalize_tag
+from .video_catalog import CatalogBase
+from array import array
+from pathlib import Path
+import mmap
+import struct
+import sys
+
+MAGIC = b"YTCAT001"
+COMPILED_SUFFIX = ".ytc"
+
+HEADER = struct.Struct("<8s4I7Q")
+VIDEO_RECORD = struct.Struct("<7I")
+STRING_REF = struct.Struct("<2I")
+TAG_KEY_RECORD = struct.Struct("<4I")
+UINT32 = struct.Struct("<I")
+
+
+def compiled_path(video_file):
+    """Returns where the compiled form of video_file is stored."""
+    return Path(video_file).with_suffix(COMPILED_SUFFIX)
+
+
+def is_up_to_date(video_file):
+    """Returns True if video_file has a compiled form newer than itself."""
+    target = compiled_path(video_file)
+    try:
+        return target.stat().st_mtime > Path(video_file).stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+
+class _StringTable:
+    """Builds the deduplicated UTF-8 string table of a compiled catalog."""
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = {}
+
+    def add(self, text):
+        """Returns the (offset, length) of text, adding it if needed."""
+        encoded = text.encode("utf-8")
+        offset = self._offsets.get(encoded)
+        if offset is None:
+            offset = self._offsets[encoded] = len(self._data)
+            self._data += encoded
+        return offset, len(encoded)
+
+    def __bytes__(self):
+        return bytes(self._data)
+
+
+def compile_catalog(rows, target):
+    """Writes a compiled catalog.
+
+    Args:
+        rows: Iterable of (title, video_id, tags) in catalog order. A later
+            row with an already seen video_id replaces the earlier one but
+            keeps its position.
+        target: Path of the compiled catalog to write.
+    """
+    videos = {}
+    for title, video_id, tags in rows:
+        videos[video_id] = (title, tuple(tags))
+
+    strings = _StringTable()
+    tag_names = {}
+    tag_refs = array("I")
+    postings = {}
+    records = []
+    for ordinal, (video_id, (title, tags)) in enumerate(videos.items()):
+        tag_start = len(tag_refs)
+        for tag in tags:
+            tag_refs.append(tag_names.setdefault(tag, len(tag_names)))
+        for key in dict.fromkeys(normalize_tag(tag) for tag in tags):
+            postings.setdefault(key.encode("utf-8"), array("I")).append(ordinal)
+        records.append((video_id.encode("utf-8"), strings.add(video_id),
+                        strings.add(title), tag_start, len(tags), ordinal))
+    records.sort(key=lambda record: record[0])
+
+    order = array("I", bytes(4 * len(records)))
+    id_table = bytearray()
+    for slot, (_, id_ref, title_ref, tag_start, tag_count, ordinal) in enumerate(records):
+        order[ordinal] = slot
+        id_table += VIDEO_RECORD.pack(*id_ref, *title_ref, tag_start, tag_count, ordinal)
+
+    names_table = b"".join(STRING_REF.pack(*strings.add(tag)) for tag in tag_names)
+    keys_table = bytearray()
+    posting_data = array("I")
+    for key in sorted(postings):
+        key_ref = strings.add(key.decode("utf-8"))
+        keys_table += TAG_KEY_RECORD.pack(*key_ref, len(posting_data), len(postings[key]))
+        posting_data.extend(postings[key])
+
+    if sys.byteorder == "big":
+        for table in (order, tag_refs, posting_data):
+            table.byteswap()
+    sections = [order.tobytes(), bytes(id_table), tag_refs.tobytes(), names_table,
+                bytes(keys_table), posting_data.tobytes(), bytes(strings)]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    header = HEADER.pack(MAGIC, len(records), len(tag_refs), len(tag_names),
+                         len(postings), *offsets)
+
+    temporary = Path(str(target) + ".tmp")
+    with open(temporary, "wb") as catalog_file:
+        catalog_file.write(header)
+        for section in sections:
+            catalog_file.write(section)
+    temporary.replace(target)
+
+
+class BinaryCatalog(CatalogBase):
+    """A read-only view of a compiled catalog through mmap.
+
+    Lookups binary-search the sorted tables of the file and only decode
+    the strings that are actually requested.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        with open(path, "rb") as catalog_file:
+            self._map = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self._count, _, _, self._key_count, self._order, self._ids,
+         self._tag_refs, self._tag_names, self._tag_keys, self._postings,
+         self._strings) = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled video catalog")
+
+    def _bytes(self, offset, length):
+        start = self._strings + offset
+        return self._map[start:start + length]
+
+    def _string(self, offset, length):
+        return self._bytes(offset, length).decode("utf-8")
+
+    def _record(self, slot):
+        return VIDEO_RECORD.unpack_from(self._map, self._ids + slot * VIDEO_RECORD.size)
+
+    def _slot(self, ordinal):
+        return UINT32.unpack_from(self._map, self._order + ordinal * UINT32.size)[0]
+
+    def __len__(self):
+        return self._count
+
+    def ordinal(self, video_id):
+        """Returns the ordinal of video_id, or None if it is not present."""
+        key = video_id.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            record = self._record(middle)
+            found = self._bytes(record[0], record[1])
+            if found == key:
+                return record[6]
+            elif found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def video_id(self, ordinal):
+        """Returns the video_id stored at the given ordinal."""
+        record = self._record(self._slot(ordinal))
+        return self._string(record[0], record[1])
+
+    def title(self, ordinal):
+        """Returns the title stored at the given ordinal."""
+        record = self._record(self._slot(ordinal))
+        return self._string(record[2], record[3])
+
+    def tags(self, ordinal):
+        """Returns the tags stored at the given ordinal as a tuple."""
+        tag_start, tag_count = self._record(self._slot(ordinal))[4:6]
+        tags = []
+        for position in range(tag_start, tag_start + tag_count):
+            name = UINT32.unpack_from(self._map, self._tag_refs + position * UINT32.size)[0]
+            tags.append(self._string(*STRING_REF.unpack_from(
+                self._map, self._tag_names + name * STRING_REF.size)))
+        return tuple(tags)
+
+    def rows(self):
+        """Yields (ordinal, title, video_id, tags) for every video."""
+        for ordinal in range(self._count):
+            yield ordinal, self.title(ordinal), self.video_id(ordinal), self.tags(ordinal)
+
+    def lookup(self, tag):
+        """Returns the ordinals of the videos tagged with the given tag."""
+        key = normalize_tag(tag).encode("utf-8")
+        low, high = 0, self._key_count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, start, count = TAG_KEY_RECORD.unpack_from(
+                self._map, self._tag_keys + middle * TAG_KEY_RECORD.size)
+            found = self._bytes(key_offset, key_length)
+            if found == key:
+                offset = self._postings + start * UINT32.size
+                ordinals = array("I", self._map[offset:offset + count * UINT32.size])
+                if sys.byteorder == "big":
+                    ordinals.byteswap()
+                return ordinals
+            elif found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return ()
+
+
+if __name__ == "__main__":
+    from .video_library import VIDEOS_FILE, read_rows
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else VIDEOS_FILE
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else compiled_path(source)
+    compile_catalog(read_rows(source), target)
+    print(f"Compiled {source} to {target}")
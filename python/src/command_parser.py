@@ -1,163 +1,210 @@
 """A command parser class."""
 
-import textwrap
+from .command_stats import CommandStats
+from time import perf_counter_ns
 from typing import Sequence
 
+# Maximum number of words of a SEARCH_VIDEOS_WITH_TAG_QUERY query.
+MAX_QUERY_WORDS = 64
+
 
 class CommandException(Exception):
     """A class used to represent a wrong command exception."""
     pass
 
 
+class _Command:
+    """A registered command: its name, handler, arity spec, usage, help line
+    and the array its latencies are recorded in."""
+
+    __slots__ = ("name", "handler", "arities", "usage", "help_text", "latencies")
+
+    def __init__(self, name, handler, arities, usage, help_text, latencies):
+        self.name = name
+        self.handler = handler
+        self.arities = arities
+        self.usage = usage
+        self.help_text = help_text
+        self.latencies = latencies
+
+
 class CommandParser:
     """A class used to parse and execute a user Command."""
 
-    def __init__(self, video_player):
+    def __init__(self, video_player, output=None, stats=None):
+        """
+        Args:
+            video_player: The VideoPlayer the commands are executed on.
+            output: The OutputWriter to write to. Defaults to the player's.
+            stats: The CommandStats the latency of every command is recorded
+                in. Parsers may share one; by default each has its own.
+        """
         self._player = video_player
+        self._output = output if output is not None else video_player.output
+        self._stats = stats if stats is not None else CommandStats()
+        self._commands = {}
+        self._register_player_commands()
+
+    def register_command(self, name, handler, arities=None, usage=None,
+                         help_text=None):
+        """Registers a command, replacing any command with the same name.
+
+        Args:
+            name: The command verb, matched case-insensitively.
+            handler: Called with the command arguments.
+            arities: The allowed numbers of arguments. None if the command
+                takes no arguments, in which case extra ones are ignored.
+            usage: Message of the CommandException raised when the number
+                of arguments is not allowed.
+            help_text: Line shown for the command by HELP, if any.
+        """
+        name = name.upper()
+        self._commands[name] = _Command(
+            name, handler, None if arities is None else frozenset(arities),
+            usage, help_text, self._stats.latencies(name))
+
+    def _register_player_commands(self):
+        player = self._player
+        register = self.register_command
+        register("NUMBER_OF_VIDEOS", player.number_of_videos,
+                 help_text="NUMBER_OF_VIDEOS - Shows how many videos are in the library.")
+        register("SHOW_ALL_VIDEOS", player.show_all_videos, (0, 1, 2),
+                 "Please enter SHOW_ALL_VIDEOS command followed by an "
+                 "optional page size and cursor.",
+                 "SHOW_ALL_VIDEOS [<page_size> [<cursor>]] - Lists all videos from the library, or one page of them.")
+        register("PLAY", player.play_video, (1,),
+                 "Please enter PLAY command followed by video_id.",
+                 "PLAY <video_id> - Plays specified video.")
+        register("PLAY_RANDOM", player.play_random_video,
+                 help_text="PLAY_RANDOM - Plays a random video from the library.")
+        register("STOP", player.stop_video,
+                 help_text="STOP - Stop the current video.")
+        register("PAUSE", player.pause_video,
+                 help_text="PAUSE - Pause the current video.")
+        register("CONTINUE", player.continue_video,
+                 help_text="CONTINUE - Resume the current paused video.")
+        register("SHOW_PLAYING", player.show_playing,
+                 help_text="SHOW_PLAYING - Displays the title, url and paused status of the video that is currently playing (or paused).")
+        register("CREATE_PLAYLIST", player.create_playlist, (1,),
+                 "Please enter CREATE_PLAYLIST command followed by a "
+                 "playlist name.",
+                 "CREATE_PLAYLIST <playlist_name> - Creates a new (empty) playlist with the provided name.")
+        register("ADD_TO_PLAYLIST", player.add_to_playlist, (2,),
+                 "Please enter ADD_TO_PLAYLIST command followed by a "
+                 "playlist name and video_id to add.",
+                 "ADD_TO_PLAYLIST <playlist_name> <video_id> - Adds the requested video to the playlist.")
+        register("REMOVE_FROM_PLAYLIST", player.remove_from_playlist, (2,),
+                 "Please enter REMOVE_FROM_PLAYLIST command followed by a "
+                 "playlist name and video_id to remove.",
+                 "REMOVE_FROM_PLAYLIST <playlist_name> <video_id> - Removes the specified video from the specified playlist")
+        register("CLEAR_PLAYLIST", player.clear_playlist, (1,),
+                 "Please enter CLEAR_PLAYLIST command followed by a "
+                 "playlist name.",
+                 "CLEAR_PLAYLIST <playlist_name> - Removes all the videos from the playlist.")
+        register("DELETE_PLAYLIST", player.delete_playlist, (1,),
+                 "Please enter DELETE_PLAYLIST command followed by a "
+                 "playlist name.",
+                 "DELETE_PLAYLIST <playlist_name> - Deletes the playlist.")
+        register("SHOW_PLAYLIST", player.show_playlist, (1, 2, 3),
+                 "Please enter SHOW_PLAYLIST command followed by a "
+                 "playlist name and an optional page size and cursor, or range.",
+                 "SHOW_PLAYLIST <playlist_name> [<page_size> [<cursor>] | <first>-<last>] - List all the videos in this playlist, one page of them or the given positions.")
+        register("INSERT_AT", player.insert_at, (3,),
+                 "Please enter INSERT_AT command followed by a "
+                 "playlist name, a position and a video_id.",
+                 "INSERT_AT <playlist_name> <position> <video_id> - Inserts the video into the playlist at the position.")
+        register("MOVE_IN_PLAYLIST", player.move_in_playlist, (3,),
+                 "Please enter MOVE_IN_PLAYLIST command followed by a "
+                 "playlist name, a video_id and a position.",
+                 "MOVE_IN_PLAYLIST <playlist_name> <video_id> <position> - Moves the video of the playlist to the position.")
+        register("SHOW_ALL_PLAYLISTS", player.show_all_playlists,
+                 help_text="SHOW_ALL_PLAYLISTS - Display all the available playlists.")
+        register("SEARCH_VIDEOS", player.search_videos, (1, 2),
+                 "Please enter SEARCH_VIDEOS command followed by a "
+                 "search term and an optional limit.",
+                 "SEARCH_VIDEOS <search_term> [<limit>] - Display all the videos whose titles contain the search_term, or the first limit of them.")
+        register("SEARCH_VIDEOS_WITH_TAG", player.search_videos_tag, (1, 2),
+                 "Please enter SEARCH_VIDEOS_WITH_TAG command followed by a "
+                 "video tag and an optional limit.",
+                 "SEARCH_VIDEOS_WITH_TAG <tag_name> [<limit>] -Display all videos whose tags contains the provided tag, or the first limit of them.")
+        register("SEARCH_VIDEOS_FUZZY", player.search_videos_fuzzy, (1,),
+                 "Please enter SEARCH_VIDEOS_FUZZY command followed by a "
+                 "search term.",
+                 "SEARCH_VIDEOS_FUZZY <search_term> - Display the videos whose titles best match the search_term, typos included.")
+        register("SEARCH_VIDEOS_WITH_TAG_QUERY", player.search_videos_tag_query,
+                 range(1, MAX_QUERY_WORDS + 1),
+                 "Please enter SEARCH_VIDEOS_WITH_TAG_QUERY command followed by a "
+                 f"query of at most {MAX_QUERY_WORDS} words.",
+                 "SEARCH_VIDEOS_WITH_TAG_QUERY <query> - Display all videos whose tags match the query, "
+                 "such as #cat AND (#animal OR #pet) NOT #dog.")
+        register("SEARCH_CACHE", player.show_search_cache,
+                 help_text="SEARCH_CACHE - Shows the hits and misses of the search result cache.")
+        register("FLAG_VIDEO", player.flag_video, (1, 2),
+                 "Please enter FLAG_VIDEO command followed by a "
+                 "video_id and an optional flag reason.",
+                 "FLAG_VIDEO <video_id> <flag_reason> - Mark a video as flagged.")
+        register("ALLOW_VIDEO", player.allow_video, (1,),
+                 "Please enter ALLOW_VIDEO command followed by a "
+                 "video_id.",
+                 "ALLOW_VIDEO <video_id> - Removes a flag from a video.")
+        register("FLAGGED_COUNT", player.flagged_count,
+                 help_text="FLAGGED_COUNT - Shows how many videos are flagged.")
+        register("SHOW_FLAGGED", player.show_flagged,
+                 help_text="SHOW_FLAGGED - Lists every flagged video with its flag reason.")
+        register("RELOAD_LIBRARY", player.reload_library,
+                 help_text="RELOAD_LIBRARY - Applies the changes made to the video file since it was loaded.")
+        register("STATS", self._show_stats,
+                 help_text="STATS - Shows the number of calls and latencies of every command.")
+        register("HELP", self._get_help,
+                 help_text="HELP - Displays help.")
 
     def execute_command(self, command: Sequence[str]):
-        """Executes the user command. Expects the command to be upper case.
+        """Executes the user command. The command name is case-insensitive.
            Raises CommandException if a command cannot be parsed.
+           The latency of every command executed is recorded in stats; for
+           an interactive search it includes the wait for the answer.
         """
         if not command:
             raise CommandException(
                 "Please enter a valid command, "
                 "type HELP for a list of available commands.")
 
-        if command[0].upper() == "NUMBER_OF_VIDEOS":
-            self._player.number_of_videos()
-
-        elif command[0].upper() == "SHOW_ALL_VIDEOS":
-            self._player.show_all_videos()
-
-        elif command[0].upper() == "PLAY":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter PLAY command followed by video_id.")
-            self._player.play_video(command[1])
-
-        elif command[0].upper() == "PLAY_RANDOM":
-            self._player.play_random_video()
-
-        elif command[0].upper() == "STOP":
-            self._player.stop_video()
-
-        elif command[0].upper() == "PAUSE":
-            self._player.pause_video()
-
-        elif command[0].upper() == "CONTINUE":
-            self._player.continue_video()
-
-        elif command[0].upper() == "SHOW_PLAYING":
-            self._player.show_playing()
-
-        elif command[0].upper() == "CREATE_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter CREATE_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.create_playlist(command[1])
-
-        elif command[0].upper() == "ADD_TO_PLAYLIST":
-            if len(command) != 3:
-                raise CommandException(
-                    "Please enter ADD_TO_PLAYLIST command followed by a "
-                    "playlist name and video_id to add.")
-            self._player.add_to_playlist(command[1], command[2])
-
-        elif command[0].upper() == "REMOVE_FROM_PLAYLIST":
-            if len(command) != 3:
-                raise CommandException(
-                    "Please enter REMOVE_FROM_PLAYLIST command followed by a "
-                    "playlist name and video_id to remove.")
-            self._player.remove_from_playlist(command[1], command[2])
-
-        elif command[0].upper() == "CLEAR_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter CLEAR_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.clear_playlist(command[1])
-
-        elif command[0].upper() == "DELETE_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter DELETE_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.delete_playlist(command[1])
-
-        elif command[0].upper() == "SHOW_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SHOW_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.show_playlist(command[1])
-
-        elif command[0].upper() == "SHOW_ALL_PLAYLISTS":
-            self._player.show_all_playlists()
-
-        elif command[0].upper() == "SEARCH_VIDEOS":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SEARCH_VIDEOS command followed by a "
-                    "search term.")
-            self._player.search_videos(command[1])
-
-        elif command[0].upper() == "SEARCH_VIDEOS_WITH_TAG":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SEARCH_VIDEOS_WITH_TAG command followed by a "
-                    "video tag.")
-            self._player.search_videos_tag(command[1])
-
-        elif command[0].upper() == "FLAG_VIDEO":
-            if len(command) == 3:
-                self._player.flag_video(command[1], command[2])
-            elif len(command) == 2:
-                self._player.flag_video(command[1])
-            else:
-                raise CommandException(
-                    "Please enter FLAG_VIDEO command followed by a "
-                    "video_id and an optional flag reason.")
-
-        elif command[0].upper() == "ALLOW_VIDEO":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter ALLOW_VIDEO command followed by a "
-                    "video_id.")
-            self._player.allow_video(command[1])
-
-        elif command[0].upper() == "HELP":
-            self._get_help()
-        else:
-            print(
+        registered = self._commands.get(command[0].upper())
+        if registered is None:
+            self._output.print(
                 "Please enter a valid command, type HELP for a list of "
                 "available commands.")
+            return
+        start = perf_counter_ns()
+        if registered.arities is None:
+            registered.handler()
+        elif len(command) - 1 in registered.arities:
+            registered.handler(*command[1:])
+        else:
+            raise CommandException(registered.usage)
+        latencies = registered.latencies
+        latencies.append(perf_counter_ns() - start)
+        if len(latencies) >= CommandStats.FOLD_EVERY:
+            self._stats.fold(registered.name)
+
+    @property
+    def stats(self):
+        """The CommandStats of the commands executed by this parser."""
+        return self._stats
+
+    def _show_stats(self):
+        """Displays the number of calls and latencies of every command."""
+        lines = self._stats.format_lines()
+        if not lines:
+            self._output.print("No commands executed yet")
+        else:
+            self._output.print("Command statistics:")
+            self._output.print(*(f"  {line}" for line in lines), sep="\n")
 
     def _get_help(self):
         """Displays all available commands to the user."""
-        help_text = textwrap.dedent("""
-        Available commands:
-            NUMBER_OF_VIDEOS - Shows how many videos are in the library.
-            SHOW_ALL_VIDEOS - Lists all videos from the library.
-            PLAY <video_id> - Plays specified video.
-            PLAY_RANDOM - Plays a random video from the library.
-            STOP - Stop the current video.
-            PAUSE - Pause the current video.
-            CONTINUE - Resume the current paused video.
-            SHOW_PLAYING - Displays the title, url and paused status of the video that is currently playing (or paused).
-            CREATE_PLAYLIST <playlist_name> - Creates a new (empty) playlist with the provided name.
-            ADD_TO_PLAYLIST <playlist_name> <video_id> - Adds the requested video to the playlist.
-            REMOVE_FROM_PLAYLIST <playlist_name> <video_id> - Removes the specified video from the specified playlist
-            CLEAR_PLAYLIST <playlist_name> - Removes all the videos from the playlist.
-            DELETE_PLAYLIST <playlist_name> - Deletes the playlist.
-            SHOW_PLAYLIST <playlist_name> - List all the videos in this playlist.
-            SHOW_ALL_PLAYLISTS - Display all the available playlists.
-            SEARCH_VIDEOS <search_term> - Display all the videos whose titles contain the search_term.
-            SEARCH_VIDEOS_WITH_TAG <tag_name> -Display all videos whose tags contains the provided tag.
-            FLAG_VIDEO <video_id> <flag_reason> - Mark a video as flagged.
-            ALLOW_VIDEO <video_id> - Removes a flag from a video.
-            HELP - Displays help.
-            EXIT - Terminates the program execution.
-        """)
-        print(help_text)
+        help_lines = [command.help_text for command in self._commands.values()
+                      if command.help_text is not None]
+        help_lines.append("EXIT - Terminates the program execution.")
+        self._output.print("\nAvailable commands:\n"
+                           + "".join(f"    {line}\n" for line in help_lines))
@@ -0,0 +1,158 @@
+"""Per-command latency statistics."""
+
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+import json
+import os
+import time
+
+# Every power of two of nanoseconds is split into 2 ** SUB_BUCKET_BITS
+# buckets, so a percentile is reported within 12.5% of the true latency.
+SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_SUB_BUCKET_MASK = _SUB_BUCKETS - 1
+
+PERCENTILES = (50, 95, 99)
+
+
+def bucket_of(nanoseconds):
+    """Returns the histogram bucket of a latency in nanoseconds."""
+    if nanoseconds < _SUB_BUCKETS:
+        return nanoseconds
+    shift = nanoseconds.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) << SUB_BUCKET_BITS | (nanoseconds >> shift) & _SUB_BUCKET_MASK
+
+
+def bucket_limit(bucket):
+    """Returns the largest latency in nanoseconds that falls in bucket."""
+    if bucket < _SUB_BUCKETS:
+        return bucket
+    shift = (bucket >> SUB_BUCKET_BITS) - 1
+    return ((_SUB_BUCKETS | bucket & _SUB_BUCKET_MASK) + 1 << shift) - 1
+
+
+class _VerbStats:
+    """The calls, total time and latency histogram of one command."""
+
+    __slots__ = ("calls", "total_ns", "buckets", "pending")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.buckets = {}
+        # Latencies not yet counted in the histogram.
+        self.pending = array("q")
+
+    def fold(self):
+        """Moves the pending latencies into the histogram."""
+        # Sorted, the latencies of a bucket are a run found with one bisect,
+        # which is much cheaper than computing the bucket of each of them.
+        latencies = sorted(self.pending)
+        buckets = self.buckets
+        start = 0
+        while start < len(latencies):
+            bucket = bucket_of(latencies[start])
+            end = bisect_right(latencies, bucket_limit(bucket), start)
+            buckets[bucket] = buckets.get(bucket, 0) + end - start
+            start = end
+        self.calls += len(latencies)
+        self.total_ns += sum(latencies)
+        del self.pending[:]
+
+    def percentile(self, percent):
+        """Returns the latency in nanoseconds below which percent of the calls fall."""
+        rank = self.calls * percent / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return bucket_limit(bucket)
+        return 0
+
+
+class CommandStats:
+    """Call counts, total time and latency histograms of every command.
+
+    To keep recording cheap, the latencies of a command are appended to an
+    array and only counted in its histogram once FOLD_EVERY of them are
+    pending, or when the statistics are read. Callers on a hot path can
+    append to latencies(verb) themselves and call fold(verb) when it holds
+    FOLD_EVERY latencies.
+
+    If a dump path is given, dump_if_due() writes the statistics to it as
+    JSON at most once every dump_interval seconds.
+    """
+
+    FOLD_EVERY = 1024
+
+    def __init__(self, dump_path=None, dump_interval=60.0):
+        """
+        Args:
+            dump_path: Optional file the statistics are periodically written to.
+            dump_interval: Minimum number of seconds between two dumps.
+        """
+        self._verbs = {}
+        self._dump_path = None if dump_path is None else Path(dump_path)
+        self._dump_interval = dump_interval
+        self._next_dump = time.monotonic() + dump_interval
+
+    def latencies(self, verb):
+        """Returns the array the latencies of verb, in nanoseconds, are appended to."""
+        stats = self._verbs.get(verb)
+        if stats is None:
+            stats = self._verbs[verb] = _VerbStats()
+        return stats.pending
+
+    def fold(self, verb):
+        """Counts the pending latencies of verb in its histogram."""
+        self._verbs[verb].fold()
+
+    def record(self, verb, elapsed_ns):
+        """Records one call of verb that took elapsed_ns nanoseconds."""
+        latencies = self.latencies(verb)
+        latencies.append(elapsed_ns)
+        if len(latencies) >= self.FOLD_EVERY:
+            self.fold(verb)
+
+    def summary(self):
+        """Returns a dict of verb -> statistics, busiest verbs first.
+
+        The statistics of a verb are its number of calls, total time in
+        seconds and its p50, p95 and p99 latencies in seconds. Verbs that
+        were never called are left out.
+        """
+        for stats in self._verbs.values():
+            stats.fold()
+        verbs = sorted(self._verbs.items(), key=lambda item: -item[1].total_ns)
+        summary = {}
+        for verb, stats in verbs:
+            if stats.calls == 0:
+                continue
+            summary[verb] = {"calls": stats.calls, "total_s": stats.total_ns / 1e9}
+            for percent in PERCENTILES:
+                summary[verb][f"p{percent}_s"] = stats.percentile(percent) / 1e9
+        return summary
+
+    def format_lines(self):
+        """Returns the summary as lines of text, one per verb."""
+        return [f"{verb}: {stats['calls']} calls, {stats['total_s'] * 1e3:.3f} ms total, "
+                + ", ".join(f"p{percent} {stats[f'p{percent}_s'] * 1e3:.3f} ms"
+                            for percent in PERCENTILES)
+                for verb, stats in self.summary().items()]
+
+    @property
+    def dump_interval(self):
+        return self._dump_interval
+
+    def dump_if_due(self):
+        """Dumps the statistics if there is a dump path and the interval has passed."""
+        if self._dump_path is not None and time.monotonic() >= self._next_dump:
+            self.dump()
+
+    def dump(self):
+        """Writes the summary to the dump path, replacing the previous dump."""
+        self._next_dump = time.monotonic() + self._dump_interval
+        temporary = self._dump_path.with_name(self._dump_path.name + ".tmp")
+        temporary.write_text(json.dumps(self.summary(), indent=2) + "\n")
+        os.replace(temporary, self._dump_path)
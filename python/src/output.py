@@ -0,0 +1,78 @@
+"""Output writers used by the video player and the command parser."""
+
+from abc import ABC, abstractmethod
+import sys
+
+
+class OutputWriter(ABC):
+    """Base class of the places the player can write its output to.
+
+    Subclasses implement write(); print() formats its arguments the same
+    way as the builtin print.
+    """
+
+    @abstractmethod
+    def write(self, text):
+        """Writes text as is."""
+
+    def flush(self):
+        """Makes everything written so far visible to the reader."""
+
+    def print(self, *values, sep=" ", end="\n"):
+        self.write(sep.join(map(str, values)) + end)
+
+
+class StdoutWriter(OutputWriter):
+    """Writes to whatever sys.stdout is at the time of each call."""
+
+    def write(self, text):
+        sys.stdout.write(text)
+
+    def flush(self):
+        sys.stdout.flush()
+
+
+class BufferWriter(OutputWriter):
+    """Collects the output in memory."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, text):
+        self._parts.append(text)
+
+    def getvalue(self):
+        """Returns everything written since the last drain()."""
+        return "".join(self._parts)
+
+    def drain(self):
+        """Returns everything written since the last drain() and forgets it."""
+        text = "".join(self._parts)
+        self._parts.clear()
+        return text
+
+
+class BatchedFileWriter(OutputWriter):
+    """Writes to a text file in batches of at least batch_size characters."""
+
+    def __init__(self, file, batch_size=1 << 16):
+        self._file = file
+        self._batch_size = batch_size
+        self._parts = []
+        self._pending = 0
+
+    def write(self, text):
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self._batch_size:
+            self._write_pending()
+
+    def _write_pending(self):
+        self._file.write("".join(self._parts))
+        self._parts.clear()
+        self._pending = 0
+
+    def flush(self):
+        if self._parts:
+            self._write_pending()
+        self._file.flush()
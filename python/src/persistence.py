@@ -0,0 +1,247 @@
+"""Durable storage of the player state."""
+
+from collections import namedtuple
+from pathlib import Path
+import os
+import struct
+
+SNAPSHOT_MAGIC = b"YTSTATE1"
+# magic, generation, number of flagged videos, number of playlists
+SNAPSHOT_HEADER = struct.Struct("<8sQII")
+STRING_LENGTH = struct.Struct("<I")
+
+# The record that starts a log truncated after the snapshot of a generation.
+GENERATION_RECORD = "SNAPSHOT"
+
+Snapshot = namedtuple("Snapshot", "generation flags playlists")
+Snapshot.__doc__ = """The state saved by a snapshot.
+
+flags is a list of (video_id, reason) and playlists a list of
+(title, [video_id, ...]), both in the order they were written.
+"""
+
+
+def snapshot_path(log_path):
+    """Returns where the snapshot of the log at log_path is kept."""
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name + ".snapshot")
+
+
+def _pack_string(parts, string):
+    data = string.encode("utf-8")
+    parts.append(STRING_LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+def write_snapshot(path, generation, flags, playlists):
+    """Atomically replaces the snapshot at path.
+
+    The snapshot is written to a temporary file, forced to disk and then
+    renamed over path, so a crash leaves either the old or the new one.
+
+    Args:
+        path: The snapshot file.
+        generation: The number of snapshots taken so far, this one included.
+        flags: Iterable of (video_id, reason) of every flagged video.
+        playlists: Iterable of (title, video_ids) of every playlist.
+    """
+    flags = list(flags)
+    playlists = list(playlists)
+    parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, generation, len(flags), len(playlists))]
+    for video_id, reason in flags:
+        _pack_string(parts, video_id)
+        _pack_string(parts, reason)
+    for title, video_ids in playlists:
+        _pack_string(parts, title)
+        parts.append(STRING_LENGTH.pack(len(video_ids)))
+        for video_id in video_ids:
+            _pack_string(parts, video_id)
+
+    path = Path(path)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as snapshot_file:
+        snapshot_file.write(b"".join(parts))
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temporary, path)
+    directory = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+def read_snapshot(path):
+    """Returns the Snapshot stored at path, None if there is none."""
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+    magic, generation, flag_count, playlist_count = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a snapshot of the player state")
+    position = SNAPSHOT_HEADER.size
+
+    def unpack_string():
+        nonlocal position
+        length, = STRING_LENGTH.unpack_from(data, position)
+        position += STRING_LENGTH.size
+        string = data[position:position + length].decode("utf-8")
+        position += length
+        return string
+
+    flags = [(unpack_string(), unpack_string()) for _ in range(flag_count)]
+    playlists = []
+    for _ in range(playlist_count):
+        title = unpack_string()
+        video_count, = STRING_LENGTH.unpack_from(data, position)
+        position += STRING_LENGTH.size
+        playlists.append((title, [unpack_string() for _ in range(video_count)]))
+    return Snapshot(generation, flags, playlists)
+
+
+def _snapshot_generation(path):
+    """Returns the generation of the snapshot at path, 0 if there is none."""
+    try:
+        with open(path, "rb") as snapshot_file:
+            header = snapshot_file.read(SNAPSHOT_HEADER.size)
+    except FileNotFoundError:
+        return 0
+    return SNAPSHOT_HEADER.unpack(header)[1]
+
+
+def _parse_record(line):
+    return tuple(line[:-1].decode("utf-8").split("\t"))
+
+
+class WriteAheadLog:
+    """An append-only log of records, each a tuple of strings.
+
+    Records are written as one tab-separated line. Every append is handed
+    to the operating system straight away, and fsync is called once every
+    fsync_every records, so the cost of durability can be traded against
+    the number of records a power failure may lose. A partially written
+    last line is dropped when the log is opened.
+
+    The log can be compacted by writing a snapshot of the whole state next
+    to it, after which it is truncated and only holds the records appended
+    since. Each snapshot has a generation number that is also written at
+    the start of the truncated log, so a crash between writing the snapshot
+    and truncating the log does not replay records the snapshot holds.
+    """
+
+    def __init__(self, path, fsync_every=1, snapshot_every=0):
+        """Opens (or creates) the log at path.
+
+        Args:
+            path: The file holding the log.
+            fsync_every: Number of records between fsync calls. 0 never
+                calls fsync, leaving it to the operating system.
+            snapshot_every: Number of records after which snapshot_due
+                becomes True. 0 never asks for a snapshot.
+        """
+        self._path = Path(path)
+        self._snapshot_path = snapshot_path(self._path)
+        self._fsync_every = fsync_every
+        self._snapshot_every = snapshot_every
+        self._unsynced = 0
+        self._since_snapshot = 0
+        self._generation = _snapshot_generation(self._snapshot_path)
+        self._file = open(path, "ab+")
+        self._drop_torn_tail()
+
+    def _drop_torn_tail(self):
+        size = self._file.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        self._file.seek(size - 1)
+        if self._file.read(1) == b"\n":
+            return
+        # Find the end of the last complete record and cut the file there.
+        position = size
+        while position > 0:
+            start = max(0, position - 4096)
+            self._file.seek(start)
+            chunk = self._file.read(position - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                self._file.truncate(start + newline + 1)
+                return
+            position = start
+        self._file.truncate(0)
+
+    def snapshot(self):
+        """Returns the last Snapshot written, None if there is none."""
+        return read_snapshot(self._snapshot_path)
+
+    def records(self):
+        """Yields every record appended since the last snapshot, oldest first."""
+        self._file.flush()
+        self._since_snapshot = 0
+        with open(self._path, "rb") as log_file:
+            lines = iter(log_file)
+            first = next(lines, None)
+            if first is None:
+                return
+            record = _parse_record(first)
+            if record[0] == GENERATION_RECORD:
+                stale = int(record[1]) < self._generation
+            else:
+                stale = bool(self._generation)
+            if stale:
+                # The log predates the snapshot, which already holds it: a
+                # crash came between writing the snapshot and truncating the
+                # log. Truncate it now, or the records appended from here on
+                # would follow the stale header and be skipped next time.
+                self.truncate()
+                return
+            if record[0] != GENERATION_RECORD:
+                self._since_snapshot += 1
+                yield record
+            for line in lines:
+                self._since_snapshot += 1
+                yield _parse_record(line)
+
+    def append(self, *fields):
+        """Appends one record made of the given string fields."""
+        self._file.write("\t".join(fields).encode("utf-8") + b"\n")
+        self._file.flush()
+        self._unsynced += 1
+        self._since_snapshot += 1
+        if self._fsync_every and self._unsynced >= self._fsync_every:
+            self.sync()
+
+    @property
+    def snapshot_due(self):
+        """True once snapshot_every records were appended since the last snapshot."""
+        return bool(self._snapshot_every) and self._since_snapshot >= self._snapshot_every
+
+    def write_snapshot(self, flags, playlists):
+        """Snapshots the whole state and truncates the log.
+
+        Args:
+            flags: Iterable of (video_id, reason) of every flagged video.
+            playlists: Iterable of (title, video_ids) of every playlist.
+        """
+        self._generation += 1
+        write_snapshot(self._snapshot_path, self._generation, flags, playlists)
+        self.truncate()
+
+    def sync(self):
+        """Forces every appended record to stable storage."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def truncate(self):
+        """Removes every record from the log."""
+        self._file.truncate(0)
+        if self._generation:
+            self._file.write(f"{GENERATION_RECORD}\t{self._generation}\n".encode("utf-8"))
+        self.sync()
+        self._since_snapshot = 0
+
+    def close(self):
+        if self._unsynced:
+            self.sync()
+        self._file.close()
@@ -0,0 +1,82 @@
+"""The pool of videos that PLAY_RANDOM can choose from."""
+
+from array import array
+import random
+
+
+class PlayablePool:
+    """The ordinals of every unflagged video in a catalog.
+
+    The ordinals are kept in an array together with the position of each
+    ordinal in that array, so flagging removes a video by swapping it with
+    the last entry and allowing appends it again. Picking a random video
+    is a single random index into the array.
+    """
+
+    _ABSENT = -1
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+        self._ordinals = array("I", catalog.ordinals())
+        if len(self._ordinals) == len(catalog):
+            self._positions = array("q", range(len(catalog)))
+        else:
+            self._positions = array("q", [self._ABSENT]) * len(catalog)
+            for position, ordinal in enumerate(self._ordinals):
+                self._positions[ordinal] = position
+        for ordinal in list(catalog.flagged_ordinals()):
+            self._remove(ordinal)
+        catalog.add_flag_listener(self.update)
+
+    def __len__(self):
+        return len(self._ordinals)
+
+    def _remove(self, ordinal):
+        position = self._positions[ordinal]
+        if position == self._ABSENT:
+            return
+        last = self._ordinals.pop()
+        if last != ordinal:
+            self._ordinals[position] = last
+            self._positions[last] = position
+        self._positions[ordinal] = self._ABSENT
+
+    def _add(self, ordinal):
+        if self._positions[ordinal] == self._ABSENT:
+            self._positions[ordinal] = len(self._ordinals)
+            self._ordinals.append(ordinal)
+
+    def update(self, ordinal):
+        """Adds or removes the video at the given ordinal after it changed.
+
+        The ordinal may be new, or one that was removed from the catalog.
+        """
+        if ordinal >= len(self._positions):
+            self._positions.extend([self._ABSENT] * (ordinal + 1 - len(self._positions)))
+        if self._catalog.is_flagged(ordinal) or self._catalog.is_removed(ordinal):
+            self._remove(ordinal)
+        else:
+            self._add(ordinal)
+
+    def choice(self, hidden=frozenset(), revealed=()):
+        """Returns a random playable ordinal, or None if there is none.
+
+        Args:
+            hidden: Ordinals in the pool to treat as unplayable.
+            revealed: Ordinals outside the pool to treat as playable.
+        """
+        available = len(self._ordinals) - len(hidden) + len(revealed)
+        if available <= 0:
+            return None
+        if len(hidden) * 2 > len(self._ordinals):
+            # Rejection sampling would mostly miss, so list the candidates.
+            candidates = [ordinal for ordinal in self._ordinals if ordinal not in hidden]
+            candidates.extend(revealed)
+            return random.choice(candidates)
+        while True:
+            index = random.randrange(len(self._ordinals) + len(revealed))
+            if index >= len(self._ordinals):
+                return revealed[index - len(self._ordinals)]
+            ordinal = self._ordinals[index]
+            if ordinal not in hidden:
+                return ordinal
@@ -1,21 +1,153 @@
-"""A youtube terminal simulator."""
+"""A youtube terminal simulator.
+
+Run `python3 -m src.run` for the interactive prompt, or
+`python3 -m src.run --batch [FILE]` to replay the commands of FILE (or of
+stdin) without prompts, with buffered output.
+"""
 from .video_player import VideoPlayer
 from .command_parser import CommandException
 from .command_parser import CommandParser
+from .command_stats import CommandStats
+from .output import BatchedFileWriter
+from .persistence import WriteAheadLog
+import argparse
+import sys
+import time
 
+# Number of characters of output written at once in batch mode.
+BATCH_BUFFER_SIZE = 1 << 20
+# Number of state log records between two snapshots by default.
+SNAPSHOT_EVERY = 10000
 
-if __name__ == "__main__":
+
+def run_interactive(state_log=None, stats=None, watch_library=False):
+    """Runs the interactive YT> prompt until EXIT.
+
+    Args:
+        state_log: Optional WriteAheadLog the player state is kept in.
+        stats: Optional CommandStats to record the command latencies in.
+        watch_library: If True, videos.txt is reloaded before a command
+            whenever it was modified.
+    """
     print("""Hello and welcome to YouTube, what would you like to do?
     Enter HELP for list of available commands or EXIT to terminate.""")
-    video_player = VideoPlayer()
-    parser = CommandParser(video_player)
+    video_player = VideoPlayer(state_log=state_log)
+    parser = CommandParser(video_player, stats=stats)
     while True:
         command = input("YT> ")
         if command.upper() == "EXIT":
             break
+        if watch_library:
+            video_player.reload_library_if_changed()
         try:
             parser.execute_command(command.split())
         except CommandException as e:
             print(e)
+        parser.stats.dump_if_due()
     print("YouTube has now terminated its execution. "
           "Thank you and goodbye!")
+
+
+def run_batch(command_file, state_log=None, stats=None, watch_library=False):
+    """Executes every command of command_file until EOF or EXIT.
+
+    The line after a command that asks a question, such as which search
+    result to play, is taken as the answer, exactly as piping the file into
+    the prompt would. Reaching the end of the file answers no.
+
+    Args:
+        command_file: A text file object to read the commands from.
+        state_log: Optional WriteAheadLog the player state is kept in.
+        stats: Optional CommandStats to record the command latencies in.
+        watch_library: If True, videos.txt is reloaded before a command
+            whenever it was modified.
+
+    Returns:
+        The number of commands executed.
+    """
+    output = BatchedFileWriter(sys.stdout, BATCH_BUFFER_SIZE)
+    player = VideoPlayer(output=output, interactive=False, state_log=state_log)
+    parser = CommandParser(player, stats=stats)
+    executed = 0
+    try:
+        for line in command_file:
+            line = line.rstrip("\n")
+            if player.awaiting_answer:
+                player.answer(line)
+                continue
+            if line.upper() == "EXIT":
+                break
+            executed += 1
+            if watch_library:
+                player.reload_library_if_changed()
+            try:
+                parser.execute_command(line.split())
+            except CommandException as e:
+                output.print(e)
+            parser.stats.dump_if_due()
+        if player.awaiting_answer:
+            # Running out of input answers the question with a no.
+            player.answer("")
+    finally:
+        output.flush()
+    return executed
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument(
+        "--batch", nargs="?", const="-", metavar="FILE",
+        help="execute the commands of FILE, or of stdin if FILE is - or omitted")
+    argument_parser.add_argument(
+        "--state-log", metavar="PATH",
+        help="keep flags and playlists in the write-ahead log at PATH across runs")
+    argument_parser.add_argument(
+        "--fsync-every", type=int, default=1, metavar="N",
+        help="fsync the state log every N records (0: never), default 1")
+    argument_parser.add_argument(
+        "--snapshot-every", type=int, default=SNAPSHOT_EVERY, metavar="N",
+        help="snapshot the state and truncate the log every N records "
+             f"(0: never), default {SNAPSHOT_EVERY}")
+    argument_parser.add_argument(
+        "--stats-file", metavar="PATH",
+        help="write the command statistics to PATH as JSON, periodically and on exit")
+    argument_parser.add_argument(
+        "--stats-every", type=float, default=60.0, metavar="SECONDS",
+        help="seconds between two writes of the statistics file, default 60")
+    argument_parser.add_argument(
+        "--watch-library", action="store_true",
+        help="reload the video file before a command whenever it was modified")
+    arguments = argument_parser.parse_args(argv)
+    state_log = None
+    if arguments.state_log is not None:
+        state_log = WriteAheadLog(arguments.state_log, arguments.fsync_every,
+                                  arguments.snapshot_every)
+    stats = CommandStats(arguments.stats_file, arguments.stats_every)
+    try:
+        _run(arguments, state_log, stats)
+    finally:
+        if state_log is not None:
+            state_log.close()
+        if arguments.stats_file is not None:
+            stats.dump()
+
+
+def _run(arguments, state_log, stats):
+    if arguments.batch is None:
+        run_interactive(state_log, stats, arguments.watch_library)
+        return
+
+    start = time.perf_counter()
+    if arguments.batch == "-":
+        executed = run_batch(sys.stdin, state_log, stats, arguments.watch_library)
+    else:
+        with open(arguments.batch) as command_file:
+            executed = run_batch(command_file, state_log, stats,
+                                 arguments.watch_library)
+    elapsed = time.perf_counter() - start
+    print(f"Executed {executed} commands in {elapsed:.3f} seconds",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
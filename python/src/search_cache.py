@@ -0,0 +1,58 @@
+"""A bounded cache of search results."""
+
+from collections import OrderedDict
+
+# Number of search results kept by default.
+SEARCH_CACHE_SIZE = 256
+
+
+class SearchCache:
+    """A least recently used cache of search results.
+
+    Every lookup passes the current version of the catalog. When it differs
+    from the version the cached results were computed at, because a video
+    was flagged, allowed or the library reloaded, every result is dropped.
+    """
+
+    def __init__(self, capacity=SEARCH_CACHE_SIZE):
+        """
+        Args:
+            capacity: The maximum number of results kept, 0 to cache nothing.
+        """
+        self._capacity = capacity
+        self._entries = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def get(self, key, version, compute):
+        """Returns the cached result of key, calling compute() on a miss.
+
+        Args:
+            key: The normalized query.
+            version: The version of the catalog the result must be valid for.
+            compute: Function returning the result. It is shared by every
+                later hit, so it should be immutable.
+        """
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute()
+        if self._capacity > 0:
+            self._entries[key] = result
+            if len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+        return result
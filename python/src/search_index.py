@@ -0,0 +1,293 @@
+"""Inverted indexes used to answer video searches."""
+
+from array import array
+import bisect
+import heapq
+import itertools
+import re
+
+# Length of the n-grams stored in the title index.
+GRAM_SIZE = 3
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def _insert(posting, ordinal):
+    """Adds ordinal to a sorted posting list, keeping it sorted."""
+    if not posting or posting[-1] <= ordinal:
+        posting.append(ordinal)
+    else:
+        bisect.insort(posting, ordinal)
+
+
+def _discard(posting, ordinal):
+    """Removes ordinal from a sorted posting list, if it is there."""
+    index = bisect.bisect_left(posting, ordinal)
+    if index < len(posting) and posting[index] == ordinal:
+        del posting[index]
+
+
+def _grams(text):
+    """Returns the set of distinct n-grams of a (lower-cased) string."""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class TitleIndex:
+    """A trigram index over lower-cased video titles.
+
+    Each trigram maps to a posting list of video ordinals (the position of
+    the video in the library). A substring query only has to check the
+    videos that contain every trigram of the query.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._size = 0
+
+    def add(self, ordinal, title):
+        """Indexes the title of the video at the given ordinal.
+
+        Args:
+            ordinal: The position of the video in the library.
+            title: The title of the video.
+        """
+        for gram in _grams(title.lower()):
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            _insert(posting, ordinal)
+        self._size = max(self._size, ordinal + 1)
+
+    def remove(self, ordinal, title):
+        """Removes the title of the video at the given ordinal from the index."""
+        for gram in _grams(title.lower()):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                _discard(posting, ordinal)
+
+    def merge(self, other):
+        """Adds every posting of another TitleIndex, built over later ordinals.
+
+        Every ordinal in other must be greater than every ordinal in this
+        index, so each posting list can simply be extended.
+        """
+        for gram, posting in other._postings.items():
+            mine = self._postings.get(gram)
+            if mine is None:
+                self._postings[gram] = posting
+            else:
+                mine.extend(posting)
+        self._size = max(self._size, other._size)
+
+    def candidates(self, search_term):
+        """Returns the ordinals of videos that may contain the search_term.
+
+        Args:
+            search_term: The (case-insensitive) search term.
+
+        Returns:
+            A sorted list of ordinals. Every video whose title contains the
+            search_term is in the list, but the caller still has to check
+            each one, since sharing all trigrams does not imply a match.
+            Terms shorter than a trigram cannot be looked up and return
+            every ordinal.
+        """
+        grams = _grams(search_term.lower())
+        if not grams:
+            return range(self._size)
+
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches.intersection_update(posting)
+            if not matches:
+                return []
+        return sorted(matches)
+
+
+def normalize_tag(tag):
+    """Returns the canonical form of a tag used for lookups."""
+    return tag.strip().lower()
+
+
+class TagIndex:
+    """An inverted index mapping each normalized tag to video ordinals."""
+
+    def __init__(self):
+        self._postings = {}
+
+    def add(self, ordinal, tags):
+        """Indexes the tags of the video at the given ordinal.
+
+        Args:
+            ordinal: The position of the video in the library.
+            tags: The tags of the video.
+        """
+        for tag in {normalize_tag(tag) for tag in tags}:
+            posting = self._postings.get(tag)
+            if posting is None:
+                posting = self._postings[tag] = array("I")
+            _insert(posting, ordinal)
+
+    def remove(self, ordinal, tags):
+        """Removes the tags of the video at the given ordinal from the index."""
+        for tag in {normalize_tag(tag) for tag in tags}:
+            posting = self._postings.get(tag)
+            if posting is not None:
+                _discard(posting, ordinal)
+
+    def merge(self, other):
+        """Adds every posting of another TagIndex, built over later ordinals.
+
+        Every ordinal in other must be greater than every ordinal in this
+        index, so each posting list can simply be extended.
+        """
+        for tag, posting in other._postings.items():
+            mine = self._postings.get(tag)
+            if mine is None:
+                self._postings[tag] = posting
+            else:
+                mine.extend(posting)
+
+    def lookup(self, tag):
+        """Returns the ordinals of the videos tagged with the given tag.
+
+        Args:
+            tag: The (case-insensitive) tag to look up.
+        """
+        return self._postings.get(normalize_tag(tag), ())
+
+
+def title_words(title):
+    """Returns the distinct lower-cased words of a title.
+
+    Words are runs of letters and digits; underscores separate words too,
+    so that a single command argument can hold several of them.
+    """
+    return set(_WORD.findall(title.lower()))
+
+
+def _word_grams(word):
+    """Returns the n-grams of a word padded with spaces, so short words have some."""
+    return _grams(f" {word} ")
+
+
+class FuzzyIndex:
+    """A typo-tolerant index over the words of video titles.
+
+    Every distinct title word is indexed by its n-grams, and maps to the
+    ordinals of the videos whose titles contain it. A query word is compared
+    with the words sharing one of its n-grams only, by the Dice coefficient
+    of their n-gram sets, so the cost of a query depends on the vocabulary
+    rather than on the number of videos.
+    """
+
+    def __init__(self):
+        self._words = []
+        self._word_numbers = {}
+        self._gram_counts = array("I")
+        self._gram_words = {}
+        self._word_postings = []
+
+    def _word_number(self, word):
+        number = self._word_numbers.get(word)
+        if number is None:
+            number = self._word_numbers[word] = len(self._words)
+            self._words.append(word)
+            self._word_postings.append(array("I"))
+            grams = _word_grams(word)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                posting = self._gram_words.get(gram)
+                if posting is None:
+                    posting = self._gram_words[gram] = array("I")
+                posting.append(number)
+        return number
+
+    def add(self, ordinal, title):
+        """Indexes the words of the title of the video at the given ordinal."""
+        for word in title_words(title):
+            _insert(self._word_postings[self._word_number(word)], ordinal)
+
+    def remove(self, ordinal, title):
+        """Removes the title of the video at the given ordinal from the index."""
+        for word in title_words(title):
+            number = self._word_numbers.get(word)
+            if number is not None:
+                _discard(self._word_postings[number], ordinal)
+
+    def similar_words(self, word, threshold):
+        """Returns (similarity, word_number) of every word similar enough to word.
+
+        Args:
+            word: The lower-cased word to look for.
+            threshold: The minimum Dice coefficient, between 0 and 1.
+        """
+        grams = _word_grams(word)
+        shared = {}
+        for gram in grams:
+            for number in self._gram_words.get(gram, ()):
+                shared[number] = shared.get(number, 0) + 1
+        similar = []
+        for number, count in shared.items():
+            similarity = 2 * count / (len(grams) + self._gram_counts[number])
+            if similarity >= threshold:
+                similar.append((similarity, number))
+        return similar
+
+    def search(self, search_term, limit, threshold, exclude=()):
+        """Returns the best matches of search_term, best first.
+
+        A title scores the mean, over the words of search_term, of the best
+        similarity between that word and a word of the title. Ties are
+        broken by ordinal.
+
+        Args:
+            search_term: The text to look for, typos included.
+            limit: The maximum number of results.
+            threshold: The minimum similarity of two words, between 0 and 1.
+            exclude: Optional container of ordinals to skip, such as the
+                flagged ones.
+
+        Returns:
+            A list of (score, ordinal).
+        """
+        words = title_words(search_term)
+        if not words:
+            return []
+        if len(words) == 1:
+            return self._search_word(words.pop(), limit, threshold, exclude)
+        scores = {}
+        for word in words:
+            best = {}
+            for similarity, number in self.similar_words(word, threshold):
+                for ordinal in self._word_postings[number]:
+                    if best.get(ordinal, 0) < similarity:
+                        best[ordinal] = similarity
+            for ordinal, similarity in best.items():
+                scores[ordinal] = scores.get(ordinal, 0) + similarity / len(words)
+        ranked = ((score, ordinal) for ordinal, score in scores.items()
+                  if ordinal not in exclude)
+        return heapq.nsmallest(limit, ranked, key=lambda match: (-match[0], match[1]))
+
+    def _search_word(self, word, limit, threshold, exclude):
+        """search() for a single word, reading only the postings it needs."""
+        matches, seen = [], set()
+        similar = sorted(self.similar_words(word, threshold), reverse=True)
+        for similarity, group in itertools.groupby(similar, key=lambda match: match[0]):
+            postings = [self._word_postings[number] for _, number in group]
+            for ordinal in heapq.merge(*postings):
+                if ordinal in seen or ordinal in exclude:
+                    continue
+                seen.add(ordinal)
+                matches.append((similarity, ordinal))
+                if len(matches) == limit:
+                    return matches
+        return matches
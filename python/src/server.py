@@ -0,0 +1,140 @@
+"""An asyncio server that runs one video player session per connection.
+
+Every connection speaks the same command language as the YT> prompt, one
+command per line. Sessions have their own playing, paused, playlist and
+flag state, while the catalog is loaded once and shared by all of them.
+
+Run `python3 -m src.server --port 8000` or `python3 -m src.server --unix PATH`.
+"""
+
+from .command_parser import CommandException, CommandParser
+from .command_stats import CommandStats
+from .output import BufferWriter
+from .session_overlay import SessionLibrary
+from .video_library import VideoLibrary
+from .video_player import VideoPlayer
+import argparse
+import asyncio
+
+WELCOME = ("Hello and welcome to YouTube, what would you like to do?\n"
+           "Enter HELP for list of available commands or EXIT to terminate.\n")
+GOODBYE = "YouTube has now terminated its execution. Thank you and goodbye!\n"
+
+
+class Session:
+    """The player state of a single connection."""
+
+    def __init__(self, video_library, stats=None):
+        self._output = BufferWriter()
+        self._player = VideoPlayer(SessionLibrary(video_library), self._output,
+                                   interactive=False)
+        self._parser = CommandParser(self._player, stats=stats)
+
+    def is_exit(self, line):
+        """Returns True if line ends the session rather than answering a question."""
+        return not self._player.awaiting_answer and line.upper() == "EXIT"
+
+    def execute(self, line):
+        """Executes one line of input and returns the output it produced."""
+        if self._player.awaiting_answer:
+            self._player.answer(line)
+        else:
+            try:
+                self._parser.execute_command(line.split())
+            except CommandException as e:
+                self._output.print(e)
+        return self._output.drain()
+
+
+class VideoServer:
+    """Serves Sessions over a shared VideoLibrary.
+
+    The command statistics, and so the output of STATS, are shared by all
+    sessions.
+    """
+
+    def __init__(self, video_library, stats=None):
+        self._video_library = video_library
+        self._stats = stats if stats is not None else CommandStats()
+
+    async def handle_connection(self, reader, writer):
+        session = Session(self._video_library, self._stats)
+        writer.write(WELCOME.encode())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode("utf-8", errors="replace").rstrip("\r\n")
+                if session.is_exit(line):
+                    writer.write(GOODBYE.encode())
+                    break
+                writer.write(session.execute(line).encode())
+                await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host=None, port=None, path=None):
+        """Starts listening on a TCP port, or on a Unix socket if path is given."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+async def _serve(arguments):
+    stats = CommandStats(arguments.stats_file, arguments.stats_every)
+    video_library = VideoLibrary(lazy=arguments.lazy, workers=arguments.workers)
+    server = await VideoServer(video_library, stats).start(
+        arguments.host, arguments.port, arguments.unix)
+    dumper = None
+    if arguments.stats_file is not None:
+        dumper = asyncio.create_task(_dump_periodically(stats))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if dumper is not None:
+            dumper.cancel()
+            stats.dump()
+
+
+async def _dump_periodically(stats):
+    while True:
+        await asyncio.sleep(stats.dump_interval)
+        stats.dump()
+
+
+def parse_arguments(argv=None):
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8000)
+    argument_parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket")
+    argument_parser.add_argument("--lazy", action="store_true",
+                                 help="load the catalog lazily")
+    argument_parser.add_argument("--workers", type=int, default=1, metavar="N",
+                                 help="parse and index the catalog with N processes")
+    argument_parser.add_argument(
+        "--stats-file", metavar="PATH",
+        help="write the command statistics to PATH as JSON, periodically and on exit")
+    argument_parser.add_argument(
+        "--stats-every", type=float, default=60.0, metavar="SECONDS",
+        help="seconds between two writes of the statistics file, default 60")
+    arguments = argument_parser.parse_args(argv)
+    if arguments.lazy and arguments.workers > 1:
+        argument_parser.error("--workers cannot be combined with --lazy")
+    return arguments
+
+
+def main(argv=None):
+    asyncio.run(_serve(parse_arguments(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Per-session, copy-on-write views of a shared video library."""
+
+from .video import Video
+
+
+class CatalogOverlay:
+    """A catalog view that keeps its own flag changes.
+
+    Rows are read from the shared catalog. Flag state is read from the
+    session's deltas first and from the shared catalog otherwise, so only
+    the videos this session flagged or allowed take any memory.
+    """
+
+    def __init__(self, catalog):
+        self._base = catalog
+        # ordinal -> flag reason, or None for a video allowed in this session.
+        self._deltas = {}
+        self._changes = 0
+
+    def __len__(self):
+        return len(self._base)
+
+    def ordinal(self, video_id):
+        return self._base.ordinal(video_id)
+
+    def video_id(self, ordinal):
+        return self._base.video_id(ordinal)
+
+    def title(self, ordinal):
+        return self._base.title(ordinal)
+
+    def tags(self, ordinal):
+        return self._base.tags(ordinal)
+
+    def is_removed(self, ordinal):
+        return self._base.is_removed(ordinal)
+
+    def ordinals(self):
+        return self._base.ordinals()
+
+    def video_count(self):
+        return self._base.video_count()
+
+    @property
+    def version(self):
+        """Changes whenever the shared catalog or this session's flags change."""
+        return self._base.version + self._changes
+
+    def _prune(self):
+        """Drops the changes made to videos the shared library has removed since."""
+        if self._deltas and self._base.video_count() != len(self._base):
+            is_removed = self._base.is_removed
+            for ordinal in [ordinal for ordinal in self._deltas if is_removed(ordinal)]:
+                del self._deltas[ordinal]
+
+    @property
+    def deltas(self):
+        """The dict of ordinal -> flag reason (None if allowed) of this session."""
+        self._prune()
+        return self._deltas
+
+    def is_flagged(self, ordinal):
+        if ordinal in self._deltas and not self._base.is_removed(ordinal):
+            return self._deltas[ordinal] is not None
+        return self._base.is_flagged(ordinal)
+
+    def flagged_ordinals(self):
+        self._prune()
+        if not self._deltas:
+            return self._base.flagged_ordinals()
+        flagged = set(self._base.flagged_ordinals())
+        for ordinal, reason in self._deltas.items():
+            if reason is None:
+                flagged.discard(ordinal)
+            else:
+                flagged.add(ordinal)
+        return flagged
+
+    def flagged_count(self):
+        """Counts the flagged videos in O(number of flag changes of this session)."""
+        self._prune()
+        count = len(self._base.flagged_ordinals())
+        for ordinal, reason in self._deltas.items():
+            count += (reason is not None) - self._base.is_flagged(ordinal)
+        return count
+
+    def flag_reason(self, ordinal):
+        if ordinal in self._deltas and not self._base.is_removed(ordinal):
+            return self._deltas[ordinal]
+        return self._base.flag_reason(ordinal)
+
+    def _set(self, ordinal, reason):
+        self._changes += 1
+        if reason == self._base.flag_reason(ordinal):
+            self._deltas.pop(ordinal, None)
+        else:
+            self._deltas[ordinal] = reason
+
+    def set_flag(self, ordinal, reason):
+        """Flags the video for this session only."""
+        self._set(ordinal, reason)
+
+    def clear_flag(self, ordinal):
+        """Allows the video for this session only."""
+        self._set(ordinal, None)
+
+
+class SessionLibrary:
+    """A VideoLibrary as seen by one session.
+
+    It answers the same queries as the shared library, whose catalog and
+    indexes it reuses, but flag and allow only change a CatalogOverlay.
+    Memory per session is therefore proportional to its flag changes.
+    """
+
+    def __init__(self, video_library):
+        self._library = video_library
+        self._catalog = CatalogOverlay(video_library.catalog)
+
+    def _video_at(self, ordinal):
+        return Video.view(self._catalog, ordinal)
+
+    def __len__(self):
+        return len(self._library)
+
+    @property
+    def can_reload(self):
+        """False: the shared catalog is only reloaded by its owner."""
+        return False
+
+    def get_video(self, video_id):
+        ordinal = self._catalog.ordinal(video_id)
+        if ordinal is None:
+            return None
+        return self._video_at(ordinal)
+
+    def get_all_videos(self):
+        self._library.catalog.prefetch()
+        return [self._video_at(ordinal) for ordinal in self._catalog.ordinals()]
+
+    def search_titles(self, search_term):
+        return [self._video_at(ordinal)
+                for ordinal in self._library.search_title_ordinals(search_term)]
+
+    def search_tag(self, video_tag):
+        return [self._video_at(ordinal)
+                for ordinal in self._library.search_tag_ordinals(video_tag)]
+
+    @property
+    def search_cache(self):
+        return self._library.search_cache
+
+    def search_titles_sorted(self, search_term, limit=None):
+        if not self._catalog.deltas:
+            # Without flag changes the shared cached results are valid here.
+            ordinals = self._library.search_title_results(search_term, limit)
+        else:
+            ordinals = self._library.sorted_playable_ordinals(
+                self._library.search_title_ordinals(search_term), limit,
+                self._catalog.flagged_ordinals(), self._overrides())
+        return [self._video_at(ordinal) for ordinal in ordinals]
+
+    def search_tag_sorted(self, video_tag, limit=None):
+        if not self._catalog.deltas:
+            ordinals = self._library.search_tag_results(video_tag, limit)
+        else:
+            ordinals = self._library.sorted_playable_ordinals(
+                self._library.search_tag_ordinals(video_tag), limit,
+                self._catalog.flagged_ordinals(), self._overrides())
+        return [self._video_at(ordinal) for ordinal in ordinals]
+
+    def search_tag_query(self, query):
+        return [self._video_at(ordinal) for ordinal in self._library.search_tag_query_ordinals(
+            query, self._catalog.flagged_ordinals(), self._overrides())]
+
+    def search_titles_fuzzy(self, search_term):
+        return [self._video_at(ordinal) for ordinal in self._library.search_fuzzy_ordinals(
+            search_term, exclude=self._catalog.flagged_ordinals())]
+
+    def _overrides(self):
+        return {ordinal: str(self._video_at(ordinal)) for ordinal in self._catalog.deltas}
+
+    def get_sorted_lines(self):
+        return self._library.get_sorted_lines(self._overrides())
+
+    def get_sorted_page(self, after, count):
+        return self._library.get_sorted_page(after, count, self._overrides())
+
+    def flagged_count(self):
+        return self._catalog.flagged_count()
+
+    def get_flagged_videos(self):
+        return sorted((self._video_at(ordinal) for ordinal in self._catalog.flagged_ordinals()),
+                      key=str)
+
+    def get_random_playable_video(self):
+        base = self._library.catalog
+        hidden, revealed = set(), []
+        for ordinal, reason in self._catalog.deltas.items():
+            if reason is None:
+                revealed.append(ordinal)
+            elif not base.is_flagged(ordinal):
+                hidden.add(ordinal)
+        ordinal = self._library.random_playable_ordinal(hidden, revealed)
+        if ordinal is None:
+            return None
+        return self._video_at(ordinal)
@@ -0,0 +1,169 @@
+"""A maintained, sorted rendering of every video in a catalog."""
+
+from .video import Video
+from array import array
+import bisect
+import heapq
+import itertools
+
+# Position of the ordinals that are not in the listing, such as removed ones.
+_ABSENT = 0xFFFFFFFF
+
+
+class SortedListing:
+    """The str() of every video in a catalog, kept in sorted order.
+
+    The listing is rendered and sorted once, on first use. When a video is
+    flagged or allowed only its own line is rendered again. If the new line
+    no longer fits between its neighbours it is moved to its sorted place,
+    without sorting or rendering anything else.
+    """
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+        self._lines = None
+        self._order = None
+        self._positions = None
+        catalog.add_flag_listener(self.update)
+
+    def _render(self, ordinal):
+        return str(Video.view(self._catalog, ordinal))
+
+    def _build(self):
+        rendered = sorted((self._render(ordinal), ordinal)
+                          for ordinal in self._catalog.ordinals())
+        self._store(rendered)
+
+    def _store(self, rendered):
+        """Keeps the sorted (line, ordinal) pairs as the listing."""
+        self._lines = [line for line, _ in rendered]
+        self._order = array("I", (ordinal for _, ordinal in rendered))
+        self._positions = array("I", [_ABSENT]) * len(self._catalog)
+        for position, (_, ordinal) in enumerate(rendered):
+            self._positions[ordinal] = position
+
+    def lines(self):
+        """Returns the sorted lines. The caller must not modify the list."""
+        if self._lines is None:
+            self._catalog.prefetch()
+            self._build()
+        return self._lines
+
+    def lines_with(self, overrides):
+        """Returns the sorted lines with some of them replaced.
+
+        The stored listing is not modified. The lines that are not replaced
+        are still sorted, so the replaced ones only need to be merged in.
+
+        Args:
+            overrides: Dict of ordinal -> line to use instead of the stored one.
+        """
+        lines = self.lines()
+        overrides = self._listed(overrides)
+        replaced = {self._positions[ordinal] for ordinal in overrides}
+        kept = (line for position, line in enumerate(lines) if position not in replaced)
+        return list(heapq.merge(kept, sorted(overrides.values())))
+
+    def _listed(self, overrides):
+        """Returns the overrides of the ordinals that are in the listing."""
+        positions = self._positions
+        return {ordinal: line for ordinal, line in overrides.items()
+                if ordinal < len(positions) and positions[ordinal] != _ABSENT}
+
+    def page(self, after, count, overrides=None):
+        """Returns up to count sorted lines that come after a given line.
+
+        Finding the start is a binary search, so a page costs O(count +
+        len(overrides)) whatever its place in the listing.
+
+        Args:
+            after: The last line of the previous page, None for the first page.
+                It does not need to be in the listing any more.
+            count: The maximum number of lines to return.
+            overrides: Optional dict of ordinal -> line to use instead of the
+                stored one, as for lines_with.
+        """
+        lines = self.lines()
+        start = 0 if after is None else bisect.bisect_right(lines, after)
+        if not overrides:
+            return lines[start:start + count]
+        overrides = self._listed(overrides)
+        replaced = {self._positions[ordinal] for ordinal in overrides}
+        kept = (lines[position] for position in range(start, len(lines))
+                if position not in replaced)
+        moved = sorted(line for line in overrides.values()
+                       if after is None or line > after)
+        return list(itertools.islice(heapq.merge(kept, moved), count))
+
+    def smallest(self, ordinals, count=None, overrides=None):
+        """Returns the ordinals whose lines come first, in sorted order.
+
+        The position of a video in the listing is its rank, so the ordinals
+        are compared as integers without rendering any line. Choosing count
+        of n ordinals is a bounded heap, O(n log count).
+
+        Args:
+            ordinals: The ordinals to choose from.
+            count: The maximum number of ordinals to return, None for all.
+            overrides: Optional dict of ordinal -> line to use instead of the
+                stored one, as for lines_with.
+        """
+        lines = self.lines()
+        rank = self._positions.__getitem__
+        moved = []
+        if overrides:
+            moved = sorted((overrides[ordinal], ordinal)
+                           for ordinal in ordinals if ordinal in overrides)
+            ordinals = [ordinal for ordinal in ordinals if ordinal not in overrides]
+        if count is None:
+            stored = sorted(ordinals, key=rank)
+        else:
+            stored = heapq.nsmallest(count, ordinals, key=rank)
+        if not moved:
+            return stored
+        merged = heapq.merge(((lines[rank(ordinal)], ordinal) for ordinal in stored), moved)
+        return [ordinal for _, ordinal in itertools.islice(merged, count)]
+
+    def update(self, ordinal):
+        """Renders the line of the video at the given ordinal again."""
+        if self._lines is None:
+            return
+        position = self._positions[ordinal]
+        if position == _ABSENT:
+            return
+        line = self._lines[position] = self._render(ordinal)
+        if ((position > 0 and self._lines[position - 1] > line)
+                or (position + 1 < len(self._lines) and line > self._lines[position + 1])):
+            self._move(position, line)
+
+    def _move(self, position, line):
+        """Moves the line at position to where it belongs in sorted order."""
+        ordinal = self._order.pop(position)
+        del self._lines[position]
+        target = bisect.bisect_left(self._lines, line)
+        self._lines.insert(target, line)
+        self._order.insert(target, ordinal)
+        for shifted in range(min(position, target), max(position, target) + 1):
+            self._positions[self._order[shifted]] = shifted
+
+    def refresh(self, ordinals):
+        """Brings the listing up to date after rows were added, removed or replaced.
+
+        Only the given rows are rendered again. They are sorted among
+        themselves and merged with the lines that did not change, which
+        is linear rather than a full sort.
+
+        Args:
+            ordinals: The ordinals of every row that changed.
+        """
+        if self._lines is None:
+            return
+        ordinals = set(ordinals)
+        dropped = {self._positions[ordinal] for ordinal in ordinals
+                   if ordinal < len(self._positions)} - {_ABSENT}
+        kept = ((line, self._order[position])
+                for position, line in enumerate(self._lines)
+                if position not in dropped)
+        changed = sorted((self._render(ordinal), ordinal) for ordinal in ordinals
+                         if not self._catalog.is_removed(ordinal))
+        self._store(list(heapq.merge(kept, changed)))
@@ -0,0 +1,175 @@
+"""Boolean queries over video tags, evaluated over sorted posting lists."""
+
+from bisect import bisect_left
+from itertools import filterfalse
+import re
+
+_TOKEN = re.compile(r"[()]|[^\s()]+")
+_OPERATORS = ("AND", "OR", "NOT")
+
+# Above this many ordinals per lookup, membership is tested with a binary
+# search instead of building a set of the ordinals.
+_SEARCH_RATIO = 32
+
+
+def parse_tag_query(query):
+    """Parses a query such as "#cat AND (#animal OR #pet) NOT #dog".
+
+    NOT binds tighter than AND, which binds tighter than OR. Two terms
+    with no operator between them are joined with AND. Operators are
+    case-insensitive; every other word is a tag.
+
+    Returns:
+        A tree of tuples: ("tag", tag), ("not", node), ("and", left, right)
+        and ("or", left, right).
+
+    Raises:
+        ValueError: If the query is not well formed.
+    """
+    tokens = _TOKEN.findall(query)
+    position = 0
+
+    def peek():
+        if position == len(tokens):
+            return None
+        token = tokens[position]
+        return token.upper() if token.upper() in _OPERATORS else token
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        node = parse_and()
+        while peek() == "OR":
+            take()
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                take()
+            node = ("and", node, parse_not())
+        return node
+
+    def parse_not():
+        token = peek()
+        if token == "NOT":
+            take()
+            return ("not", parse_not())
+        if token == "(":
+            take()
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError("Missing )")
+            take()
+            return node
+        if token is None:
+            raise ValueError("Expected a tag at the end of the query")
+        if token in _OPERATORS or token == ")":
+            raise ValueError(f"Expected a tag before {take()}")
+        return ("tag", take())
+
+    node = parse_or()
+    if position < len(tokens):
+        raise ValueError(f"Unexpected {tokens[position]}")
+    return node
+
+
+def evaluate(node, postings, universe):
+    """Returns the sorted ordinals of the videos matching a parsed query.
+
+    The terms of a chain of ANDs are intersected smallest first, and the
+    ones under NOT are subtracted from the result. NOT is carried upwards
+    as a complement and only taken against universe if the whole query is
+    negated, such as "NOT #dog", so a query costs about the size of its
+    postings rather than the size of the catalog.
+
+    Args:
+        node: The tree returned by parse_tag_query.
+        postings: Function returning the sorted ordinals of the videos
+            with a tag.
+        universe: Function returning the sorted ordinals of every video.
+    """
+    ordinals, negated = _evaluate(node, postings)
+    if negated:
+        ordinals = _difference(universe(), ordinals)
+    return list(ordinals)
+
+
+def _evaluate(node, postings):
+    """Returns (ordinals, negated), where negated means every video but ordinals."""
+    kind = node[0]
+    if kind == "tag":
+        return postings(node[1]), False
+    if kind == "not":
+        ordinals, negated = _evaluate(node[1], postings)
+        return ordinals, not negated
+    positive, negative = [], []
+    for operand in _operands(node, kind):
+        ordinals, negated = _evaluate(operand, postings)
+        (negative if negated else positive).append(ordinals)
+    if kind == "or":
+        # (a OR NOT b) is NOT (b AND NOT a).
+        if not negative:
+            return _union(positive), False
+        return _difference(_intersection(negative), _union(positive)), True
+    # (NOT a AND NOT b) is NOT (a OR b).
+    if not positive:
+        return _union(negative), True
+    result = _intersection(positive)
+    for ordinals in sorted(negative, key=len):
+        result = _difference(result, ordinals)
+    return result, False
+
+
+def _operands(node, kind):
+    """Yields the operands of a chain of the same binary operator."""
+    if node[0] == kind:
+        yield from _operands(node[1], kind)
+        yield from _operands(node[2], kind)
+    else:
+        yield node
+
+
+def _contains(ordinals, lookups):
+    """Returns a membership test for sorted ordinals, for a number of lookups.
+
+    A few lookups are binary searches in ordinals; many build a set.
+    """
+    if lookups * _SEARCH_RATIO >= len(ordinals):
+        return set(ordinals).__contains__
+    count = len(ordinals)
+
+    def contains(ordinal):
+        index = bisect_left(ordinals, ordinal)
+        return index < count and ordinals[index] == ordinal
+    return contains
+
+
+def _intersection(lists):
+    """Intersects sorted lists of ordinals, smallest first."""
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for ordinals in lists[1:]:
+        if not result:
+            break
+        result = list(filter(_contains(ordinals, len(result)), result))
+    return result
+
+
+def _difference(left, right):
+    """Returns the sorted ordinals of left that are not in right."""
+    if not left or not right:
+        return left
+    return list(filterfalse(_contains(right, len(left)), left))
+
+
+def _union(lists):
+    """Returns the sorted ordinals that are in any of the lists."""
+    if len(lists) == 1:
+        return lists[0]
+    return sorted(set().union(*lists))
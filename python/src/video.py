@@ -1,51 +1,64 @@
 """A video class."""
 
+from .video_catalog import ColumnarCatalog
 from typing import Sequence
 
 
 class Video:
-    """A class used to represent a Video."""
+    """A class used to represent a Video.
+
+    A Video is a lightweight view over one row of a catalog. The catalog
+    owns the title, id, tags and flag state, so views can be created on
+    demand and two views of the same row compare equal.
+    """
+
+    __slots__ = ("_catalog", "_ordinal")
 
     def __init__(self, video_title: str, video_id: str, video_tags: Sequence[str]):
-        """Video constructor."""
-        self._title = video_title
-        self._video_id = video_id
-        self._flagged = False
-        self._flagged_reason = None
+        """Video constructor, for a video that is not part of a library."""
+        self._catalog = ColumnarCatalog()
+        self._ordinal = self._catalog.append(video_title, video_id, video_tags)
 
-        # Turn the tags into a tuple here so it's unmodifiable,
-        # in case the caller changes the 'video_tags' they passed to us
-        self._tags = tuple(video_tags)
+    @classmethod
+    def view(cls, catalog, ordinal):
+        """Returns a Video for the row at the given ordinal of a catalog."""
+        video = cls.__new__(cls)
+        video._catalog = catalog
+        video._ordinal = ordinal
+        return video
 
     @property
     def title(self) -> str:
         """Returns the title of a video."""
-        return self._title
+        return self._catalog.title(self._ordinal)
 
     @property
     def video_id(self) -> str:
         """Returns the video id of a video."""
-        return self._video_id
+        return self._catalog.video_id(self._ordinal)
 
     @property
     def tags(self) -> Sequence[str]:
         """Returns the list of tags of a video."""
-        return self._tags
+        return self._catalog.tags(self._ordinal)
 
     @property
     def flagged(self):
-        if self._flagged:
-            return self._flagged_reason
-        else:
-            return None
+        return self._catalog.flag_reason(self._ordinal)
 
     def flag(self, flagged_reason):
-        self._flagged = True
-        self._flagged_reason = flagged_reason
+        self._catalog.set_flag(self._ordinal, flagged_reason)
 
     def allow(self):
-        self._flagged = False
-        self._flagged_reason = None
+        self._catalog.clear_flag(self._ordinal)
+
+    def __eq__(self, other):
+        if not isinstance(other, Video):
+            return NotImplemented
+        return self._catalog is other._catalog and self._ordinal == other._ordinal
+
+    def __hash__(self):
+        return hash((id(self._catalog), self._ordinal))
 
     def __str__(self):
         """Changes string representation to title (video_id) [tags]"""
@@ -53,4 +66,4 @@ class Video:
         if self.flagged is None:
             return str_representation
         else:
-            return f"{str_representation} - FLAGGED (reason: {self._flagged_reason})"
+            return f"{str_representation} - FLAGGED (reason: {self.flagged})"
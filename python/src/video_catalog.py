@@ -0,0 +1,195 @@
+"""Row storage behind the video library."""
+
+from array import array
+import sys
+
+
+class CatalogBase:
+    """Common state of every catalog backend.
+
+    A catalog addresses its videos by ordinal, the position of the video in
+    videos.txt. Backends implement __len__, ordinal, video_id, title, tags
+    and rows. A backend that can be reloaded may also remove videos, whose
+    ordinals are then skipped by ordinals() but never reused, so __len__
+    is the number of ordinals rather than of videos. Flags are kept here
+    for every backend, as a bitmap with one bit per ordinal plus a
+    dictionary of the reasons of flagged videos.
+    """
+
+    has_duplicates = False
+
+    def __init__(self):
+        self._flags = bytearray()
+        self._flag_reasons = {}
+        self._flag_listeners = []
+        self._version = 0
+
+    @property
+    def version(self):
+        """A counter that changes whenever a flag or a row changes."""
+        return self._version
+
+    def changed(self):
+        """Bumps version after rows were added, removed or replaced."""
+        self._version += 1
+
+    def add_flag_listener(self, listener):
+        """Registers listener(ordinal), called after a video is (un)flagged."""
+        self._flag_listeners.append(listener)
+
+    def _notify_flag(self, ordinal):
+        self._version += 1
+        for listener in self._flag_listeners:
+            listener(ordinal)
+
+    def prefetch(self):
+        """Loads every row ahead of a full scan. A no-op unless lazy."""
+
+    def is_removed(self, ordinal):
+        """Returns True if the video at the given ordinal was removed."""
+        return False
+
+    def ordinals(self):
+        """Returns the ordinals of every video that was not removed, in order."""
+        return range(len(self))
+
+    def video_count(self):
+        """Returns the number of videos that were not removed."""
+        return len(self)
+
+    def close(self):
+        """Releases any file held by the catalog."""
+
+    def is_flagged(self, ordinal):
+        """Returns True if the video at the given ordinal is flagged."""
+        byte = ordinal >> 3
+        return byte < len(self._flags) and bool(self._flags[byte] >> (ordinal & 7) & 1)
+
+    def flag_reason(self, ordinal):
+        """Returns the flag reason of the video, None if it is not flagged."""
+        return self._flag_reasons.get(ordinal)
+
+    def flagged_ordinals(self):
+        """Returns the ordinals of every flagged video."""
+        return self._flag_reasons.keys()
+
+    def set_flag(self, ordinal, reason):
+        """Flags the video at the given ordinal."""
+        byte = ordinal >> 3
+        if byte >= len(self._flags):
+            self._flags.extend(bytes(byte + 1 - len(self._flags)))
+        self._flags[byte] |= 1 << (ordinal & 7)
+        self._flag_reasons[ordinal] = reason
+        self._notify_flag(ordinal)
+
+    def clear_flag(self, ordinal):
+        """Removes the flag from the video at the given ordinal."""
+        if ordinal in self._flag_reasons:
+            del self._flag_reasons[ordinal]
+            self._flags[ordinal >> 3] &= ~(1 << (ordinal & 7)) & 0xFF
+            self._notify_flag(ordinal)
+
+
+class ColumnarCatalog(CatalogBase):
+    """An in-memory catalog stored as a struct of arrays.
+
+    Every column is a flat list or array indexed by ordinal. Tags are
+    interned into a vocabulary and stored as arrays of tag numbers, with
+    tag_starts[ordinal] marking where the tags of each video begin.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._ordinals = {}
+        self._video_ids = []
+        self._titles = []
+        self._tag_names = []
+        self._tag_numbers = {}
+        self._tag_starts = array("I", [0])
+        self._tag_refs = array("I")
+        # Tags of rows replaced by a later duplicate row in videos.txt, or
+        # by a reload.
+        self._replaced_tags = {}
+        self._removed = set()
+
+    def _tag_number(self, tag):
+        number = self._tag_numbers.get(tag)
+        if number is None:
+            number = self._tag_numbers[tag] = len(self._tag_names)
+            self._tag_names.append(sys.intern(tag))
+        return number
+
+    def append(self, title, video_id, tags):
+        """Adds a video and returns its ordinal.
+
+        A video_id that is already present keeps its ordinal and has its
+        title and tags replaced.
+        """
+        numbers = [self._tag_number(tag) for tag in tags]
+        ordinal = self._ordinals.get(video_id)
+        if ordinal is not None:
+            self.has_duplicates = True
+            self._titles[ordinal] = title
+            self._replaced_tags[ordinal] = array("I", numbers)
+            return ordinal
+
+        video_id = sys.intern(video_id)
+        ordinal = self._ordinals[video_id] = len(self._video_ids)
+        self._video_ids.append(video_id)
+        self._titles.append(title)
+        self._tag_refs.extend(numbers)
+        self._tag_starts.append(len(self._tag_refs))
+        return ordinal
+
+    def replace(self, ordinal, title, tags):
+        """Replaces the title and tags of the video at the given ordinal."""
+        self._titles[ordinal] = title
+        self._replaced_tags[ordinal] = array("I", (self._tag_number(tag) for tag in tags))
+
+    def remove(self, ordinal):
+        """Removes the video at the given ordinal.
+
+        Its row is kept, so existing views can still read it, but its
+        video_id no longer resolves and its ordinal is skipped by ordinals().
+        """
+        del self._ordinals[self._video_ids[ordinal]]
+        self._removed.add(ordinal)
+
+    def is_removed(self, ordinal):
+        return ordinal in self._removed
+
+    def ordinals(self):
+        if not self._removed:
+            return range(len(self._video_ids))
+        return [ordinal for ordinal in range(len(self._video_ids))
+                if ordinal not in self._removed]
+
+    def video_count(self):
+        return len(self._video_ids) - len(self._removed)
+
+    def __len__(self):
+        return len(self._video_ids)
+
+    def ordinal(self, video_id):
+        """Returns the ordinal of video_id, or None if it is not present."""
+        return self._ordinals.get(video_id)
+
+    def video_id(self, ordinal):
+        """Returns the video_id stored at the given ordinal."""
+        return self._video_ids[ordinal]
+
+    def title(self, ordinal):
+        """Returns the title stored at the given ordinal."""
+        return self._titles[ordinal]
+
+    def tags(self, ordinal):
+        """Returns the tags stored at the given ordinal as a tuple."""
+        numbers = self._replaced_tags.get(ordinal)
+        if numbers is None:
+            numbers = self._tag_refs[self._tag_starts[ordinal]:self._tag_starts[ordinal + 1]]
+        return tuple(self._tag_names[number] for number in numbers)
+
+    def rows(self):
+        """Yields (ordinal, title, video_id, tags) for every video."""
+        for ordinal in self.ordinals():
+            yield ordinal, self._titles[ordinal], self._video_ids[ordinal], self.tags(ordinal)
@@ -1,8 +1,29 @@
 """A video library class."""
 
 from .video import Video
+from .binary_catalog import BinaryCatalog, compiled_path, is_up_to_date
+from .playable_pool import PlayablePool
+from .search_cache import SEARCH_CACHE_SIZE, SearchCache
+from .search_index import FuzzyIndex, TagIndex, TitleIndex, normalize_tag
+from .sorted_listing import SortedListing
+from .tag_query import evaluate, parse_tag_query
+from .video_catalog import CatalogBase, ColumnarCatalog
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import filterfalse, repeat
 from pathlib import Path
 import csv
+import io
+import os
+
+VIDEOS_FILE = Path(__file__).parent / "videos.txt"
+
+# Number of videos returned by a fuzzy search by default.
+FUZZY_LIMIT = 10
+# Minimum similarity, between 0 and 1, of a query word and a title word for
+# the title to match it in a fuzzy search.
+FUZZY_THRESHOLD = 0.4
 
 
 # Helper Wrapper around CSV reader to strip whitespace from around
@@ -11,26 +32,467 @@ def _csv_reader_with_strip(reader):
     yield from ((item.strip() for item in line) for line in reader)
 
 
+def _parse_row(video_info):
+    """Turns the stripped fields of a videos.txt row into (title, id, tags)."""
+    title, url, tags = video_info
+    return title, url, [tag.strip() for tag in tags.split(",")] if tags else []
+
+
+def _parse_line(line):
+    """Parses a single line of videos.txt into (title, id, tags)."""
+    return _parse_row(next(_csv_reader_with_strip(
+        csv.reader([line], delimiter="|"))))
+
+
+def read_rows(video_file):
+    """Yields (title, id, tags) for every row of a videos.txt file."""
+    with open(video_file, encoding="utf-8") as video_file:
+        reader = _csv_reader_with_strip(csv.reader(video_file, delimiter="|"))
+        yield from (_parse_row(video_info) for video_info in reader)
+
+
+def line_aligned_ranges(video_file, parts):
+    """Splits a file into at most parts byte ranges that start on a line.
+
+    Returns:
+        A list of (start, end, first_line) where first_line is the number of
+        lines before start.
+    """
+    size = os.path.getsize(video_file)
+    bounds = [0]
+    with open(video_file, "rb") as video_file:
+        for part in range(1, parts):
+            video_file.seek(max(size * part // parts, bounds[-1]))
+            video_file.readline()
+            if video_file.tell() >= size:
+                break
+            if video_file.tell() > bounds[-1]:
+                bounds.append(video_file.tell())
+        bounds.append(size)
+        ranges, lines = [], 0
+        for start, end in zip(bounds, bounds[1:]):
+            ranges.append((start, end, lines))
+            video_file.seek(start)
+            data = video_file.read(end - start)
+            lines += data.count(b"\n") + (not data.endswith(b"\n"))
+    return ranges
+
+
+def _ingest_range(video_file, start, end, first_row):
+    """Parses and indexes the rows of one byte range of a videos.txt file.
+
+    Runs in a worker process. Rows are numbered from first_row, which is
+    the ordinal they will get if no row before them was a duplicate.
+
+    Returns:
+        (first_row, titles, video_ids, tags, TitleIndex, TagIndex) of the range.
+    """
+    with open(video_file, "rb") as binary_file:
+        binary_file.seek(start)
+        text = io.StringIO(binary_file.read(end - start).decode("utf-8"), newline=None)
+    titles, video_ids, tags = [], [], []
+    title_index, tag_index = TitleIndex(), TagIndex()
+    reader = _csv_reader_with_strip(csv.reader(text, delimiter="|"))
+    for row, video_info in enumerate(reader, first_row):
+        title, url, row_tags = _parse_row(video_info)
+        titles.append(title)
+        video_ids.append(url)
+        tags.append(row_tags)
+        title_index.add(row, title)
+        tag_index.add(row, row_tags)
+    return first_row, titles, video_ids, tags, title_index, tag_index
+
+
+# Policies for a video_id that appears on more than one row of videos.txt.
+DUPLICATES_LAST = "last"
+DUPLICATES_FIRST = "first"
+DUPLICATES_ERROR = "error"
+
+
+class _TextCatalog(CatalogBase):
+    """A lazily parsed videos.txt file, addressed by ordinal.
+
+    Only the byte offset of every row is read up front. Rows are parsed
+    the first time they are touched and cached afterwards. A video_id that
+    appears more than once is handled by the duplicates policy, as in
+    VideoLibrary.
+    """
+
+    def __init__(self, video_file, duplicates=DUPLICATES_LAST):
+        super().__init__()
+        self._video_file = video_file
+        self._duplicates = duplicates
+        self._ordinals = {}
+        self._video_ids = []
+        self._offsets = array("Q")
+        self._rows = {}
+        self._file = None
+        offset = 0
+        with open(self._video_file, "rb") as video_file:
+            for line in video_file:
+                # The same csv parsing as the row readers, so that quoted
+                # fields containing the delimiter find the same id.
+                fields = next(csv.reader([line.decode("utf-8")], delimiter="|"), [])
+                if len(fields) == 3:
+                    self._add_offset(fields[1].strip(), offset)
+                offset += len(line)
+
+    def _add_offset(self, video_id, offset):
+        ordinal = self._ordinals.get(video_id)
+        if ordinal is None:
+            self._ordinals[video_id] = len(self._video_ids)
+            self._video_ids.append(video_id)
+            self._offsets.append(offset)
+        elif self._duplicates == DUPLICATES_ERROR:
+            raise ValueError(f"{self._video_file}: video_id {video_id} appears more than once")
+        else:
+            self.has_duplicates = True
+            if self._duplicates == DUPLICATES_LAST:
+                self._offsets[ordinal] = offset
+
+    def _row(self, ordinal):
+        row = self._rows.get(ordinal)
+        if row is None:
+            if self._file is None:
+                self._file = open(self._video_file, "rb")
+            self._file.seek(self._offsets[ordinal])
+            title, _, tags = _parse_line(self._file.readline().decode("utf-8"))
+            row = self._rows[ordinal] = (title, tuple(tags))
+        return row
+
+    def close(self):
+        """Closes the file handle used to read rows on demand."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def prefetch(self):
+        """Parses every row that has not been touched yet in one pass."""
+        if len(self._rows) < len(self._video_ids):
+            for ordinal, title, _, tags in self.rows():
+                self._rows[ordinal] = (title, tuple(tags))
+
+    def __len__(self):
+        return len(self._video_ids)
+
+    def ordinal(self, video_id):
+        """Returns the ordinal of video_id, or None if it is not present."""
+        return self._ordinals.get(video_id)
+
+    def video_id(self, ordinal):
+        """Returns the video_id stored at the given ordinal."""
+        return self._video_ids[ordinal]
+
+    def title(self, ordinal):
+        """Returns the title stored at the given ordinal."""
+        return self._row(ordinal)[0]
+
+    def tags(self, ordinal):
+        """Returns the tags stored at the given ordinal as a tuple."""
+        return self._row(ordinal)[1]
+
+    def rows(self):
+        """Yields (ordinal, title, video_id, tags) for the row kept for every video_id.
+
+        Rows that the duplicates policy did not keep are skipped, so that
+        every ordinal is yielded once, with the contents that title and
+        tags return.
+        """
+        if not self.has_duplicates:
+            for title, url, tags in read_rows(self._video_file):
+                yield self._ordinals[url], title, url, tags
+            return
+        offsets = self._offsets
+        offset = 0
+        with open(self._video_file, "rb") as video_file:
+            for line in video_file:
+                fields = next(csv.reader([line.decode("utf-8")], delimiter="|"), [])
+                if len(fields) == 3:
+                    title, url, tags = _parse_row([field.strip() for field in fields])
+                    ordinal = self._ordinals[url]
+                    if offsets[ordinal] == offset:
+                        yield ordinal, title, url, tags
+                offset += len(line)
+
+
+ReloadDiff = namedtuple("ReloadDiff", "added removed updated")
+ReloadDiff.__doc__ = """The video_ids added, removed and updated by a reload."""
+
+
+def without_flagged(ordinals, flagged):
+    """Returns the ordinals that are not in the container of flagged ordinals.
+
+    The membership tests run in C through filterfalse, with no Python call
+    per ordinal, and are skipped altogether when nothing is flagged.
+    """
+    if not flagged:
+        return list(ordinals)
+    return list(filterfalse(flagged.__contains__, ordinals))
+
+
+def _file_stamp(video_file):
+    """Returns what tells whether a file changed: its mtime and size."""
+    status = os.stat(video_file)
+    return status.st_mtime_ns, status.st_size
+
+
 class VideoLibrary:
     """A class used to represent a Video Library."""
 
-    def __init__(self):
-        """The VideoLibrary class is initialized."""
-        self._videos = {}
-        with open(Path(__file__).parent / "videos.txt") as video_file:
-            reader = _csv_reader_with_strip(
-                csv.reader(video_file, delimiter="|"))
-            for video_info in reader:
-                title, url, tags = video_info
-                self._videos[url] = Video(
-                    title,
-                    url,
-                    [tag.strip() for tag in tags.split(",")] if tags else [],
-                )
+    def __init__(self, video_file=VIDEOS_FILE, lazy=False, workers=1,
+                 duplicates=DUPLICATES_LAST, search_cache_size=SEARCH_CACHE_SIZE):
+        """The VideoLibrary class is initialized.
+
+        If video_file has a compiled form (see binary_catalog) that is newer
+        than itself, the compiled catalog is memory-mapped instead and the
+        text file is not read at all. The compiled form keeps the last row
+        of a duplicated video_id, so it is only used with DUPLICATES_LAST;
+        workers is not used with it either, as it needs no parsing.
+
+        Args:
+            video_file: Path to the pipe-delimited catalog to load.
+            lazy: If True, only the byte offset of every video is read at
+                startup. Rows are parsed the first time they are requested,
+                and the search indexes are built on the first search.
+            workers: Number of processes parsing and indexing the file.
+                With more than one, the file is split into line-aligned
+                byte ranges (so quoted fields must not span lines), and the
+                result is the same as with one. Cannot be combined with
+                lazy, which parses nothing up front.
+            duplicates: What to do with a row whose video_id appeared
+                before: DUPLICATES_LAST keeps the ordinal of the first row
+                and the contents of the last, DUPLICATES_FIRST ignores the
+                later rows and DUPLICATES_ERROR raises ValueError.
+
+        Raises:
+            ValueError: If duplicates is not a known policy, if workers is
+                more than 1 with lazy, or if the file breaks the
+                DUPLICATES_ERROR policy.
+        """
+        if duplicates not in (DUPLICATES_LAST, DUPLICATES_FIRST, DUPLICATES_ERROR):
+            raise ValueError(f"unknown duplicates policy {duplicates!r}")
+        if lazy and workers > 1:
+            raise ValueError("a lazy catalog cannot be loaded with more than one worker")
+        self._duplicates = duplicates
+        self._video_file = video_file
+        self._stamp = _file_stamp(video_file)
+        self._title_index = None
+        self._tag_index = None
+        # Built on the first fuzzy search, which few sessions make.
+        self._fuzzy_index = None
+        if duplicates == DUPLICATES_LAST and is_up_to_date(video_file):
+            self._catalog = BinaryCatalog(compiled_path(video_file))
+            # The compiled catalog carries its own tag postings.
+            self._tag_index = self._catalog
+        elif lazy:
+            self._catalog = _TextCatalog(Path(video_file), duplicates)
+        else:
+            self._catalog = ColumnarCatalog()
+            self._title_index = TitleIndex()
+            self._tag_index = TagIndex()
+            if workers > 1:
+                self._ingest_parallel(video_file, workers)
+            else:
+                for title, url, tags in read_rows(video_file):
+                    ordinal = self._append(title, url, tags)
+                    if ordinal is not None:
+                        self._title_index.add(ordinal, title)
+                        self._tag_index.add(ordinal, tags)
+        self._listing = SortedListing(self._catalog)
+        self._playable = PlayablePool(self._catalog)
+        self._search_cache = SearchCache(search_cache_size)
+
+    def _is_new(self, video_id):
+        """Returns False if a row for video_id should be ignored, per the duplicates policy."""
+        if self._duplicates == DUPLICATES_LAST or self._catalog.ordinal(video_id) is None:
+            return True
+        if self._duplicates == DUPLICATES_FIRST:
+            return False
+        raise ValueError(f"{self._video_file}: video_id {video_id} appears more than once")
+
+    def _append(self, title, video_id, tags):
+        """Adds a row to the catalog, returning its ordinal or None if it was ignored."""
+        if not self._is_new(video_id):
+            return None
+        return self._catalog.append(title, video_id, tags)
+
+    def _ingest_parallel(self, video_file, workers):
+        """Loads video_file with worker processes, each parsing and indexing a range.
+
+        Ranges are merged in file order. A range's rows are numbered as if
+        every earlier line were a new video; while that holds, its indexes
+        are merged whole, and otherwise its rows are indexed one by one.
+        """
+        ranges = line_aligned_ranges(video_file, workers * 2)
+        with ProcessPoolExecutor(workers) as executor:
+            results = executor.map(_ingest_range, repeat(video_file),
+                                   *zip(*ranges))
+            for first_row, titles, video_ids, tags, title_index, tag_index in results:
+                ordinals = [self._append(title, url, row_tags)
+                            for title, url, row_tags in zip(titles, video_ids, tags)]
+                if ordinals == list(range(first_row, first_row + len(ordinals))):
+                    self._title_index.merge(title_index)
+                    self._tag_index.merge(tag_index)
+                    continue
+                for ordinal, title, row_tags in zip(ordinals, titles, tags):
+                    if ordinal is not None:
+                        self._title_index.add(ordinal, title)
+                        self._tag_index.add(ordinal, row_tags)
+
+    def _ensure_indexes(self):
+        """Builds the search indexes if they have not been built yet."""
+        if self._title_index is None:
+            title_index = TitleIndex()
+            tag_index = TagIndex() if self._tag_index is None else None
+            for ordinal, title, _, tags in self._catalog.rows():
+                title_index.add(ordinal, title)
+                if tag_index is not None:
+                    tag_index.add(ordinal, tags)
+            self._title_index = title_index
+            if tag_index is not None:
+                self._tag_index = tag_index
+
+    def _ensure_fuzzy_index(self):
+        """Builds the fuzzy title index if it has not been built yet."""
+        if self._fuzzy_index is None:
+            fuzzy_index = FuzzyIndex()
+            for ordinal, title, _, _ in self._catalog.rows():
+                fuzzy_index.add(ordinal, title)
+            self._fuzzy_index = fuzzy_index
+
+    def _video_at(self, ordinal):
+        """Returns the Video stored at the given ordinal."""
+        return Video.view(self._catalog, ordinal)
+
+    def random_playable_ordinal(self, hidden=frozenset(), revealed=()):
+        """Returns a random playable ordinal, see PlayablePool.choice."""
+        return self._playable.choice(hidden, revealed)
+
+    def __len__(self):
+        return self._catalog.video_count()
+
+    @property
+    def can_reload(self):
+        """True if the catalog was loaded in memory from videos.txt."""
+        return isinstance(self._catalog, ColumnarCatalog)
+
+    def has_changed(self):
+        """Returns True if videos.txt was modified since it was last read."""
+        return _file_stamp(self._video_file) != self._stamp
+
+    def reload(self):
+        """Applies the changes made to videos.txt since it was last read.
+
+        The file is compared with the catalog by video_id. Only the videos
+        that were added, removed or whose title or tags changed are touched
+        in the catalog, the search indexes, the sorted listing and the pool
+        of playable videos. Unchanged and updated videos keep their flags;
+        removed videos lose them.
+
+        Returns:
+            A ReloadDiff with the video_ids that changed.
+        """
+        if not self.can_reload:
+            raise ValueError("only a catalog loaded in memory can be reloaded")
+        self._stamp = _file_stamp(self._video_file)
+        rows = {}
+        for title, url, tags in read_rows(self._video_file):
+            if url in rows:
+                # The same duplicates policy as when loading.
+                if self._duplicates == DUPLICATES_FIRST:
+                    continue
+                if self._duplicates == DUPLICATES_ERROR:
+                    raise ValueError(
+                        f"{self._video_file}: video_id {url} appears more than once")
+            rows[url] = title, tuple(tags)
+
+        catalog = self._catalog
+        removed = [ordinal for ordinal in catalog.ordinals()
+                   if catalog.video_id(ordinal) not in rows]
+        updated, added = [], []
+        for video_id, (title, tags) in rows.items():
+            ordinal = catalog.ordinal(video_id)
+            if ordinal is None:
+                added.append(video_id)
+            elif catalog.title(ordinal) != title or catalog.tags(ordinal) != tags:
+                updated.append(ordinal)
+
+        fuzzy_index = self._fuzzy_index
+        for ordinal in removed:
+            catalog.clear_flag(ordinal)
+            self._title_index.remove(ordinal, catalog.title(ordinal))
+            self._tag_index.remove(ordinal, catalog.tags(ordinal))
+            if fuzzy_index is not None:
+                fuzzy_index.remove(ordinal, catalog.title(ordinal))
+            catalog.remove(ordinal)
+        for ordinal in updated:
+            title, tags = rows[catalog.video_id(ordinal)]
+            self._title_index.remove(ordinal, catalog.title(ordinal))
+            self._tag_index.remove(ordinal, catalog.tags(ordinal))
+            if fuzzy_index is not None:
+                fuzzy_index.remove(ordinal, catalog.title(ordinal))
+                fuzzy_index.add(ordinal, title)
+            catalog.replace(ordinal, title, tags)
+            self._title_index.add(ordinal, title)
+            self._tag_index.add(ordinal, tags)
+        added_ordinals = []
+        for video_id in added:
+            title, tags = rows[video_id]
+            ordinal = catalog.append(title, video_id, tags)
+            self._title_index.add(ordinal, title)
+            self._tag_index.add(ordinal, tags)
+            if fuzzy_index is not None:
+                fuzzy_index.add(ordinal, title)
+            added_ordinals.append(ordinal)
+
+        self._listing.refresh(removed + updated + added_ordinals)
+        for ordinal in removed + added_ordinals:
+            self._playable.update(ordinal)
+        catalog.changed()
+        return ReloadDiff(added, [catalog.video_id(ordinal) for ordinal in removed],
+                          [catalog.video_id(ordinal) for ordinal in updated])
 
     def get_all_videos(self):
         """Returns all available video information from the video library."""
-        return list(self._videos.values())
+        self._catalog.prefetch()
+        return [Video.view(self._catalog, ordinal)
+                for ordinal in self._catalog.ordinals()]
+
+    @property
+    def catalog(self):
+        """The catalog holding the rows and the shared flag state."""
+        return self._catalog
+
+    def get_sorted_lines(self, overrides=None):
+        """Returns str() of every video, sorted. The list must not be modified.
+
+        Args:
+            overrides: Optional dict of ordinal -> line, used instead of the
+                stored line of those videos.
+        """
+        if overrides:
+            return self._listing.lines_with(overrides)
+        return self._listing.lines()
+
+    def get_sorted_page(self, after, count, overrides=None):
+        """Returns up to count sorted lines after the line after, see SortedListing.page."""
+        return self._listing.page(after, count, overrides)
+
+    def flagged_count(self):
+        """Returns the number of flagged videos, in constant time."""
+        return len(self._catalog.flagged_ordinals())
+
+    def get_flagged_videos(self):
+        """Returns every flagged video, sorted by str()."""
+        return sorted((self._video_at(ordinal) for ordinal in self._catalog.flagged_ordinals()),
+                      key=str)
+
+    def get_random_playable_video(self):
+        """Returns a random unflagged video, None if every video is flagged."""
+        ordinal = self._playable.choice()
+        if ordinal is None:
+            return None
+        return Video.view(self._catalog, ordinal)
 
     def get_video(self, video_id):
         """Returns the video object (title, url, tags) from the video library.
@@ -42,4 +504,248 @@ class VideoLibrary:
             The Video object for the requested video_id. None if the video
             does not exist.
         """
-        return self._videos.get(video_id, None)
+        ordinal = self._catalog.ordinal(video_id)
+        if ordinal is None:
+            return None
+        return Video.view(self._catalog, ordinal)
+
+    def search_title_ordinals(self, search_term):
+        """Returns the ordinals of the videos whose titles contain search_term.
+
+        Args:
+            search_term: The case-insensitive term to look for.
+
+        Returns:
+            A list of ordinals, in library order.
+        """
+        self._ensure_indexes()
+        search_term = search_term.lower()
+        title = self._catalog.title
+        ordinals = [ordinal for ordinal in self._title_index.candidates(search_term)
+                    if search_term in title(ordinal).lower()]
+        return self._without_removed(ordinals)
+
+    def _without_removed(self, ordinals):
+        """Drops the ordinals of removed videos, which only short terms return."""
+        if self._catalog.video_count() == len(self._catalog):
+            return ordinals
+        is_removed = self._catalog.is_removed
+        return [ordinal for ordinal in ordinals if not is_removed(ordinal)]
+
+    def search_tag_ordinals(self, video_tag):
+        """Returns the ordinals of the videos tagged with video_tag.
+
+        Args:
+            video_tag: The case-insensitive tag to look for.
+
+        Returns:
+            A list of ordinals, in library order.
+        """
+        self._ensure_indexes()
+        ordinals = self._tag_index.lookup(video_tag)
+        if not self._catalog.has_duplicates:
+            return list(ordinals)
+
+        # A video id that appears twice in videos.txt keeps the postings of
+        # its overwritten row, so those are deduplicated and checked again.
+        video_tag = normalize_tag(video_tag)
+        tags = self._catalog.tags
+        return self._without_removed([ordinal for ordinal in sorted(set(ordinals))
+                                      if video_tag in map(normalize_tag, tags(ordinal))])
+
+    def search_fuzzy_ordinals(self, search_term, limit=FUZZY_LIMIT, exclude=()):
+        """Returns the ordinals of the titles closest to search_term, best first.
+
+        See FuzzyIndex.search for the ranking.
+
+        Args:
+            search_term: The case-insensitive words to look for, which may
+                contain typos.
+            limit: The maximum number of ordinals returned.
+            exclude: Optional container of ordinals to skip, which do not
+                count towards limit.
+
+        Returns:
+            A list of ordinals.
+        """
+        self._ensure_fuzzy_index()
+        return [ordinal for _, ordinal in
+                self._fuzzy_index.search(search_term, limit, FUZZY_THRESHOLD, exclude)]
+
+    def search_titles(self, search_term):
+        """Returns all videos whose titles contain the search_term.
+
+        Args:
+            search_term: The case-insensitive term to look for.
+
+        Returns:
+            A list of Video objects, in library order.
+        """
+        return [self._video_at(ordinal)
+                for ordinal in self.search_title_ordinals(search_term)]
+
+    def search_tag(self, video_tag):
+        """Returns all videos tagged with video_tag.
+
+        Args:
+            video_tag: The case-insensitive tag to look for.
+
+        Returns:
+            A list of Video objects, in library order.
+        """
+        return [self._video_at(ordinal)
+                for ordinal in self.search_tag_ordinals(video_tag)]
+
+    def sorted_playable_ordinals(self, ordinals, limit=None, flagged=None,
+                                 overrides=None):
+        """Returns the unflagged ordinals in the order of their str().
+
+        Args:
+            ordinals: The ordinals to choose from.
+            limit: Optional maximum number of ordinals; the first ones in
+                sorted order are kept.
+            flagged: Optional container of the flagged ordinals, used
+                instead of the flags of the catalog.
+            overrides: Optional dict of ordinal -> line, see
+                SortedListing.smallest.
+        """
+        if flagged is None:
+            flagged = self._catalog.flagged_ordinals()
+        return self._listing.smallest(without_flagged(ordinals, flagged), limit, overrides)
+
+    @property
+    def search_cache(self):
+        """The SearchCache of search_title_results and search_tag_results."""
+        return self._search_cache
+
+    def search_title_results(self, search_term, limit=None):
+        """Returns the unflagged ordinals whose titles contain search_term.
+
+        Results are cached by lower-cased term and limit until the catalog
+        changes.
+
+        Args:
+            search_term: The case-insensitive term to look for.
+            limit: Optional maximum number of ordinals; the first ones in
+                sorted order are kept.
+
+        Returns:
+            A tuple of ordinals, in the order of the str() of their videos.
+        """
+        return self._search_cache.get(
+            ("title", search_term.lower(), limit), self._catalog.version,
+            lambda: tuple(self.sorted_playable_ordinals(
+                self.search_title_ordinals(search_term), limit)))
+
+    def search_tag_results(self, video_tag, limit=None):
+        """Returns the unflagged ordinals tagged with video_tag.
+
+        Results are cached by normalized tag and limit until the catalog
+        changes.
+
+        Args:
+            video_tag: The case-insensitive tag to look for.
+            limit: Optional maximum number of ordinals; the first ones in
+                sorted order are kept.
+
+        Returns:
+            A tuple of ordinals, in the order of the str() of their videos.
+        """
+        return self._search_cache.get(
+            ("tag", normalize_tag(video_tag), limit), self._catalog.version,
+            lambda: tuple(self.sorted_playable_ordinals(
+                self.search_tag_ordinals(video_tag), limit)))
+
+    def _tag_postings(self, video_tag):
+        """Returns the sorted ordinals of the videos tagged with video_tag.
+
+        The posting list of the tag index is returned as is when it needs
+        no deduplication, see search_tag_ordinals.
+        """
+        if self._catalog.has_duplicates:
+            return self.search_tag_ordinals(video_tag)
+        return self._tag_index.lookup(video_tag)
+
+    def search_tag_query_ordinals(self, query, flagged=None, overrides=None):
+        """Returns the unflagged ordinals whose tags match a boolean query.
+
+        The query is evaluated over the sorted posting list of each of its
+        tags, see tag_query.evaluate, and the flagged videos are then left
+        out of the matches.
+
+        Args:
+            query: A query such as "#cat AND #animal NOT #dog", see
+                tag_query.parse_tag_query.
+            flagged: Optional container of the flagged ordinals, used
+                instead of the flags of the catalog.
+            overrides: Optional dict of ordinal -> line, see
+                SortedListing.smallest.
+
+        Returns:
+            A list of ordinals, in the order of the str() of their videos.
+
+        Raises:
+            ValueError: If the query is not well formed.
+        """
+        node = parse_tag_query(query)
+        self._ensure_indexes()
+        if flagged is None:
+            flagged = self._catalog.flagged_ordinals()
+        matches = evaluate(node, self._tag_postings, self._catalog.ordinals)
+        return self._listing.smallest(without_flagged(matches, flagged), None, overrides)
+
+    def search_tag_query(self, query):
+        """Returns the unflagged videos whose tags match a boolean query.
+
+        Args:
+            query: A query such as "#cat AND #animal NOT #dog".
+
+        Returns:
+            A list of Video objects, sorted by str().
+
+        Raises:
+            ValueError: If the query is not well formed.
+        """
+        return [self._video_at(ordinal) for ordinal in self.search_tag_query_ordinals(query)]
+
+    def search_titles_sorted(self, search_term, limit=None):
+        """Returns the unflagged videos whose titles contain search_term.
+
+        Args:
+            search_term: The case-insensitive term to look for.
+            limit: Optional maximum number of videos; the first ones in
+                sorted order are kept.
+
+        Returns:
+            A list of Video objects, sorted by str().
+        """
+        return [self._video_at(ordinal)
+                for ordinal in self.search_title_results(search_term, limit)]
+
+    def search_tag_sorted(self, video_tag, limit=None):
+        """Returns the unflagged videos tagged with video_tag.
+
+        Args:
+            video_tag: The case-insensitive tag to look for.
+            limit: Optional maximum number of videos; the first ones in
+                sorted order are kept.
+
+        Returns:
+            A list of Video objects, sorted by str().
+        """
+        return [self._video_at(ordinal)
+                for ordinal in self.search_tag_results(video_tag, limit)]
+
+    def search_titles_fuzzy(self, search_term, limit=FUZZY_LIMIT):
+        """Returns the unflagged videos whose titles are closest to search_term.
+
+        Args:
+            search_term: The case-insensitive words to look for, which may
+                contain typos.
+            limit: The maximum number of videos returned.
+
+        Returns:
+            A list of Video objects, best match first.
+        """
+        return [self._video_at(ordinal) for ordinal in self.search_fuzzy_ordinals(
+            search_term, limit, self._catalog.flagged_ordinals())]
@@ -1,32 +1,169 @@
 """A video player class."""
 
+from .output import StdoutWriter
 from .video_library import VideoLibrary
 from .video_playlist import Playlist
-import random
+import base64
+
+
+def _positive_count(text):
+    """Returns the page size or limit given as text, None if it is not a positive number."""
+    if not text.isdecimal() or int(text) == 0:
+        return None
+    return int(text)
+
+
+def _encode_cursor(line):
+    """Turns the last line of a page into a cursor without whitespace."""
+    return base64.urlsafe_b64encode(line.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor):
+    """Returns the line a cursor was made from, None if it is not a cursor."""
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except (ValueError, UnicodeError):
+        return None
 
 
 class VideoPlayer:
     """A class used to represent a Video Player."""
 
-    def __init__(self):
-        self._video_library = VideoLibrary()
+    def __init__(self, video_library=None, output=None, interactive=True,
+                 state_log=None):
+        """The VideoPlayer class is initialized.
+
+        Args:
+            video_library: The VideoLibrary to play from. A library loaded
+                from the bundled videos.txt is used if none is given.
+            output: The OutputWriter to write to. Defaults to stdout.
+            interactive: If True, questions are answered through input().
+                Otherwise the player waits for a call to answer().
+            state_log: Optional WriteAheadLog. Flag and playlist changes
+                are appended to it, and the state it holds (its snapshot,
+                then the records since) is restored first.
+        """
+        self._video_library = video_library if video_library is not None else VideoLibrary()
+        self._output = output if output is not None else StdoutWriter()
         self._currently_playing = None
         self._pause_status = False
         self._playlists = {}
+        self._interactive = interactive
+        self._pending_search_results = None
+        self._state_log = None
+        if state_log is not None:
+            snapshot = state_log.snapshot()
+            if snapshot is not None:
+                self._restore(snapshot)
+            for record in state_log.records():
+                self._replay(record)
+            self._state_log = state_log
+
+    def _log(self, *record):
+        """Appends a state change to the state log, if there is one."""
+        if self._state_log is not None:
+            self._state_log.append(*record)
+            if self._state_log.snapshot_due:
+                self.checkpoint()
+
+    def checkpoint(self):
+        """Snapshots the flags and playlists into the state log, truncating it."""
+        catalog = self._video_library.catalog
+        flags = [(catalog.video_id(ordinal), catalog.flag_reason(ordinal))
+                 for ordinal in catalog.flagged_ordinals()]
+        playlists = [(playlist.title, playlist.video_ids())
+                     for playlist in self._playlists.values()]
+        self._state_log.write_snapshot(flags, playlists)
+
+    def _restore(self, snapshot):
+        """Applies the state saved by a snapshot of the state log."""
+        for video_id, reason in snapshot.flags:
+            video = self._video_library.get_video(video_id)
+            if video is not None:
+                video.flag(reason)
+        for title, video_ids in snapshot.playlists:
+            playlist = self._playlists[title.lower()] = Playlist(title)
+            for video_id in video_ids:
+                video = self._video_library.get_video(video_id)
+                if video is not None:
+                    playlist.add_video(video)
+
+    def _replay(self, record):
+        """Applies a state change read back from the state log."""
+        operation, *arguments = record
+        if operation in ("FLAG_VIDEO", "ALLOW_VIDEO"):
+            video = self._video_library.get_video(arguments[0])
+            if video is None:
+                return
+            if operation == "FLAG_VIDEO":
+                video.flag(arguments[1])
+            else:
+                video.allow()
+            return
+        if operation == "CREATE_PLAYLIST":
+            self._playlists[arguments[0].lower()] = Playlist(arguments[0])
+            return
+        playlist = self._playlists.get(arguments[0].lower())
+        if playlist is None:
+            return
+        if operation == "ADD_TO_PLAYLIST":
+            video = self._video_library.get_video(arguments[1])
+            if video is not None:
+                playlist.add_video(video)
+        elif operation == "REMOVE_FROM_PLAYLIST":
+            video = self._video_library.get_video(arguments[1])
+            if video is not None:
+                playlist.remove_video(video)
+        elif operation == "INSERT_AT":
+            video = self._video_library.get_video(arguments[2])
+            if video is not None and int(arguments[1]) <= len(playlist):
+                playlist.insert_video(int(arguments[1]), video)
+        elif operation == "MOVE_IN_PLAYLIST":
+            if arguments[1] in playlist and int(arguments[2]) < len(playlist):
+                playlist.move_video(arguments[1], int(arguments[2]))
+        elif operation == "CLEAR_PLAYLIST":
+            playlist.clear()
+        elif operation == "DELETE_PLAYLIST":
+            del self._playlists[arguments[0].lower()]
+
+    @property
+    def output(self):
+        return self._output
 
     @property
     def currently_playing(self):
         return self._currently_playing
 
     def number_of_videos(self):
-        num_videos = len(self._video_library.get_all_videos())
-        print(f"{num_videos} videos in the library")
+        num_videos = len(self._video_library)
+        self._output.print(f"{num_videos} videos in the library")
+
+    def show_all_videos(self, page_size=None, cursor=None):
+        """Returns all videos, or one page of them.
 
-    def show_all_videos(self):
-        """Returns all videos."""
-        print("Here's a list of all available videos:")
-        videos_object = self._video_library.get_all_videos()
-        print(*sorted([str(video_info) for video_info in videos_object]), sep='\n')
+        Args:
+            page_size: Optional maximum number of videos to show.
+            cursor: The cursor printed with the previous page, if any.
+        """
+        if page_size is None:
+            self._output.print("Here's a list of all available videos:")
+            self._output.print(*self._video_library.get_sorted_lines(), sep='\n')
+            return
+        count = _positive_count(page_size)
+        after = None if cursor is None else _decode_cursor(cursor)
+        if count is None:
+            self._output.print("Cannot show videos: Page size must be a positive number")
+        elif after is None and cursor is not None:
+            self._output.print("Cannot show videos: Invalid cursor")
+        else:
+            # One line more than asked for tells whether there is a next page.
+            lines = self._video_library.get_sorted_page(after, count + 1)
+            self._output.print("Here's a list of all available videos:")
+            if lines:
+                self._output.print(*lines[:count], sep='\n')
+            if len(lines) > count:
+                self._output.print(
+                    f"Next page: SHOW_ALL_VIDEOS {count} {_encode_cursor(lines[count - 1])}")
 
     def play_video(self, video_id):
         """Plays the respective video.
@@ -36,66 +173,65 @@ class VideoPlayer:
         """
         video = self._video_library.get_video(video_id)
         if video is None:
-            print("Cannot play video: Video does not exist")
+            self._output.print("Cannot play video: Video does not exist")
         elif video.flagged is not None:
-            print(f"Cannot play video: Video is currently flagged (reason: {video.flagged})")
+            self._output.print(f"Cannot play video: Video is currently flagged (reason: {video.flagged})")
         else:
             if self.currently_playing is not None:
-                print(f"Stopping video: {self.currently_playing.title}")
+                self._output.print(f"Stopping video: {self.currently_playing.title}")
             self._currently_playing = video
             self._pause_status = False
-            print(f"Playing video: {video.title}")
+            self._output.print(f"Playing video: {video.title}")
 
     def stop_video(self):
         """Stops the current video."""
         if self.currently_playing is None:
-            print("Cannot stop video: No video is currently playing")
+            self._output.print("Cannot stop video: No video is currently playing")
         else:
-            print(f"Stopping video: {self.currently_playing.title}")
+            self._output.print(f"Stopping video: {self.currently_playing.title}")
             self._currently_playing = None
             self._pause_status = False
 
     def play_random_video(self):
         """Plays a random video from the video library."""
-        valid_video_choices = [video for video in self._video_library.get_all_videos() if video.flagged is None]
+        random_video = self._video_library.get_random_playable_video()
 
-        if len(valid_video_choices) == 0:
-            print("No videos available")
+        if random_video is None:
+            self._output.print("No videos available")
         else:
-            random_video = random.choice(valid_video_choices)
             self.play_video(random_video.video_id)
 
     def pause_video(self):
         """Pauses the current video."""
         if self.currently_playing is None:
-            print("Cannot pause video: No video is currently playing")
+            self._output.print("Cannot pause video: No video is currently playing")
         elif self._pause_status is True:
-            print(f"Video already paused: {self.currently_playing.title}")
+            self._output.print(f"Video already paused: {self.currently_playing.title}")
         else:
-            print(f"Pausing video: {self.currently_playing.title}")
+            self._output.print(f"Pausing video: {self.currently_playing.title}")
             self._pause_status = True
 
     def continue_video(self):
         """Resumes playing the current video."""
         if self.currently_playing is None:
-            print("Cannot continue video: No video is currently playing")
+            self._output.print("Cannot continue video: No video is currently playing")
         elif self._pause_status is False:
-            print("Cannot continue video: Video is not paused")
+            self._output.print("Cannot continue video: Video is not paused")
         else:
-            print(f"Continuing video: {self.currently_playing.title}")
+            self._output.print(f"Continuing video: {self.currently_playing.title}")
             self._pause_status = False
 
     def show_playing(self):
         """Displays video currently playing."""
         playing = self.currently_playing
         if playing is None:
-            print("No video is currently playing")
+            self._output.print("No video is currently playing")
         else:
             playing_str = f"Currently playing: {playing}"
             if self._pause_status is True:
-                print(f"{playing_str} - PAUSED")
+                self._output.print(f"{playing_str} - PAUSED")
             else:
-                print(playing_str)
+                self._output.print(playing_str)
 
     def create_playlist(self, playlist_name):
         """Creates a playlist with a given name.
@@ -107,9 +243,10 @@ class VideoPlayer:
         if playlist is None:
             new_playlist = Playlist(playlist_name)
             self._playlists[playlist_name.lower()] = new_playlist
-            print(f"Successfully created new playlist: {playlist_name}")
+            self._log("CREATE_PLAYLIST", playlist_name)
+            self._output.print(f"Successfully created new playlist: {playlist_name}")
         else:
-            print("Cannot create playlist: A playlist with the same name already exists")
+            self._output.print("Cannot create playlist: A playlist with the same name already exists")
 
     def add_to_playlist(self, playlist_name, video_id):
         """Adds a video to a playlist with a given name.
@@ -121,40 +258,134 @@ class VideoPlayer:
         playlist = self._playlists.get(playlist_name.lower(), None)
         video = self._video_library.get_video(video_id)
         if playlist is None:
-            print(f"Cannot add video to {playlist_name}: Playlist does not exist")
+            self._output.print(f"Cannot add video to {playlist_name}: Playlist does not exist")
         elif video is None:
-            print(f"Cannot add video to {playlist_name}: Video does not exist")
+            self._output.print(f"Cannot add video to {playlist_name}: Video does not exist")
         elif video.flagged is not None:
-            print(f"Cannot add video to {playlist_name}: Video is currently flagged (reason: {video.flagged})")
-        elif video_id in playlist.videos:
-            print(f"Cannot add video to {playlist_name}: Video already added")
+            self._output.print(f"Cannot add video to {playlist_name}: Video is currently flagged (reason: {video.flagged})")
+        elif video_id in playlist:
+            self._output.print(f"Cannot add video to {playlist_name}: Video already added")
         else:
             playlist.add_video(video)
-            print(f"Added video to {playlist_name}: {video.title}")
+            self._log("ADD_TO_PLAYLIST", playlist_name, video_id)
+            self._output.print(f"Added video to {playlist_name}: {video.title}")
 
     def show_all_playlists(self):
         """Display all playlists."""
         if len(self._playlists) == 0:
-            print("No playlists exist yet")
+            self._output.print("No playlists exist yet")
         else:
-            print("Showing all playlists:")
-            print(*sorted([str(playlist) for playlist in self._playlists.values()]), sep='\n')
+            self._output.print("Showing all playlists:")
+            self._output.print(*sorted([str(playlist) for playlist in self._playlists.values()]), sep='\n')
 
-    def show_playlist(self, playlist_name):
-        """Display all videos in a playlist with a given name.
+    def show_playlist(self, playlist_name, page_size=None, cursor=None):
+        """Display all videos in a playlist with a given name, or one page of them.
 
         Args:
             playlist_name: The playlist name.
+            page_size: Optional maximum number of videos to show, or a
+                range of positions such as 10-20 to show those, numbered.
+            cursor: The cursor printed with the previous page, if any.
         """
         playlist = self._playlists.get(playlist_name.lower(), None)
         if playlist is None:
-            print(f"Cannot show playlist {playlist_name}: Playlist does not exist")
+            self._output.print(f"Cannot show playlist {playlist_name}: Playlist does not exist")
+        elif page_size is not None and "-" in page_size and cursor is None:
+            self._show_playlist_range(playlist, playlist_name, page_size)
+        elif page_size is not None:
+            self._show_playlist_page(playlist, playlist_name, page_size, cursor)
         else:
-            print(f"Showing playlist: {playlist_name}")
-            if len(playlist.videos) == 0:
-                print("  No videos here yet")
+            self._output.print(f"Showing playlist: {playlist_name}")
+            if len(playlist) == 0:
+                self._output.print("  No videos here yet")
             else:
-                [print(f"  {video}") for video in playlist.videos.values()]
+                self._output.print(*(f"  {video}" for video in playlist), sep='\n')
+
+    def _show_playlist_page(self, playlist, playlist_name, page_size, cursor):
+        count = _positive_count(page_size)
+        if count is None:
+            self._output.print(f"Cannot show playlist {playlist_name}: Page size must be a positive number")
+            return
+        videos, next_video_id = playlist.page(cursor, count)
+        if videos is None:
+            self._output.print(f"Cannot show playlist {playlist_name}: Invalid cursor")
+            return
+        self._output.print(f"Showing playlist: {playlist_name}")
+        if len(playlist) == 0:
+            self._output.print("  No videos here yet")
+        else:
+            self._output.print(*(f"  {video}" for video in videos), sep='\n')
+        if next_video_id is not None:
+            self._output.print(f"Next page: SHOW_PLAYLIST {playlist_name} {count} {next_video_id}")
+
+    def _show_playlist_range(self, playlist, playlist_name, positions):
+        first, _, last = positions.partition("-")
+        first, last = _positive_count(first), _positive_count(last)
+        if first is None or last is None or first > last:
+            self._output.print(f"Cannot show playlist {playlist_name}: Invalid range")
+            return
+        videos = playlist.range(first - 1, last - first + 1)
+        self._output.print(f"Showing playlist: {playlist_name}")
+        if len(playlist) == 0:
+            self._output.print("  No videos here yet")
+        elif not videos:
+            self._output.print(f"  No videos in this range, the playlist has {len(playlist)}")
+        else:
+            self._output.print(*(f"  {first + i}) {video}" for i, video in enumerate(videos)), sep='\n')
+
+    def insert_at(self, playlist_name, position, video_id):
+        """Inserts a video into a playlist at a given position.
+
+        Args:
+            playlist_name: The playlist name.
+            position: The position of the video once inserted, from 1 to
+                the length of the playlist plus one.
+            video_id: The video_id to be inserted.
+        """
+        playlist = self._playlists.get(playlist_name.lower(), None)
+        video = self._video_library.get_video(video_id)
+        number = _positive_count(position)
+        if playlist is None:
+            self._output.print(f"Cannot insert video into {playlist_name}: Playlist does not exist")
+        elif video is None:
+            self._output.print(f"Cannot insert video into {playlist_name}: Video does not exist")
+        elif video.flagged is not None:
+            self._output.print(f"Cannot insert video into {playlist_name}: Video is currently flagged (reason: {video.flagged})")
+        elif video_id in playlist:
+            self._output.print(f"Cannot insert video into {playlist_name}: Video already added")
+        elif number is None or number > len(playlist) + 1:
+            self._output.print(f"Cannot insert video into {playlist_name}: "
+                               f"Position must be between 1 and {len(playlist) + 1}")
+        else:
+            playlist.insert_video(number - 1, video)
+            self._log("INSERT_AT", playlist_name, str(number - 1), video_id)
+            self._output.print(f"Inserted video into {playlist_name} at position {number}: {video.title}")
+
+    def move_in_playlist(self, playlist_name, video_id, position):
+        """Moves a video of a playlist to a given position.
+
+        Args:
+            playlist_name: The playlist name.
+            video_id: The video_id to be moved.
+            position: The new position of the video, from 1 to the length
+                of the playlist.
+        """
+        playlist = self._playlists.get(playlist_name.lower(), None)
+        video = self._video_library.get_video(video_id)
+        number = _positive_count(position)
+        if playlist is None:
+            self._output.print(f"Cannot move video in {playlist_name}: Playlist does not exist")
+        elif video is None:
+            self._output.print(f"Cannot move video in {playlist_name}: Video does not exist")
+        elif video_id not in playlist:
+            self._output.print(f"Cannot move video in {playlist_name}: Video is not in playlist")
+        elif number is None or number > len(playlist):
+            self._output.print(f"Cannot move video in {playlist_name}: "
+                               f"Position must be between 1 and {len(playlist)}")
+        else:
+            playlist.move_video(video_id, number - 1)
+            self._log("MOVE_IN_PLAYLIST", playlist_name, video_id, str(number - 1))
+            self._output.print(f"Moved video in {playlist_name} to position {number}: {video.title}")
 
     def remove_from_playlist(self, playlist_name, video_id):
         """Removes a video to a playlist with a given name.
@@ -166,11 +397,15 @@ class VideoPlayer:
         playlist = self._playlists.get(playlist_name.lower(), None)
         video = self._video_library.get_video(video_id)
         if playlist is None:
-            print(f"Cannot remove video from {playlist_name}: Playlist does not exist")
+            self._output.print(f"Cannot remove video from {playlist_name}: Playlist does not exist")
         elif video is None:
-            print(f"Cannot remove video from {playlist_name}: Video does not exist")
+            self._output.print(f"Cannot remove video from {playlist_name}: Video does not exist")
         else:
-            playlist.remove_video(video, playlist_name)
+            if playlist.remove_video(video):
+                self._log("REMOVE_FROM_PLAYLIST", playlist_name, video_id)
+                self._output.print(f"Removed video from {playlist_name}: {video.title}")
+            else:
+                self._output.print(f"Cannot remove video from {playlist_name}: Video is not in playlist")
 
     def clear_playlist(self, playlist_name):
         """Removes all videos from a playlist with a given name.
@@ -180,10 +415,11 @@ class VideoPlayer:
         """
         playlist = self._playlists.get(playlist_name.lower(), None)
         if playlist is None:
-            print(f"Cannot clear playlist {playlist_name}: Playlist does not exist")
+            self._output.print(f"Cannot clear playlist {playlist_name}: Playlist does not exist")
         else:
-            playlist._videos = {}
-            print(f"Successfully removed all videos from {playlist_name}")
+            playlist.clear()
+            self._log("CLEAR_PLAYLIST", playlist_name)
+            self._output.print(f"Successfully removed all videos from {playlist_name}")
 
     def delete_playlist(self, playlist_name):
         """Deletes a playlist with a given name.
@@ -193,51 +429,157 @@ class VideoPlayer:
         """
         deleted = self._playlists.pop(playlist_name.lower(), None)
         if deleted is None:
-            print(f"Cannot delete playlist {playlist_name}: Playlist does not exist")
+            self._output.print(f"Cannot delete playlist {playlist_name}: Playlist does not exist")
         else:
-            print(f"Deleted playlist: {playlist_name}")
+            self._log("DELETE_PLAYLIST", playlist_name)
+            self._output.print(f"Deleted playlist: {playlist_name}")
 
     def show_search_results(self, matching_videos, search_term):
         """Display results from search_videos or search_videos_tags
 
         Args:
-            matching_videos: List containing video classes that match the term.
+            matching_videos: List containing video classes that match the
+                term, in the order they are listed and numbered.
             search_term: The query used in search.
         """
         if len(matching_videos) == 0:
-            print(f"No search results for {search_term}")
+            self._output.print(f"No search results for {search_term}")
         elif search_term is None:
-            print("No search term added.")
+            self._output.print("No search term added.")
+        else:
+            self._output.print(f"Here are the results for {search_term}:")
+            self._output.print(*(f"{i+1}) {video}" for i, video in enumerate(matching_videos)), sep='\n')
+            self._ask_to_play(matching_videos)
+
+    def _ask_to_play(self, matching_videos):
+        """Asks which of the listed matching_videos to play, and plays it."""
+        self._output.print("Would you like to play any of the above? If yes, specify the number of the video.")
+        self._output.print("If your answer is not a valid number, we will assume it's a no.")
+        if self._interactive:
+            self._output.flush()
+            self._play_search_result(input(""), matching_videos)
         else:
-            sorted_matching_videos = sorted([str(video) for video in matching_videos])
-            print(f"Here are the results for {search_term}:")
-            [print(f"{i+1}) {video}") for i, video in enumerate(sorted_matching_videos)]
-            print("Would you like to play any of the above? If yes, specify the number of the video.")
-            print("If your answer is not a valid number, we will assume it's a no.")
-            user_choice = input("")
-            if user_choice.isnumeric():
-                if 0 < int(user_choice) <= len(matching_videos):
-                    self.play_video(matching_videos[int(user_choice)-1].video_id)
-
-    def search_videos(self, search_term):
+            self._pending_search_results = matching_videos
+
+    def _play_search_result(self, user_choice, matching_videos):
+        if user_choice.isnumeric():
+            if 0 < int(user_choice) <= len(matching_videos):
+                self.play_video(matching_videos[int(user_choice)-1].video_id)
+
+    @property
+    def awaiting_answer(self):
+        """True if a non-interactive player is waiting for answer()."""
+        return self._pending_search_results is not None
+
+    def answer(self, user_choice):
+        """Answers the question asked by the last search of a non-interactive player.
+
+        Args:
+            user_choice: The number of the search result to play.
+        """
+        matching_videos = self._pending_search_results
+        self._pending_search_results = None
+        if matching_videos is not None:
+            self._play_search_result(user_choice, matching_videos)
+
+    def search_videos(self, search_term, limit=None):
         """Display all the videos whose titles contain the search_term.
 
         Args:
             search_term: The query to be used in search.
+            limit: Optional maximum number of videos to show; the first
+                ones in sorted order are shown.
         """
-        matching_videos = [video for video in self._video_library.get_all_videos()
-                           if search_term.lower() in video.title.lower() and video.flagged is None]
-        self.show_search_results(matching_videos, search_term)
-
-    def search_videos_tag(self, video_tag):
+        count = None if limit is None else _positive_count(limit)
+        if count is None and limit is not None:
+            self._output.print("Cannot search videos: Limit must be a positive number")
+            return
+        self.show_search_results(
+            self._video_library.search_titles_sorted(search_term, count), search_term)
+
+    def search_videos_tag(self, video_tag, limit=None):
         """Display all videos whose tags contains the provided tag.
 
         Args:
             video_tag: The video tag to be used in search.
+            limit: Optional maximum number of videos to show; the first
+                ones in sorted order are shown.
+        """
+        count = None if limit is None else _positive_count(limit)
+        if count is None and limit is not None:
+            self._output.print("Cannot search videos: Limit must be a positive number")
+            return
+        self.show_search_results(
+            self._video_library.search_tag_sorted(video_tag, count), video_tag)
+
+    def search_videos_tag_query(self, *query):
+        """Display all videos whose tags match a boolean query.
+
+        Args:
+            query: The words of the query, such as "#cat", "AND", "#animal",
+                "NOT", "#dog". Parentheses group terms.
+        """
+        query = " ".join(query)
+        try:
+            matching_videos = self._video_library.search_tag_query(query)
+        except ValueError as e:
+            self._output.print(f"Cannot search videos: {e}")
+            return
+        self.show_search_results(matching_videos, query)
+
+    def show_search_cache(self):
+        """Display the hits and misses of the search result cache."""
+        cache = self._video_library.search_cache
+        lookups = cache.hits + cache.misses
+        hit_rate = cache.hits / lookups * 100 if lookups else 0
+        self._output.print(f"Search cache: {cache.hits} hits, {cache.misses} misses "
+                           f"({hit_rate:.1f}% hit rate), {len(cache)}/{cache.capacity} results")
+
+    def search_videos_fuzzy(self, search_term):
+        """Display the videos whose titles are closest to search_term, best first.
+
+        Typos are tolerated: a title matches when its words are similar to
+        the words of search_term, which may be joined with underscores.
+
+        Args:
+            search_term: The query to be used in search.
+        """
+        matching_videos = self._video_library.search_titles_fuzzy(search_term)
+        if len(matching_videos) == 0:
+            self._output.print(f"No search results for {search_term}")
+            return
+        self._output.print(f"Here are the closest matches for {search_term}:")
+        self._output.print(*(f"{i+1}) {video}" for i, video in enumerate(matching_videos)), sep='\n')
+        self._ask_to_play(matching_videos)
+
+    def reload_library(self):
+        """Applies the changes made to videos.txt since it was loaded.
+
+        Videos removed from the file are stopped and dropped from every
+        playlist. Flags and playlists of the other videos are kept.
         """
-        matching_videos = [video for video in self._video_library.get_all_videos()
-                           if video_tag.lower() in video.tags and video.flagged is None]
-        self.show_search_results(matching_videos, video_tag)
+        if not self._video_library.can_reload:
+            self._output.print("Cannot reload library: The library cannot be reloaded")
+            return
+        try:
+            diff = self._video_library.reload()
+        except ValueError as e:
+            self._output.print(f"Cannot reload library: {e}")
+            return
+        removed = set(diff.removed)
+        if self._currently_playing is not None and self._currently_playing.video_id in removed:
+            self.stop_video()
+        for playlist in self._playlists.values():
+            for video_id in removed:
+                if video_id in playlist:
+                    playlist.remove_video(playlist.video(video_id))
+        self._output.print(f"Reloaded library: {len(diff.added)} added, "
+                           f"{len(diff.removed)} removed, {len(diff.updated)} updated")
+
+    def reload_library_if_changed(self):
+        """Reloads the library if videos.txt was modified since it was loaded."""
+        if self._video_library.can_reload and self._video_library.has_changed():
+            self.reload_library()
 
     def flag_video(self, video_id, flag_reason=""):
         """Mark a video as flagged.
@@ -253,14 +595,15 @@ class VideoPlayer:
             flag_reason = flag_reason.replace(" ", "_")
 
         if video is None:
-            print("Cannot flag video: Video does not exist")
+            self._output.print("Cannot flag video: Video does not exist")
         elif video.flagged is not None:
-            print("Cannot flag video: Video is already flagged")
+            self._output.print("Cannot flag video: Video is already flagged")
         else:
             if self._currently_playing == video:
                 self.stop_video()
-            print(f"Successfully flagged video: {video.title} (reason: {flag_reason})")
+            self._output.print(f"Successfully flagged video: {video.title} (reason: {flag_reason})")
             video.flag(flag_reason)
+            self._log("FLAG_VIDEO", video_id, flag_reason)
 
     def allow_video(self, video_id):
         """Removes a flag from a video.
@@ -271,9 +614,23 @@ class VideoPlayer:
         video = self._video_library.get_video(video_id)
 
         if video is None:
-            print(f"Cannot remove flag from video: Video does not exist")
+            self._output.print(f"Cannot remove flag from video: Video does not exist")
         elif video.flagged is None:
-            print(f"Cannot remove flag from video: Video is not flagged")
+            self._output.print(f"Cannot remove flag from video: Video is not flagged")
         else:
             video.allow()
-            print(f"Successfully removed flag from video: {video.title}")
+            self._log("ALLOW_VIDEO", video_id)
+            self._output.print(f"Successfully removed flag from video: {video.title}")
+
+    def flagged_count(self):
+        """Shows how many videos are flagged."""
+        self._output.print(f"{self._video_library.flagged_count()} flagged videos")
+
+    def show_flagged(self):
+        """Lists every flagged video with its flag reason."""
+        flagged_videos = self._video_library.get_flagged_videos()
+        if not flagged_videos:
+            self._output.print("No flagged videos")
+        else:
+            self._output.print("Here's a list of all flagged videos:")
+            self._output.print(*flagged_videos, sep='\n')
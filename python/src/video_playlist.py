@@ -1,30 +1,236 @@
 """A video playlist class."""
 
+# Maximum number of video_ids in one block of a playlist.
+BLOCK_SIZE = 512
+
+
+class _Block:
+    """A run of consecutive video_ids of a playlist."""
+
+    __slots__ = ("video_ids", "index")
+
+    def __init__(self, video_ids, index):
+        self.video_ids = video_ids
+        # The position of the block in the playlist's list of blocks.
+        self.index = index
+
 
 class Playlist:
-    """A class used to represent a Playlist."""
+    """A class used to represent a Playlist.
+
+    The order of the videos is kept in a list of blocks of at most
+    BLOCK_SIZE video_ids, with a Fenwick tree over the sizes of the blocks.
+    Finding the video at a position, or the position of a video, walks the
+    tree in O(log n) and then indexes or scans one block, so inserting,
+    removing and moving a video anywhere only shifts the ids of one block.
+    Positions are counted from 0.
+    """
 
     def __init__(self, title):
         self._title = title
         self._videos = {}
+        self._block_of = {}
+        self._blocks = []
+        self._tree = [0]
 
     @property
     def title(self):
         return self._title
 
-    @property
-    def videos(self):
-        return self._videos
+    def __len__(self):
+        return len(self._videos)
 
-    def add_video(self, video):
-        self._videos[video.video_id] = video
+    def __contains__(self, video_id):
+        return video_id in self._videos
+
+    def __iter__(self):
+        """Iterates over the videos in playlist order."""
+        videos = self._videos
+        for block in self._blocks:
+            for video_id in block.video_ids:
+                yield videos[video_id]
+
+    def video_ids(self):
+        """Returns the video_ids in playlist order."""
+        return [video_id for block in self._blocks for video_id in block.video_ids]
+
+    def video(self, video_id):
+        """Returns the video with the given video_id, None if it is not in the playlist."""
+        return self._videos.get(video_id)
+
+    def _rebuild(self):
+        """Renumbers the blocks and rebuilds the tree after blocks were split or merged."""
+        tree = [0] * (len(self._blocks) + 1)
+        for index, block in enumerate(self._blocks):
+            block.index = index
+            node = index + 1
+            tree[node] += len(block.video_ids)
+            parent = node + (node & -node)
+            if parent < len(tree):
+                tree[parent] += tree[node]
+        self._tree = tree
+
+    def _resize(self, index, delta):
+        """Adds delta to the size of the block at index in the tree."""
+        tree = self._tree
+        node = index + 1
+        while node < len(tree):
+            tree[node] += delta
+            node += node & -node
+
+    def _before(self, index):
+        """Returns the number of video_ids in the blocks before index."""
+        tree = self._tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def _locate(self, position):
+        """Returns (block, offset) of the video_id at position, 0 <= position < len."""
+        tree = self._tree
+        index = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            node = index + step
+            if node < len(tree) and tree[node] <= position:
+                index = node
+                position -= tree[node]
+            step >>= 1
+        return self._blocks[index], position
+
+    def position(self, video_id):
+        """Returns the position of a video in the playlist, None if it is not in it."""
+        block = self._block_of.get(video_id)
+        if block is None:
+            return None
+        return self._before(block.index) + block.video_ids.index(video_id)
 
-    def remove_video(self, video, playlist_name):
-        deleted = self._videos.pop(video.video_id, None)
-        if deleted is None:
-            print(f"Cannot remove video from {playlist_name}: Video is not in playlist")
+    def _insert(self, position, video_id):
+        if not self._blocks:
+            block = _Block([video_id], 0)
+            self._blocks.append(block)
+            self._block_of[video_id] = block
+            self._rebuild()
+            return
+        if position == len(self._videos) - 1:
+            block, offset = self._blocks[-1], len(self._blocks[-1].video_ids)
         else:
-            print(f"Removed video from {playlist_name}: {video.title}")
+            block, offset = self._locate(position)
+        block.video_ids.insert(offset, video_id)
+        self._block_of[video_id] = block
+        if len(block.video_ids) > BLOCK_SIZE:
+            half = _Block(block.video_ids[BLOCK_SIZE // 2:], block.index + 1)
+            del block.video_ids[BLOCK_SIZE // 2:]
+            for moved in half.video_ids:
+                self._block_of[moved] = half
+            self._blocks.insert(half.index, half)
+            self._rebuild()
+        else:
+            self._resize(block.index, 1)
+
+    def _remove(self, video_id):
+        block = self._block_of.pop(video_id)
+        block.video_ids.remove(video_id)
+        following = block.index + 1
+        if not block.video_ids:
+            del self._blocks[block.index]
+            self._rebuild()
+        elif (following < len(self._blocks) and len(block.video_ids)
+              + len(self._blocks[following].video_ids) <= BLOCK_SIZE // 2):
+            # Merging small neighbours keeps the number of blocks O(n / BLOCK_SIZE).
+            merged = self._blocks.pop(following)
+            block.video_ids.extend(merged.video_ids)
+            for moved in merged.video_ids:
+                self._block_of[moved] = block
+            self._rebuild()
+        else:
+            self._resize(block.index, -1)
+
+    def add_video(self, video):
+        """Appends a video, or replaces it if it is already in the playlist."""
+        self.insert_video(len(self._videos), video)
+
+    def insert_video(self, position, video):
+        """Inserts a video before the given position, len(self) to append.
+
+        A video already in the playlist is replaced where it is.
+        """
+        video_id = video.video_id
+        if video_id in self._videos:
+            self._videos[video_id] = video
+            return
+        if not 0 <= position <= len(self._videos):
+            raise IndexError(f"position {position} out of range")
+        self._videos[video_id] = video
+        self._insert(position, video_id)
+
+    def remove_video(self, video):
+        """Removes a video, returning False if it was not in the playlist."""
+        video_id = video.video_id
+        if self._videos.pop(video_id, None) is None:
+            return False
+        self._remove(video_id)
+        return True
+
+    def move_video(self, video_id, position):
+        """Moves a video of the playlist to the given position.
+
+        Raises:
+            KeyError: If the video is not in the playlist.
+            IndexError: If position is not between 0 and len(self) - 1.
+        """
+        if video_id not in self._videos:
+            raise KeyError(video_id)
+        if not 0 <= position < len(self._videos):
+            raise IndexError(f"position {position} out of range")
+        video = self._videos.pop(video_id)
+        self._remove(video_id)
+        self._videos[video_id] = video
+        self._insert(position, video_id)
+
+    def clear(self):
+        self._videos = {}
+        self._block_of = {}
+        self._blocks = []
+        self._tree = [0]
+
+    def range(self, start, count):
+        """Returns up to count videos from position start on, in O(log n + count)."""
+        videos = []
+        if not 0 <= start < len(self._videos):
+            return videos
+        block, offset = self._locate(start)
+        for index in range(block.index, len(self._blocks)):
+            video_ids = self._blocks[index].video_ids
+            for video_id in video_ids[offset:offset + count - len(videos)]:
+                videos.append(self._videos[video_id])
+            if len(videos) == count:
+                break
+            offset = 0
+        return videos
+
+    def page(self, first_video_id, count):
+        """Returns a page of the playlist in O(log n + count).
+
+        Args:
+            first_video_id: The video_id the page starts at, None for the
+                first page.
+            count: The maximum number of videos on the page.
+
+        Returns:
+            The list of videos on the page and the video_id the next page
+            starts at, None if this is the last page. The list is None if
+            first_video_id is not in the playlist.
+        """
+        start = 0 if first_video_id is None else self.position(first_video_id)
+        if start is None:
+            return None, None
+        videos = self.range(start, count + 1)
+        if len(videos) > count:
+            return videos[:count], videos[count].video_id
+        return videos, None
 
     def __str__(self):
         return self.title
@@ -0,0 +1,54 @@
+import os
+
+from src.binary_catalog import BinaryCatalog, compile_catalog, compiled_path
+from src.video_library import VIDEOS_FILE, VideoLibrary, read_rows
+
+
+def _compile(tmp_path, text=None):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text(text if text is not None else VIDEOS_FILE.read_text())
+    compile_catalog(read_rows(video_file), compiled_path(video_file))
+    return video_file
+
+
+def test_binary_catalog_round_trips_every_row(tmp_path):
+    video_file = _compile(tmp_path)
+    catalog = BinaryCatalog(compiled_path(video_file))
+    expected = [(title, url, tuple(tags)) for title, url, tags in read_rows(video_file)]
+    assert len(catalog) == 5
+    assert [row[1:] for row in catalog.rows()] == expected
+    for ordinal, (_, url, _) in enumerate(expected):
+        assert catalog.ordinal(url) == ordinal
+    assert catalog.ordinal("does_not_exist") is None
+    assert list(catalog.lookup("#ANIMAL")) == [0, 1, 2]
+    assert list(catalog.lookup("#bird")) == []
+
+
+def test_library_uses_compiled_catalog_when_newer(tmp_path):
+    video_file = _compile(tmp_path)
+    library = VideoLibrary(video_file)
+    assert isinstance(library._catalog, BinaryCatalog)
+    eager = VideoLibrary()
+    assert [str(video) for video in library.get_all_videos()] == \
+        [str(video) for video in eager.get_all_videos()]
+    assert [video.video_id for video in library.search_titles("cat")] == \
+        [video.video_id for video in eager.search_titles("cat")]
+    assert [video.video_id for video in library.search_tag("#dog")] == \
+        ["funny_dogs_video_id"]
+
+
+def test_library_ignores_stale_compiled_catalog(tmp_path):
+    video_file = _compile(tmp_path)
+    compiled = compiled_path(video_file)
+    os.utime(compiled, (0, 0))
+    library = VideoLibrary(video_file)
+    assert not isinstance(library._catalog, BinaryCatalog)
+
+
+def test_compiler_keeps_last_duplicate_row(tmp_path):
+    video_file = _compile(tmp_path, "First | dup_id | #a\n"
+                                    "Other | other_id |\n"
+                                    "Second | dup_id | #b\n")
+    library = VideoLibrary(video_file)
+    assert [video.title for video in library.get_all_videos()] == ["Second", "Other"]
+    assert library.search_tag("#a") == []
@@ -0,0 +1,43 @@
+import pytest
+
+from src.command_parser import CommandException, CommandParser
+from src.video_player import VideoPlayer
+
+
+def test_commands_are_case_insensitive(capfd):
+    parser = CommandParser(VideoPlayer())
+    parser.execute_command(["number_of_videos"])
+    parser.execute_command(["Play", "amazing_cats_video_id"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines == ["5 videos in the library", "Playing video: Amazing Cats"]
+
+
+def test_wrong_number_of_arguments_raises():
+    parser = CommandParser(VideoPlayer())
+    with pytest.raises(CommandException, match="followed by video_id"):
+        parser.execute_command(["PLAY"])
+    with pytest.raises(CommandException, match="optional flag reason"):
+        parser.execute_command(["FLAG_VIDEO", "a", "b", "c"])
+
+
+def test_unknown_command(capfd):
+    parser = CommandParser(VideoPlayer())
+    parser.execute_command(["DANCE"])
+    out, err = capfd.readouterr()
+    assert "Please enter a valid command" in out
+
+
+def test_registered_commands_are_dispatched_and_listed(capfd):
+    parser = CommandParser(VideoPlayer())
+    calls = []
+    parser.register_command("ECHO", lambda *args: calls.append(args), (1, 2),
+                            "Please enter ECHO followed by one or two words.",
+                            "ECHO <word> [<word>] - Echoes words.")
+    parser.execute_command(["echo", "hi"])
+    parser.execute_command(["ECHO", "hi", "there"])
+    assert calls == [("hi",), ("hi", "there")]
+
+    parser.execute_command(["HELP"])
+    out, err = capfd.readouterr()
+    assert "    ECHO <word> [<word>] - Echoes words." in out.splitlines()
@@ -0,0 +1,59 @@
+import json
+
+from src.command_parser import CommandParser
+from src.command_stats import CommandStats, bucket_limit, bucket_of
+from src.output import BufferWriter
+from src.video_player import VideoPlayer
+
+
+def test_buckets_are_ordered_and_within_an_eighth():
+    previous = 0
+    for nanoseconds in range(0, 100000, 7):
+        bucket = bucket_of(nanoseconds)
+        assert bucket >= previous
+        assert nanoseconds <= bucket_limit(bucket) <= nanoseconds * 1.125 + 1
+        previous = bucket
+
+
+def test_percentiles():
+    stats = CommandStats()
+    for microseconds in range(1, 101):
+        stats.record("PLAY", microseconds * 1000)
+    stats.record("STOP", 5)
+    summary = stats.summary()
+    assert list(summary) == ["PLAY", "STOP"]
+    assert summary["PLAY"]["calls"] == 100
+    assert summary["PLAY"]["total_s"] == 5050e-6
+    for percent in (50, 95, 99):
+        assert percent * 1e-6 <= summary["PLAY"][f"p{percent}_s"] <= percent * 1.125e-6
+    assert summary["STOP"]["p99_s"] == 5e-9
+
+
+def test_stats_command_shows_executed_commands():
+    output = BufferWriter()
+    parser = CommandParser(VideoPlayer(output=output))
+    parser.execute_command(["STATS"])
+    assert output.drain() == "No commands executed yet\n"
+    parser.execute_command(["play", "amazing_cats_video_id"])
+    parser.execute_command(["PLAY", "funny_dogs_video_id"])
+    parser.execute_command(["DANCE"])
+    output.drain()
+    parser.execute_command(["STATS"])
+    lines = output.drain().splitlines()
+    assert lines[0] == "Command statistics:"
+    assert len(lines) == 3
+    assert lines[1].startswith("  PLAY: 2 calls, ") or lines[2].startswith("  PLAY: 2 calls, ")
+    # The first STATS is listed too; the second is recorded after it ran.
+    assert parser.stats.summary()["STATS"]["calls"] == 2
+
+
+def test_stats_are_dumped_periodically(tmp_path):
+    path = tmp_path / "stats.json"
+    stats = CommandStats(path, dump_interval=0)
+    stats.record("PLAY", 1000)
+    stats.dump_if_due()
+    assert json.loads(path.read_text())["PLAY"]["calls"] == 1
+    stats = CommandStats(path, dump_interval=3600)
+    stats.record("STOP", 1000)
+    stats.dump_if_due()
+    assert "STOP" not in json.loads(path.read_text())
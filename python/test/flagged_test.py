@@ -0,0 +1,61 @@
+from src.command_parser import CommandParser
+from src.output import BufferWriter
+from src.session_overlay import SessionLibrary
+from src.video_library import VideoLibrary, without_flagged
+from src.video_player import VideoPlayer
+
+
+def test_without_flagged():
+    assert without_flagged(range(5), {}.keys()) == [0, 1, 2, 3, 4]
+    assert without_flagged([4, 1, 3], {1: "x", 4: "y"}.keys()) == [3]
+
+
+def test_flagged_count_and_show_flagged():
+    output = BufferWriter()
+    player = VideoPlayer(output=output, interactive=False)
+    parser = CommandParser(player, output)
+    parser.execute_command(["FLAGGED_COUNT"])
+    parser.execute_command(["SHOW_FLAGGED"])
+    parser.execute_command(["FLAG_VIDEO", "nothing_video_id", "boring"])
+    parser.execute_command(["FLAG_VIDEO", "amazing_cats_video_id"])
+    output.drain()
+    parser.execute_command(["FLAGGED_COUNT"])
+    parser.execute_command(["SHOW_FLAGGED"])
+    assert output.drain().splitlines() == [
+        "2 flagged videos",
+        "Here's a list of all flagged videos:",
+        "Amazing Cats (amazing_cats_video_id) [#cat #animal] - FLAGGED (reason: Not supplied)",
+        "Video about nothing (nothing_video_id) [] - FLAGGED (reason: boring)",
+    ]
+    parser.execute_command(["ALLOW_VIDEO", "nothing_video_id"])
+    output.drain()
+    parser.execute_command(["FLAGGED_COUNT"])
+    assert output.drain() == "1 flagged videos\n"
+
+
+def test_no_flagged_videos():
+    output = BufferWriter()
+    player = VideoPlayer(output=output, interactive=False)
+    player.flagged_count()
+    player.show_flagged()
+    assert output.drain() == "0 flagged videos\nNo flagged videos\n"
+
+
+def test_session_flag_count_applies_its_changes():
+    library = VideoLibrary()
+    library.get_video("amazing_cats_video_id").flag("dont_like_cats")
+    library.get_video("funny_dogs_video_id").flag("dont_like_dogs")
+    session = SessionLibrary(library)
+    session.get_video("amazing_cats_video_id").allow()
+    session.get_video("nothing_video_id").flag("boring")
+    session.get_video("another_cat_video_id").flag("duplicate")
+    session.get_video("another_cat_video_id").allow()
+    assert session.flagged_count() == 2
+    assert [video.video_id for video in session.get_flagged_videos()] == [
+        "funny_dogs_video_id", "nothing_video_id"]
+    # A flag the shared library adds later is counted once.
+    library.get_video("nothing_video_id").flag("boring")
+    assert session.flagged_count() == 2
+    assert library.flagged_count() == 3
+    assert [video.video_id for video in session.search_tag_sorted("#animal")] == [
+        "amazing_cats_video_id", "another_cat_video_id"]
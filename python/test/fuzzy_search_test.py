@@ -0,0 +1,109 @@
+import os
+
+from src.output import BufferWriter
+from src.search_index import FuzzyIndex
+from src.session_overlay import SessionLibrary
+from src.video_library import DUPLICATES_FIRST, VideoLibrary
+from src.video_player import VideoPlayer
+from unittest import mock
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+def test_typos_are_tolerated():
+    library = VideoLibrary()
+    assert _ids(library.search_titles_fuzzy("amazng")) == ["amazing_cats_video_id"]
+    assert _ids(library.search_titles_fuzzy("GOGGLE")) == ["life_at_google_video_id"]
+    assert _ids(library.search_titles_fuzzy("vidoe")) == [
+        "another_cat_video_id", "nothing_video_id"]
+    assert library.search_titles_fuzzy("xyz") == []
+    assert library.search_titles_fuzzy("") == []
+
+
+def test_results_are_ranked_by_similarity():
+    index = FuzzyIndex()
+    index.add(0, "Catalog of things")
+    index.add(1, "Cats")
+    index.add(2, "Cat")
+    index.add(3, "Dogs")
+    assert [ordinal for _, ordinal in index.search("cat", 10, 0.4)] == [2, 1, 0]
+    assert [ordinal for _, ordinal in index.search("cat", 1, 0.4)] == [2]
+    assert [ordinal for _, ordinal in index.search("cat", 10, 0.4, exclude={2})] == [1, 0]
+
+
+def test_every_word_of_the_term_counts():
+    index = FuzzyIndex()
+    index.add(0, "Funny Cats")
+    index.add(1, "Funny Dogs")
+    index.add(2, "Sad Dogs")
+    matches = index.search("funy_dogs", 10, 0.4)
+    # An exact word outweighs a misspelt one.
+    assert [ordinal for _, ordinal in matches] == [1, 2, 0]
+    assert matches[0][0] > matches[1][0] > matches[2][0]
+
+
+def test_flagged_videos_do_not_count_towards_the_limit():
+    library = VideoLibrary()
+    library.get_video("another_cat_video_id").flag("duplicate")
+    assert _ids(library.search_titles_fuzzy("video", limit=1)) == ["nothing_video_id"]
+
+    session = SessionLibrary(library)
+    session.get_video("nothing_video_id").flag("boring")
+    session.get_video("another_cat_video_id").allow()
+    assert _ids(session.search_titles_fuzzy("video")) == ["another_cat_video_id"]
+
+
+def test_reload_updates_the_fuzzy_index(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text("Amazing Cats | amazing_cats_video_id |  #cat\n"
+                          "Funny Dogs | funny_dogs_video_id |  #dog\n")
+    library = VideoLibrary(video_file)
+    assert _ids(library.search_titles_fuzzy("amazng")) == ["amazing_cats_video_id"]
+
+    video_file.write_text("Boring Cats | amazing_cats_video_id |  #cat\n"
+                          "Amazing Dogs | amazing_dogs_video_id |  #dog\n")
+    status = os.stat(video_file)
+    os.utime(video_file, ns=(status.st_atime_ns, status.st_mtime_ns + 10 ** 9))
+    library.reload()
+    assert _ids(library.search_titles_fuzzy("amazng")) == ["amazing_dogs_video_id"]
+    assert library.search_titles_fuzzy("funy") == []
+
+
+def test_lazy_library_indexes_the_kept_row_of_a_duplicate(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text("Amazing Cats | cats_video_id |  #cat\n"
+                          "Funny Dogs | dogs_video_id |  #dog\n"
+                          "Boring Cats | cats_video_id |  #cat\n")
+    library = VideoLibrary(video_file, lazy=True)
+    assert library.search_titles_fuzzy("amazng") == []
+    assert _ids(library.search_titles_fuzzy("borng")) == ["cats_video_id"]
+    first = VideoLibrary(video_file, lazy=True, duplicates=DUPLICATES_FIRST)
+    assert _ids(first.search_titles_fuzzy("amazng")) == ["cats_video_id"]
+    assert first.search_titles_fuzzy("borng") == []
+    assert first.search_title_ordinals("boring") == []
+
+
+@mock.patch('builtins.input', lambda *args: '2')
+def test_search_videos_fuzzy_and_play_answer(capfd):
+    player = VideoPlayer()
+    player.search_videos_fuzzy("vidoe")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines == [
+        "Here are the closest matches for vidoe:",
+        "1) Another Cat Video (another_cat_video_id) [#cat #animal]",
+        "2) Video about nothing (nothing_video_id) []",
+        "Would you like to play any of the above? If yes, specify the number of the video.",
+        "If your answer is not a valid number, we will assume it's a no.",
+        "Playing video: Video about nothing",
+    ]
+
+
+def test_search_videos_fuzzy_no_results():
+    output = BufferWriter()
+    player = VideoPlayer(output=output, interactive=False)
+    player.search_videos_fuzzy("xyz")
+    assert output.drain() == "No search results for xyz\n"
+    assert not player.awaiting_answer
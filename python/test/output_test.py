@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+from src.command_parser import CommandParser
+from src.output import BatchedFileWriter, BufferWriter, OutputWriter
+from src.video_player import VideoPlayer
+
+
+def test_player_and_parser_write_to_the_given_writer(capfd):
+    output = BufferWriter()
+    parser = CommandParser(VideoPlayer(output=output))
+    parser.execute_command(["CREATE_PLAYLIST", "my_playlist"])
+    parser.execute_command(["ADD_TO_PLAYLIST", "my_playlist", "amazing_cats_video_id"])
+    parser.execute_command(["SHOW_PLAYLIST", "my_playlist"])
+    parser.execute_command(["REMOVE_FROM_PLAYLIST", "my_playlist", "funny_dogs_video_id"])
+    parser.execute_command(["UNKNOWN"])
+
+    out, err = capfd.readouterr()
+    assert out == ""
+    assert output.drain().splitlines() == [
+        "Successfully created new playlist: my_playlist",
+        "Added video to my_playlist: Amazing Cats",
+        "Showing playlist: my_playlist",
+        "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "Cannot remove video from my_playlist: Video is not in playlist",
+        "Please enter a valid command, type HELP for a list of available commands.",
+    ]
+    assert output.getvalue() == ""
+
+
+def test_batched_file_writer_writes_in_batches():
+    file = io.StringIO()
+    output = BatchedFileWriter(file, batch_size=10)
+    output.print("abc")
+    assert file.getvalue() == ""
+    output.print("defghij")
+    assert file.getvalue() == "abc\ndefghij\n"
+    output.print("k", "l", sep="-")
+    output.flush()
+    assert file.getvalue() == "abc\ndefghij\nk-l\n"
+
+
+def test_writer_without_write_cannot_be_created():
+    class Incomplete(OutputWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,76 @@
+from src.command_parser import CommandParser
+from src.output import BufferWriter
+from src.video_player import VideoPlayer
+
+
+def _run(*commands):
+    output = BufferWriter()
+    parser = CommandParser(VideoPlayer(output=output))
+    for command in commands:
+        parser.execute_command(command.split())
+    return output.drain().splitlines()
+
+
+def test_show_all_videos_in_pages():
+    lines = _run("SHOW_ALL_VIDEOS 2")
+    assert lines[:3] == [
+        "Here's a list of all available videos:",
+        "Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "Another Cat Video (another_cat_video_id) [#cat #animal]",
+    ]
+    assert lines[3].startswith("Next page: SHOW_ALL_VIDEOS 2 ")
+
+    pages = [lines]
+    while pages[-1][-1].startswith("Next page: "):
+        pages.append(_run(pages[-1][-1][len("Next page: "):]))
+    shown = [line for page in pages for line in page
+             if not line.startswith(("Here's", "Next page"))]
+    assert shown == _run("SHOW_ALL_VIDEOS")[1:]
+    assert len(pages) == 3
+
+
+def test_show_all_videos_rejects_bad_arguments():
+    assert _run("SHOW_ALL_VIDEOS 0", "SHOW_ALL_VIDEOS 2 not-a-cursor!") == [
+        "Cannot show videos: Page size must be a positive number",
+        "Cannot show videos: Invalid cursor",
+    ]
+
+
+def test_show_playlist_in_pages():
+    setup = ["CREATE_PLAYLIST my_playlist",
+             "ADD_TO_PLAYLIST my_playlist funny_dogs_video_id",
+             "ADD_TO_PLAYLIST my_playlist amazing_cats_video_id",
+             "ADD_TO_PLAYLIST my_playlist nothing_video_id"]
+    lines = _run(*setup, "SHOW_PLAYLIST my_playlist 2",
+                 "SHOW_PLAYLIST my_playlist 2 nothing_video_id",
+                 "SHOW_PLAYLIST my_playlist 2 life_at_google_video_id",
+                 "SHOW_PLAYLIST my_playlist x")
+    assert lines[4:] == [
+        "Showing playlist: my_playlist",
+        "  Funny Dogs (funny_dogs_video_id) [#dog #animal]",
+        "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "Next page: SHOW_PLAYLIST my_playlist 2 nothing_video_id",
+        "Showing playlist: my_playlist",
+        "  Video about nothing (nothing_video_id) []",
+        "Cannot show playlist my_playlist: Invalid cursor",
+        "Cannot show playlist my_playlist: Page size must be a positive number",
+    ]
+
+
+def test_playlist_pages_follow_removals():
+    lines = _run("CREATE_PLAYLIST p",
+                 "ADD_TO_PLAYLIST p funny_dogs_video_id",
+                 "ADD_TO_PLAYLIST p amazing_cats_video_id",
+                 "ADD_TO_PLAYLIST p nothing_video_id",
+                 "REMOVE_FROM_PLAYLIST p amazing_cats_video_id",
+                 "REMOVE_FROM_PLAYLIST p nothing_video_id",
+                 "ADD_TO_PLAYLIST p life_at_google_video_id",
+                 "SHOW_PLAYLIST p 1 life_at_google_video_id",
+                 "SHOW_PLAYLIST p 5")
+    assert lines[-5:] == [
+        "Showing playlist: p",
+        "  Life at Google (life_at_google_video_id) [#google #career]",
+        "Showing playlist: p",
+        "  Funny Dogs (funny_dogs_video_id) [#dog #animal]",
+        "  Life at Google (life_at_google_video_id) [#google #career]",
+    ]
@@ -0,0 +1,78 @@
+import pytest
+
+from src.binary_catalog import compile_catalog, compiled_path
+from src.video_library import (DUPLICATES_ERROR, DUPLICATES_FIRST, VideoLibrary,
+                               line_aligned_ranges, read_rows)
+
+
+def _catalog(path, count, duplicates=()):
+    lines = [f"Video {number} about {'cats' if number % 3 else 'dogs'} | id_{number} | "
+             f"#tag{number % 7} , #all\n" for number in range(count)]
+    for position, number in duplicates:
+        lines.insert(position, f"Replaced {number} | id_{number} | #replaced\n")
+    path.write_text("".join(lines))
+    return path
+
+
+def _state(library):
+    return (len(library), library.get_sorted_lines(),
+            library.search_title_ordinals("cats"), library.search_title_ordinals("9 "),
+            library.search_tag_ordinals("#tag3"), library.search_tag_ordinals("#replaced"),
+            [video.video_id for video in library.get_all_videos()])
+
+
+def test_ranges_start_on_lines(tmp_path):
+    path = _catalog(tmp_path / "videos.txt", 100)
+    data = path.read_bytes()
+    ranges = line_aligned_ranges(path, 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (start, end, first_line), following in zip(ranges, ranges[1:] + [None]):
+        assert start == 0 or data[start - 1:start] == b"\n"
+        assert first_line == data[:start].count(b"\n")
+        if following is not None:
+            assert following[0] == end
+
+
+@pytest.mark.parametrize("duplicates", [(), [(40, 3), (250, 120), (399, 398)]])
+def test_parallel_load_matches_serial_load(tmp_path, duplicates):
+    path = _catalog(tmp_path / "videos.txt", 400, duplicates)
+    serial = VideoLibrary(path)
+    parallel = VideoLibrary(path, workers=3)
+    assert _state(parallel) == _state(serial)
+    assert parallel.get_video("id_3").title == serial.get_video("id_3").title
+
+
+def test_duplicate_policies(tmp_path):
+    path = _catalog(tmp_path / "videos.txt", 50, [(40, 3)])
+    assert VideoLibrary(path).get_video("id_3").title == "Replaced 3"
+    for workers in (1, 2):
+        first = VideoLibrary(path, workers=workers, duplicates=DUPLICATES_FIRST)
+        assert first.get_video("id_3").title == "Video 3 about dogs"
+        assert first.search_tag_ordinals("#replaced") == []
+        with pytest.raises(ValueError, match="id_3 appears more than once"):
+            VideoLibrary(path, workers=workers, duplicates=DUPLICATES_ERROR)
+
+
+def test_lazy_duplicate_policies(tmp_path):
+    path = _catalog(tmp_path / "videos.txt", 50, [(40, 3)])
+    assert VideoLibrary(path, lazy=True).get_video("id_3").title == "Replaced 3"
+    first = VideoLibrary(path, lazy=True, duplicates=DUPLICATES_FIRST)
+    assert first.get_video("id_3").title == "Video 3 about dogs"
+    with pytest.raises(ValueError, match="id_3 appears more than once"):
+        VideoLibrary(path, lazy=True, duplicates=DUPLICATES_ERROR)
+
+
+def test_compiled_catalog_is_only_used_for_the_last_row_policy(tmp_path):
+    path = _catalog(tmp_path / "videos.txt", 50, [(40, 3)])
+    compile_catalog(read_rows(path), compiled_path(path))
+    assert VideoLibrary(path).get_video("id_3").title == "Replaced 3"
+    first = VideoLibrary(path, duplicates=DUPLICATES_FIRST)
+    assert first.get_video("id_3").title == "Video 3 about dogs"
+    with pytest.raises(ValueError, match="id_3 appears more than once"):
+        VideoLibrary(path, duplicates=DUPLICATES_ERROR)
+
+
+def test_lazy_load_rejects_workers(tmp_path):
+    path = _catalog(tmp_path / "videos.txt", 10)
+    with pytest.raises(ValueError, match="more than one worker"):
+        VideoLibrary(path, lazy=True, workers=2)
@@ -0,0 +1,151 @@
+from src.output import BufferWriter
+from src.persistence import WriteAheadLog, snapshot_path, write_snapshot
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def _player(library, log):
+    return VideoPlayer(library, BufferWriter(), state_log=log)
+
+
+def test_log_round_trips_records(tmp_path):
+    log = WriteAheadLog(tmp_path / "state.log", fsync_every=2)
+    log.append("CREATE_PLAYLIST", "my_playlist")
+    log.append("ADD_TO_PLAYLIST", "my_playlist", "video_id")
+    log.close()
+    log = WriteAheadLog(tmp_path / "state.log")
+    assert list(log.records()) == [
+        ("CREATE_PLAYLIST", "my_playlist"),
+        ("ADD_TO_PLAYLIST", "my_playlist", "video_id")]
+    log.close()
+
+
+def test_torn_last_record_is_dropped(tmp_path):
+    path = tmp_path / "state.log"
+    path.write_bytes(b"CREATE_PLAYLIST\ta\nCREATE_PLAY")
+    log = WriteAheadLog(path)
+    log.append("CREATE_PLAYLIST", "b")
+    assert list(log.records()) == [("CREATE_PLAYLIST", "a"), ("CREATE_PLAYLIST", "b")]
+    log.close()
+
+
+def test_playlists_survive_a_restart(tmp_path):
+    library = VideoLibrary()
+    log = WriteAheadLog(tmp_path / "state.log")
+    player = _player(library, log)
+    player.create_playlist("My_Playlist")
+    player.create_playlist("other")
+    player.add_to_playlist("my_playlist", "amazing_cats_video_id")
+    player.add_to_playlist("my_playlist", "funny_dogs_video_id")
+    player.add_to_playlist("my_playlist", "life_at_google_video_id")
+    player.remove_from_playlist("my_playlist", "funny_dogs_video_id")
+    player.add_to_playlist("other", "nothing_video_id")
+    player.clear_playlist("other")
+    player.create_playlist("gone")
+    player.delete_playlist("gone")
+    # Failed commands are not logged.
+    player.add_to_playlist("missing", "amazing_cats_video_id")
+    log.close()
+
+    log = WriteAheadLog(tmp_path / "state.log")
+    assert len(list(log.records())) == 10
+    output = BufferWriter()
+    player = VideoPlayer(library, output, state_log=log)
+    player.show_all_playlists()
+    player.show_playlist("my_playlist")
+    player.show_playlist("other")
+    assert output.drain().splitlines() == [
+        "Showing all playlists:",
+        "My_Playlist",
+        "other",
+        "Showing playlist: my_playlist",
+        "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "  Life at Google (life_at_google_video_id) [#google #career]",
+        "Showing playlist: other",
+        "  No videos here yet",
+    ]
+    log.close()
+
+
+def test_flags_survive_a_restart(tmp_path):
+    log = WriteAheadLog(tmp_path / "state.log")
+    player = _player(VideoLibrary(), log)
+    player.flag_video("amazing_cats_video_id", "dont_like_cats")
+    player.flag_video("funny_dogs_video_id")
+    player.allow_video("funny_dogs_video_id")
+    log.close()
+
+    library = VideoLibrary()
+    log = WriteAheadLog(tmp_path / "state.log")
+    _player(library, log)
+    assert library.get_video("amazing_cats_video_id").flagged == "dont_like_cats"
+    assert library.get_video("funny_dogs_video_id").flagged is None
+    log.close()
+
+
+def test_snapshot_truncates_the_log(tmp_path):
+    log = WriteAheadLog(tmp_path / "state.log", snapshot_every=3)
+    player = _player(VideoLibrary(), log)
+    player.create_playlist("My_Playlist")
+    player.add_to_playlist("my_playlist", "amazing_cats_video_id")
+    player.flag_video("funny_dogs_video_id", "dont_like_dogs")
+    # The third record triggered a snapshot, so only this one is in the log.
+    player.add_to_playlist("my_playlist", "life_at_google_video_id")
+    assert list(log.records()) == [
+        ("ADD_TO_PLAYLIST", "my_playlist", "life_at_google_video_id")]
+    log.close()
+
+    snapshot = WriteAheadLog(tmp_path / "state.log").snapshot()
+    assert snapshot.generation == 1
+    assert snapshot.flags == [("funny_dogs_video_id", "dont_like_dogs")]
+    assert snapshot.playlists == [("My_Playlist", ["amazing_cats_video_id"])]
+
+    library = VideoLibrary()
+    output = BufferWriter()
+    log = WriteAheadLog(tmp_path / "state.log")
+    player = VideoPlayer(library, output, state_log=log)
+    player.show_playlist("my_playlist")
+    assert output.drain().splitlines() == [
+        "Showing playlist: my_playlist",
+        "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "  Life at Google (life_at_google_video_id) [#google #career]",
+    ]
+    assert library.get_video("funny_dogs_video_id").flagged == "dont_like_dogs"
+    log.close()
+
+
+def test_log_older_than_the_snapshot_is_not_replayed(tmp_path):
+    # A crash after the snapshot was written but before the log was truncated.
+    path = tmp_path / "state.log"
+    path.write_bytes(b"CREATE_PLAYLIST\ta\nADD_TO_PLAYLIST\ta\tnothing_video_id\n")
+    write_snapshot(snapshot_path(path), 1, [], [("a", ["nothing_video_id"])])
+    log = WriteAheadLog(path)
+    assert list(log.records()) == []
+    output = BufferWriter()
+    VideoPlayer(VideoLibrary(), output, state_log=log).show_playlist("a")
+    assert output.drain().splitlines() == [
+        "Showing playlist: a",
+        "  Video about nothing (nothing_video_id) []",
+    ]
+    log.close()
+
+
+def test_records_appended_after_a_stale_log_survive_a_restart(tmp_path):
+    path = tmp_path / "state.log"
+    for stale_log in [b"CREATE_PLAYLIST\ta\n", b"SNAPSHOT\t1\nCREATE_PLAYLIST\ta\n"]:
+        path.write_bytes(stale_log)
+        write_snapshot(snapshot_path(path), 2, [], [("a", [])])
+        log = WriteAheadLog(path)
+        player = VideoPlayer(VideoLibrary(), BufferWriter(), state_log=log)
+        player.create_playlist("b")
+        player.flag_video("amazing_cats_video_id", "bad")
+        log.close()
+
+        library = VideoLibrary()
+        output = BufferWriter()
+        log = WriteAheadLog(path)
+        player = VideoPlayer(library, output, state_log=log)
+        player.show_all_playlists()
+        assert output.drain().splitlines() == ["Showing all playlists:", "a", "b"]
+        assert library.get_video("amazing_cats_video_id").flagged == "bad"
+        log.close()
@@ -0,0 +1,32 @@
+from src.playable_pool import PlayablePool
+from src.video_library import VideoLibrary
+
+
+def _pool_contents(pool):
+    return sorted(pool._ordinals)
+
+
+def test_pool_tracks_flag_changes():
+    library = VideoLibrary()
+    pool = PlayablePool(library._catalog)
+    assert _pool_contents(pool) == [0, 1, 2, 3, 4]
+
+    library.get_video("funny_dogs_video_id").flag("reason")
+    library.get_video("nothing_video_id").flag("reason")
+    assert _pool_contents(pool) == [1, 2, 3]
+    for ordinal, position in enumerate(pool._positions):
+        assert position == -1 or pool._ordinals[position] == ordinal
+
+    library.get_video("funny_dogs_video_id").allow()
+    assert _pool_contents(pool) == [0, 1, 2, 3]
+
+
+def test_random_video_is_never_flagged():
+    library = VideoLibrary()
+    for video in library.get_all_videos()[1:]:
+        video.flag("reason")
+    for _ in range(20):
+        assert library.get_random_playable_video().video_id == "funny_dogs_video_id"
+
+    library.get_video("funny_dogs_video_id").flag("reason")
+    assert library.get_random_playable_video() is None
@@ -0,0 +1,147 @@
+import random
+
+import pytest
+
+from src import video_playlist
+from src.command_parser import CommandParser
+from src.output import BufferWriter
+from src.persistence import WriteAheadLog
+from src.video import Video
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+from src.video_playlist import Playlist
+
+
+def _video(number):
+    return Video(f"Video {number}", f"video_{number}_id", [])
+
+
+def test_positional_operations_match_a_list(monkeypatch):
+    # Small blocks make the operations split and merge blocks constantly.
+    monkeypatch.setattr(video_playlist, "BLOCK_SIZE", 4)
+    rng = random.Random(0)
+    playlist, expected = Playlist("p"), []
+    videos = [_video(number) for number in range(60)]
+    for _ in range(2000):
+        video = rng.choice(videos)
+        operation = rng.randrange(4)
+        if operation == 0 and video.video_id not in playlist:
+            position = rng.randint(0, len(expected))
+            playlist.insert_video(position, video)
+            expected.insert(position, video.video_id)
+        elif operation == 1:
+            assert playlist.remove_video(video) == (video.video_id in expected)
+            if video.video_id in expected:
+                expected.remove(video.video_id)
+        elif operation == 2 and video.video_id in playlist:
+            position = rng.randrange(len(expected))
+            playlist.move_video(video.video_id, position)
+            expected.remove(video.video_id)
+            expected.insert(position, video.video_id)
+        elif operation == 3:
+            playlist.add_video(video)
+            if video.video_id not in expected:
+                expected.append(video.video_id)
+        assert playlist.video_ids() == expected
+        start = rng.randint(0, len(expected))
+        assert [v.video_id for v in playlist.range(start, 5)] == expected[start:start + 5]
+        if expected:
+            video_id = rng.choice(expected)
+            assert playlist.position(video_id) == expected.index(video_id)
+
+
+def test_out_of_range_positions_are_rejected():
+    playlist = Playlist("p")
+    playlist.add_video(_video(0))
+    with pytest.raises(IndexError):
+        playlist.insert_video(2, _video(1))
+    with pytest.raises(IndexError):
+        playlist.move_video("video_0_id", 1)
+    with pytest.raises(KeyError):
+        playlist.move_video("video_1_id", 0)
+    assert playlist.position("video_1_id") is None
+
+
+def _run(parser, output, *commands):
+    for command in commands:
+        parser.execute_command(command.split())
+    return output.drain().splitlines()
+
+
+def test_insert_move_and_show_range():
+    output = BufferWriter()
+    parser = CommandParser(VideoPlayer(output=output))
+    lines = _run(parser, output,
+                 "CREATE_PLAYLIST p",
+                 "ADD_TO_PLAYLIST p funny_dogs_video_id",
+                 "ADD_TO_PLAYLIST p amazing_cats_video_id",
+                 "INSERT_AT p 1 nothing_video_id",
+                 "MOVE_IN_PLAYLIST p funny_dogs_video_id 3",
+                 "SHOW_PLAYLIST p 2-5",
+                 "SHOW_PLAYLIST p")
+    assert lines[3:] == [
+        "Inserted video into p at position 1: Video about nothing",
+        "Moved video in p to position 3: Funny Dogs",
+        "Showing playlist: p",
+        "  2) Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "  3) Funny Dogs (funny_dogs_video_id) [#dog #animal]",
+        "Showing playlist: p",
+        "  Video about nothing (nothing_video_id) []",
+        "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "  Funny Dogs (funny_dogs_video_id) [#dog #animal]",
+    ]
+
+
+def test_positional_commands_reject_bad_arguments():
+    output = BufferWriter()
+    parser = CommandParser(VideoPlayer(output=output))
+    _run(parser, output, "CREATE_PLAYLIST p", "ADD_TO_PLAYLIST p funny_dogs_video_id")
+    assert _run(parser, output,
+                "INSERT_AT q 1 nothing_video_id",
+                "INSERT_AT p 1 unknown_video_id",
+                "INSERT_AT p 1 funny_dogs_video_id",
+                "INSERT_AT p 3 nothing_video_id",
+                "INSERT_AT p 0 nothing_video_id",
+                "MOVE_IN_PLAYLIST p nothing_video_id 1",
+                "MOVE_IN_PLAYLIST p funny_dogs_video_id 2",
+                "SHOW_PLAYLIST p 3-1",
+                "SHOW_PLAYLIST p 1-x",
+                "SHOW_PLAYLIST p 5-6") == [
+        "Cannot insert video into q: Playlist does not exist",
+        "Cannot insert video into p: Video does not exist",
+        "Cannot insert video into p: Video already added",
+        "Cannot insert video into p: Position must be between 1 and 2",
+        "Cannot insert video into p: Position must be between 1 and 2",
+        "Cannot move video in p: Video is not in playlist",
+        "Cannot move video in p: Position must be between 1 and 1",
+        "Cannot show playlist p: Invalid range",
+        "Cannot show playlist p: Invalid range",
+        "Showing playlist: p",
+        "  No videos in this range, the playlist has 1",
+    ]
+
+
+@pytest.mark.parametrize("snapshot_every", [0, 3])
+def test_positional_changes_survive_a_restart(tmp_path, snapshot_every):
+    library = VideoLibrary()
+    log = WriteAheadLog(tmp_path / "state.log", snapshot_every=snapshot_every)
+    output = BufferWriter()
+    parser = CommandParser(VideoPlayer(library, output, state_log=log))
+    _run(parser, output,
+         "CREATE_PLAYLIST p",
+         "ADD_TO_PLAYLIST p funny_dogs_video_id",
+         "ADD_TO_PLAYLIST p amazing_cats_video_id",
+         "INSERT_AT p 2 nothing_video_id",
+         "MOVE_IN_PLAYLIST p amazing_cats_video_id 1")
+    log.close()
+
+    log = WriteAheadLog(tmp_path / "state.log")
+    output = BufferWriter()
+    VideoPlayer(library, output, state_log=log).show_playlist("p")
+    assert output.drain().splitlines() == [
+        "Showing playlist: p",
+        "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "  Funny Dogs (funny_dogs_video_id) [#dog #animal]",
+        "  Video about nothing (nothing_video_id) []",
+    ]
+    log.close()
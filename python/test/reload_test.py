@@ -0,0 +1,129 @@
+import os
+
+from src.command_parser import CommandParser
+from src.output import BufferWriter
+from src.session_overlay import SessionLibrary
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+BEFORE = ("Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+          "Amazing Cats | amazing_cats_video_id |  #cat , #animal\n"
+          "Another Cat Video | another_cat_video_id |  #cat , #animal\n"
+          "Life at Google | life_at_google_video_id |  #google , #career\n")
+AFTER = ("Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+         "Amazing Cats and Kittens | amazing_cats_video_id |  #cat , #kitten\n"
+         "Life at Google | life_at_google_video_id |  #google , #career\n"
+         "Cat Tricks | cat_tricks_video_id |  #cat\n")
+
+
+def _write(path, text):
+    path.write_text(text)
+    # Make sure the modification is seen even on coarse mtime clocks.
+    status = os.stat(path)
+    os.utime(path, ns=(status.st_atime_ns, status.st_mtime_ns + 10 ** 9))
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+def test_reload_matches_a_fresh_load(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    _write(video_file, BEFORE)
+    library = VideoLibrary(video_file)
+    library.get_sorted_lines()
+    library.get_video("funny_dogs_video_id").flag("dont_like_dogs")
+    library.get_video("another_cat_video_id").flag("duplicate")
+
+    _write(video_file, AFTER)
+    assert library.has_changed()
+    diff = library.reload()
+    assert not library.has_changed()
+    assert diff.added == ["cat_tricks_video_id"]
+    assert diff.removed == ["another_cat_video_id"]
+    assert diff.updated == ["amazing_cats_video_id"]
+
+    fresh = VideoLibrary(video_file)
+    fresh.get_video("funny_dogs_video_id").flag("dont_like_dogs")
+    assert len(library) == len(fresh) == 4
+    assert library.get_video("another_cat_video_id") is None
+    assert library.get_sorted_lines() == fresh.get_sorted_lines()
+    assert sorted(_ids(library.get_all_videos())) == sorted(_ids(fresh.get_all_videos()))
+    for term in ["cat", "ca", "kitten", "google", "dog", "a"]:
+        assert sorted(_ids(library.search_titles(term))) == sorted(_ids(fresh.search_titles(term)))
+    for tag in ["#cat", "#animal", "#kitten", "#dog"]:
+        assert sorted(_ids(library.search_tag(tag))) == sorted(_ids(fresh.search_tag(tag)))
+    for _ in range(50):
+        assert library.get_random_playable_video().video_id in {
+            "amazing_cats_video_id", "life_at_google_video_id", "cat_tricks_video_id"}
+
+
+def test_reload_command_updates_playlists(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    _write(video_file, BEFORE)
+    output = BufferWriter()
+    player = VideoPlayer(VideoLibrary(video_file), output)
+    parser = CommandParser(player)
+    for command in ["CREATE_PLAYLIST p",
+                    "ADD_TO_PLAYLIST p another_cat_video_id",
+                    "ADD_TO_PLAYLIST p amazing_cats_video_id",
+                    "PLAY another_cat_video_id"]:
+        parser.execute_command(command.split())
+    output.drain()
+
+    _write(video_file, AFTER)
+    parser.execute_command(["RELOAD_LIBRARY"])
+    parser.execute_command(["SHOW_PLAYLIST", "p"])
+    parser.execute_command(["RELOAD_LIBRARY"])
+    assert output.drain().splitlines() == [
+        "Stopping video: Another Cat Video",
+        "Reloaded library: 1 added, 1 removed, 1 updated",
+        "Showing playlist: p",
+        "  Amazing Cats and Kittens (amazing_cats_video_id) [#cat #kitten]",
+        "Reloaded library: 0 added, 0 removed, 0 updated",
+    ]
+
+
+def test_watcher_reloads_only_after_a_change(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    _write(video_file, BEFORE)
+    output = BufferWriter()
+    player = VideoPlayer(VideoLibrary(video_file), output)
+    player.reload_library_if_changed()
+    assert output.drain() == ""
+    _write(video_file, AFTER)
+    player.reload_library_if_changed()
+    assert output.drain() == "Reloaded library: 1 added, 1 removed, 1 updated\n"
+
+
+def test_lazy_library_cannot_be_reloaded(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    _write(video_file, BEFORE)
+    output = BufferWriter()
+    VideoPlayer(VideoLibrary(video_file, lazy=True), output).reload_library()
+    assert output.drain() == "Cannot reload library: The library cannot be reloaded\n"
+
+
+def test_sessions_forget_flag_changes_of_removed_videos(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    _write(video_file, BEFORE)
+    library = VideoLibrary(video_file)
+    library.get_sorted_lines()
+    library.get_video("another_cat_video_id").flag("duplicate")
+    flagging, allowing = SessionLibrary(library), SessionLibrary(library)
+    flagging.get_video("another_cat_video_id").allow()
+    flagging.get_video("funny_dogs_video_id").flag("dont_like_dogs")
+    allowing.get_video("another_cat_video_id").allow()
+
+    _write(video_file, AFTER)
+    library.reload()
+    fresh = VideoLibrary(video_file)
+    fresh.get_video("funny_dogs_video_id").flag("dont_like_dogs")
+    assert flagging.get_sorted_lines() == fresh.get_sorted_lines()
+    assert flagging.get_sorted_page(None, 10) == fresh.get_sorted_lines()
+    assert allowing.get_sorted_lines() == library.get_sorted_lines()
+    assert flagging.flagged_count() == 1
+    assert allowing.flagged_count() == 0
+    assert _ids(flagging.get_flagged_videos()) == ["funny_dogs_video_id"]
+    for _ in range(50):
+        assert allowing.get_random_playable_video().video_id != "another_cat_video_id"
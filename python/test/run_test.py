@@ -0,0 +1,51 @@
+from pathlib import Path
+import json
+import subprocess
+import sys
+
+PYTHON_DIR = Path(__file__).parent.parent
+
+
+def _run_batch(commands, *arguments):
+    return subprocess.run(
+        [sys.executable, "-m", "src.run", "--batch", *arguments],
+        input=commands, capture_output=True, text=True, cwd=PYTHON_DIR)
+
+
+def test_batch_mode_runs_commands_without_prompt(tmp_path):
+    command_file = tmp_path / "commands.txt"
+    command_file.write_text("NUMBER_OF_VIDEOS\nPLAY amazing_cats_video_id\n"
+                            "EXIT\nSTOP\n")
+    result = _run_batch("", str(command_file))
+    assert result.stdout.splitlines() == [
+        "5 videos in the library", "Playing video: Amazing Cats"]
+    assert "Executed 2 commands in" in result.stderr
+
+
+def test_batch_mode_reads_stdin_and_answers_questions():
+    result = _run_batch("SEARCH_VIDEOS cat\n2\nPLAY\n")
+    lines = result.stdout.splitlines()
+    assert "YT>" not in result.stdout
+    assert lines[-2] == "Playing video: Another Cat Video"
+    assert lines[-1] == "Please enter PLAY command followed by video_id."
+    assert "Executed 2 commands in" in result.stderr
+
+
+def test_batch_mode_treats_end_of_input_as_no():
+    result = _run_batch("SEARCH_VIDEOS cat\n")
+    assert result.returncode == 0
+    assert "Traceback" not in result.stderr
+    assert "Playing video" not in result.stdout
+    assert result.stdout.splitlines()[-1] == (
+        "If your answer is not a valid number, we will assume it's a no.")
+    assert "Executed 1 commands in" in result.stderr
+
+
+def test_batch_mode_writes_stats_file(tmp_path):
+    stats_file = tmp_path / "stats.json"
+    result = _run_batch("PLAY amazing_cats_video_id\nSTOP\nSTOP\n",
+                        "--stats-file", str(stats_file))
+    assert result.returncode == 0
+    stats = json.loads(stats_file.read_text())
+    assert stats["STOP"]["calls"] == 2
+    assert stats["PLAY"]["calls"] == 1
@@ -0,0 +1,94 @@
+import os
+
+from src.command_parser import CommandParser
+from src.output import BufferWriter
+from src.search_cache import SearchCache
+from src.session_overlay import SessionLibrary
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_least_recently_used_result_is_evicted():
+    cache = SearchCache(2)
+    assert cache.get("a", 0, lambda: (1,)) == (1,)
+    assert cache.get("b", 0, lambda: (2,)) == (2,)
+    assert cache.get("a", 0, lambda: (0,)) == (1,)
+    assert cache.get("c", 0, lambda: (3,)) == (3,)
+    assert cache.get("b", 0, lambda: (0,)) == (0,)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 4, 2)
+
+
+def test_new_version_drops_every_result():
+    cache = SearchCache()
+    cache.get("a", 0, lambda: (1,))
+    assert cache.get("a", 1, lambda: ()) == ()
+    assert cache.get("a", 1, lambda: (2,)) == ()
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_zero_capacity_caches_nothing():
+    cache = SearchCache(0)
+    cache.get("a", 0, lambda: (1,))
+    assert cache.get("a", 0, lambda: (2,)) == (2,)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 0)
+
+
+def test_queries_are_normalized():
+    library = VideoLibrary()
+    library.search_titles_sorted("CAT")
+    library.search_titles_sorted("cat")
+    library.search_tag_sorted(" #Animal")
+    library.search_tag_sorted("#animal")
+    library.search_tag_sorted("#animal", 1)
+    assert (library.search_cache.hits, library.search_cache.misses) == (2, 3)
+
+
+def test_flag_and_allow_invalidate_results():
+    library = VideoLibrary()
+    cats = ["amazing_cats_video_id", "another_cat_video_id"]
+    assert [video.video_id for video in library.search_tag_sorted("#cat")] == cats
+    library.get_video("amazing_cats_video_id").flag("dont_like_cats")
+    assert [video.video_id for video in library.search_tag_sorted("#cat")] == cats[1:]
+    library.get_video("amazing_cats_video_id").allow()
+    assert [video.video_id for video in library.search_tag_sorted("#cat")] == cats
+    assert library.search_cache.hits == 0
+
+
+def test_reload_invalidates_results(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text("Amazing Cats | amazing_cats_video_id |  #cat\n")
+    library = VideoLibrary(video_file)
+    assert len(library.search_titles_sorted("cat")) == 1
+    video_file.write_text("Amazing Cats | amazing_cats_video_id |  #cat\n"
+                          "Cat Tricks | cat_tricks_video_id |  #cat\n")
+    status = os.stat(video_file)
+    os.utime(video_file, ns=(status.st_atime_ns, status.st_mtime_ns + 10 ** 9))
+    library.reload()
+    assert len(library.search_titles_sorted("cat")) == 2
+
+
+def test_sessions_share_results_until_they_change_a_flag():
+    library = VideoLibrary()
+    first, second = SessionLibrary(library), SessionLibrary(library)
+    first.search_tag_sorted("#cat")
+    second.search_tag_sorted("#cat")
+    assert (library.search_cache.hits, library.search_cache.misses) == (1, 1)
+
+    first.get_video("amazing_cats_video_id").flag("dont_like_cats")
+    assert [video.video_id for video in first.search_tag_sorted("#cat")] == [
+        "another_cat_video_id"]
+    assert len(second.search_tag_sorted("#cat")) == 2
+    assert (library.search_cache.hits, library.search_cache.misses) == (2, 1)
+
+
+def test_search_cache_command():
+    output = BufferWriter()
+    player = VideoPlayer(output=output, interactive=False)
+    parser = CommandParser(player, output)
+    parser.execute_command(["SEARCH_CACHE"])
+    for _ in range(3):
+        parser.execute_command(["SEARCH_VIDEOS", "cat"])
+        player.answer("")
+    output.drain()
+    parser.execute_command(["SEARCH_CACHE"])
+    assert output.drain() == "Search cache: 2 hits, 1 misses (66.7% hit rate), 1/256 results\n"
@@ -0,0 +1,45 @@
+from src.search_index import TagIndex, TitleIndex
+from src.video_library import VideoLibrary
+
+
+def test_candidates_contain_all_matches():
+    index = TitleIndex()
+    index.add(0, "Amazing Cats")
+    index.add(1, "Funny Dogs")
+    index.add(2, "Another Cat Video")
+    assert index.candidates("CAT") == [0, 2]
+    assert index.candidates("dog") == [1]
+    assert index.candidates("zebra") == []
+
+
+def test_short_terms_return_every_ordinal():
+    index = TitleIndex()
+    index.add(0, "Amazing Cats")
+    index.add(1, "Funny Dogs")
+    assert list(index.candidates("a")) == [0, 1]
+    assert list(index.candidates("")) == [0, 1]
+
+
+def test_search_titles_matches_full_scan():
+    library = VideoLibrary()
+    for term in ["cat", "CAT", "a", "", "video", "s a", "xyz", "Life at Google"]:
+        expected = [video for video in library.get_all_videos()
+                    if term.lower() in video.title.lower()]
+        assert library.search_titles(term) == expected
+
+
+def test_tag_lookup_is_case_insensitive():
+    index = TagIndex()
+    index.add(0, ["#cat", "#animal"])
+    index.add(1, ["#Dog", "#animal"])
+    assert list(index.lookup("#ANIMAL")) == [0, 1]
+    assert list(index.lookup("#dog")) == [1]
+    assert list(index.lookup("#bird")) == []
+
+
+def test_search_tag_returns_videos_in_library_order():
+    library = VideoLibrary()
+    videos = library.search_tag("#Animal")
+    assert [video.video_id for video in videos] == [
+        "funny_dogs_video_id", "amazing_cats_video_id", "another_cat_video_id"]
+    assert library.search_tag("cat") == []
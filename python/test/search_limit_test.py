@@ -0,0 +1,50 @@
+from src.command_parser import CommandParser
+from src.output import BufferWriter
+from src.video_player import VideoPlayer
+
+
+def _player():
+    output = BufferWriter()
+    player = VideoPlayer(output=output, interactive=False)
+    return player, CommandParser(player, output), output
+
+
+def test_limit_keeps_the_first_results_in_sorted_order():
+    player, parser, output = _player()
+    parser.execute_command(["SEARCH_VIDEOS_WITH_TAG", "#animal", "2"])
+    assert output.drain().splitlines()[:3] == [
+        "Here are the results for #animal:",
+        "1) Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "2) Another Cat Video (another_cat_video_id) [#cat #animal]",
+    ]
+    player.answer("3")
+    assert output.drain() == ""
+
+
+def test_answer_plays_the_listed_video():
+    # Funny Dogs comes first in the library but last in the listing.
+    player, parser, output = _player()
+    parser.execute_command(["SEARCH_VIDEOS_WITH_TAG", "#animal"])
+    output.drain()
+    player.answer("3")
+    assert output.drain() == "Playing video: Funny Dogs\n"
+
+
+def test_limit_skips_flagged_videos():
+    player, parser, output = _player()
+    parser.execute_command(["FLAG_VIDEO", "amazing_cats_video_id"])
+    output.drain()
+    parser.execute_command(["SEARCH_VIDEOS", "a", "1"])
+    assert output.drain().splitlines()[:2] == [
+        "Here are the results for a:",
+        "1) Another Cat Video (another_cat_video_id) [#cat #animal]",
+    ]
+
+
+def test_invalid_limit():
+    player, parser, output = _player()
+    for limit in ["0", "-1", "two"]:
+        parser.execute_command(["SEARCH_VIDEOS", "cat", limit])
+        parser.execute_command(["SEARCH_VIDEOS_WITH_TAG", "#cat", limit])
+    assert output.drain() == "Cannot search videos: Limit must be a positive number\n" * 6
+    assert not player.awaiting_answer
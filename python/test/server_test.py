@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from src.server import GOODBYE, WELCOME, VideoServer, parse_arguments
+from src.video_library import VideoLibrary
+
+
+async def _talk(port, lines):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write("".join(f"{line}\n" for line in lines).encode())
+    writer.write_eof()
+    output = (await reader.read()).decode()
+    writer.close()
+    return output
+
+
+def _run_sessions(*sessions):
+    async def run():
+        server = await VideoServer(VideoLibrary()).start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(*(_talk(port, lines) for lines in sessions))
+    return asyncio.run(run())
+
+
+def test_sessions_have_separate_playback_state():
+    first, second = _run_sessions(
+        ["PLAY amazing_cats_video_id", "PAUSE", "SHOW_PLAYING", "EXIT"],
+        ["SHOW_PLAYING", "PLAY", "EXIT"])
+    assert first == WELCOME + (
+        "Playing video: Amazing Cats\n"
+        "Pausing video: Amazing Cats\n"
+        "Currently playing: Amazing Cats (amazing_cats_video_id) [#cat #animal] - PAUSED\n"
+    ) + GOODBYE
+    assert second == WELCOME + (
+        "No video is currently playing\n"
+        "Please enter PLAY command followed by video_id.\n"
+    ) + GOODBYE
+
+
+def test_next_line_answers_search_question():
+    output, = _run_sessions(["SEARCH_VIDEOS cat", "2", "SHOW_PLAYING"])
+    lines = output.splitlines()
+    assert lines[-2] == "Playing video: Another Cat Video"
+    assert lines[-1].startswith("Currently playing: Another Cat Video")
+
+
+def test_exit_answers_a_pending_search_question():
+    output, = _run_sessions(["SEARCH_VIDEOS cat", "EXIT", "SHOW_PLAYING", "EXIT"])
+    assert output.endswith("No video is currently playing\n" + GOODBYE)
+
+
+def test_parse_arguments():
+    arguments = parse_arguments(["--unix", "/tmp/yt.sock", "--lazy"])
+    assert arguments.unix == "/tmp/yt.sock"
+    assert arguments.lazy
+    assert parse_arguments([]).port == 8000
+
+
+def test_flags_are_per_session():
+    first, second = _run_sessions(
+        ["FLAG_VIDEO amazing_cats_video_id", "PLAY amazing_cats_video_id", "EXIT"],
+        ["PLAY amazing_cats_video_id", "EXIT"])
+    assert "Cannot play video: Video is currently flagged" in first
+    assert "Playing video: Amazing Cats" in second
+
+
+def test_parse_arguments_rejects_workers_with_lazy(capsys):
+    with pytest.raises(SystemExit):
+        parse_arguments(["--lazy", "--workers", "2"])
+    assert "--workers cannot be combined with --lazy" in capsys.readouterr().err
@@ -0,0 +1,79 @@
+from src.session_overlay import SessionLibrary
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+from src.output import BufferWriter
+
+
+def test_session_flags_do_not_leak():
+    library = VideoLibrary()
+    first, second = SessionLibrary(library), SessionLibrary(library)
+
+    first.get_video("funny_dogs_video_id").flag("dont_like_dogs")
+    assert first.get_video("funny_dogs_video_id").flagged == "dont_like_dogs"
+    assert second.get_video("funny_dogs_video_id").flagged is None
+    assert library.get_video("funny_dogs_video_id").flagged is None
+    assert first._catalog.deltas == {0: "dont_like_dogs"}
+    assert second._catalog.deltas == {}
+
+
+def test_allowing_a_shared_flag_is_session_local():
+    library = VideoLibrary()
+    library.get_video("nothing_video_id").flag("boring")
+    session = SessionLibrary(library)
+    session.get_video("nothing_video_id").allow()
+    assert session.get_video("nothing_video_id").flagged is None
+    assert library.get_video("nothing_video_id").flagged == "boring"
+
+    session.get_video("nothing_video_id").flag("boring")
+    assert session._catalog.deltas == {}
+
+
+def test_session_listing_and_random_pool_use_session_flags():
+    library = VideoLibrary()
+    session = SessionLibrary(library)
+    for video in session.get_all_videos()[1:]:
+        video.flag("reason")
+    lines = session.get_sorted_lines()
+    assert lines == sorted(str(video) for video in session.get_all_videos())
+    assert library.get_sorted_lines() == sorted(
+        str(video) for video in library.get_all_videos())
+    for _ in range(20):
+        assert session.get_random_playable_video().video_id == "funny_dogs_video_id"
+    session.get_video("funny_dogs_video_id").flag("reason")
+    assert session.get_random_playable_video() is None
+    assert library.get_random_playable_video() is not None
+
+
+def test_player_over_session_library():
+    output = BufferWriter()
+    player = VideoPlayer(SessionLibrary(VideoLibrary()), output)
+    player.flag_video("amazing_cats_video_id", "dont_like_cats")
+    player.play_video("amazing_cats_video_id")
+    assert output.drain().splitlines() == [
+        "Successfully flagged video: Amazing Cats (reason: dont_like_cats)",
+        "Cannot play video: Video is currently flagged (reason: dont_like_cats)",
+    ]
+
+
+def test_session_pages_show_session_flags():
+    library = VideoLibrary()
+    session = SessionLibrary(library)
+    session.get_video("amazing_cats_video_id").flag("dont_like_cats")
+    assert session.get_sorted_page(None, 2) == session.get_sorted_lines()[:2]
+    assert session.get_sorted_page(None, 1) == [
+        "Amazing Cats (amazing_cats_video_id) [#cat #animal]"
+        " - FLAGGED (reason: dont_like_cats)"]
+    assert library.get_sorted_page(None, 1) == [
+        "Amazing Cats (amazing_cats_video_id) [#cat #animal]"]
+
+
+def test_session_search_results_use_session_flags():
+    library = VideoLibrary()
+    library.get_video("amazing_cats_video_id").flag("dont_like_cats")
+    session = SessionLibrary(library)
+    session.get_video("amazing_cats_video_id").allow()
+    session.get_video("another_cat_video_id").flag("duplicate")
+    assert [video.video_id for video in session.search_tag_sorted("#animal", 2)] == [
+        "amazing_cats_video_id", "funny_dogs_video_id"]
+    assert [video.video_id for video in library.search_tag_sorted("#animal")] == [
+        "another_cat_video_id", "funny_dogs_video_id"]
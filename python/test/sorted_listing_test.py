@@ -0,0 +1,92 @@
+from src.video_library import VideoLibrary
+
+
+def _expected(library):
+    return sorted(str(video) for video in library.get_all_videos())
+
+
+def test_listing_matches_sorted_rendering():
+    library = VideoLibrary()
+    assert library.get_sorted_lines() == _expected(library)
+
+
+def test_flag_and_allow_patch_the_listing():
+    library = VideoLibrary()
+    lines = library.get_sorted_lines()
+    video = library.get_video("another_cat_video_id")
+
+    video.flag("dont_like_cats")
+    assert library.get_sorted_lines() is lines
+    assert lines[1] == ("Another Cat Video (another_cat_video_id) [#cat #animal]"
+                        " - FLAGGED (reason: dont_like_cats)")
+    assert lines == _expected(library)
+
+    video.allow()
+    assert library.get_sorted_lines() == _expected(library)
+
+
+def test_line_is_moved_when_it_no_longer_fits(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text("A | a | #x\n"
+                          "A (a) [#x] - B | b |\n"
+                          "A (a) [#x] - C | c |\n"
+                          "Z | z |\n")
+    library = VideoLibrary(video_file)
+    lines = library.get_sorted_lines()
+    listing = library._listing
+
+    library.get_video("a").flag("reason")
+    assert library.get_sorted_lines() is lines
+    assert lines == _expected(library)
+    for position, ordinal in enumerate(listing._order):
+        assert listing._positions[ordinal] == position
+
+    library.get_video("a").allow()
+    assert library.get_sorted_lines() is lines
+    assert lines == _expected(library)
+    assert list(listing._order) == [0, 1, 2, 3]
+
+
+def test_pages_cover_the_listing():
+    library = VideoLibrary()
+    expected = _expected(library)
+    pages, after = [], None
+    while True:
+        page = library.get_sorted_page(after, 2)
+        if not page:
+            break
+        pages.append(page)
+        after = page[-1]
+    assert pages == [expected[0:2], expected[2:4], expected[4:]]
+
+
+def test_page_after_a_line_that_moved():
+    library = VideoLibrary()
+    expected = _expected(library)
+    library.get_video("amazing_cats_video_id").flag("reason")
+    # The cursor line is no longer in the listing; the page still follows it.
+    assert library.get_sorted_page(expected[0], 2) == [
+        "Amazing Cats (amazing_cats_video_id) [#cat #animal] - FLAGGED (reason: reason)",
+        expected[1]]
+
+
+def test_page_with_overrides_matches_lines_with():
+    library = VideoLibrary()
+    overrides = {2: "Zzz", 0: "Aaa"}
+    lines = library.get_sorted_lines(overrides)
+    assert library.get_sorted_page(None, 3, overrides) == lines[:3]
+    assert library.get_sorted_page(lines[2], 10, overrides) == lines[3:]
+
+
+def test_smallest_matches_sorting_the_lines():
+    library = VideoLibrary()
+    listing = library._listing
+    library.get_video("amazing_cats_video_id").flag("dont_like_cats")
+    everything = list(range(len(library)))
+    ordered = sorted(everything, key=lambda ordinal: str(library._video_at(ordinal)))
+    assert listing.smallest(everything) == ordered
+    assert listing.smallest(everything, 2) == ordered[:2]
+    assert listing.smallest([4, 0], 1) == [0]
+
+    overrides = {1: "Amazing Cats (amazing_cats_video_id) [#cat #animal]"}
+    assert listing.smallest(everything, 3, overrides) == [1, 2, 0]
@@ -0,0 +1,103 @@
+import pytest
+
+from benchmarks.catalog_generator import write_catalog
+from src.command_parser import CommandParser
+from src.output import BufferWriter
+from src.search_index import normalize_tag
+from src.session_overlay import SessionLibrary
+from src.tag_query import evaluate, parse_tag_query
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def _ids(videos):
+    return [video.video_id for video in videos]
+
+
+def test_precedence_and_implicit_and():
+    assert parse_tag_query("#a OR #b and NOT #c") == (
+        "or", ("tag", "#a"), ("and", ("tag", "#b"), ("not", ("tag", "#c"))))
+    assert parse_tag_query("(#a OR #b) #c") == (
+        "and", ("or", ("tag", "#a"), ("tag", "#b")), ("tag", "#c"))
+
+
+@pytest.mark.parametrize("query, message", [
+    ("", "Expected a tag at the end of the query"),
+    ("#a AND", "Expected a tag at the end of the query"),
+    ("OR #a", "Expected a tag before OR"),
+    ("(#a", "Missing )"),
+    ("#a )", "Unexpected )"),
+])
+def test_malformed_queries(query, message):
+    with pytest.raises(ValueError, match=message.replace(")", r"\)")):
+        parse_tag_query(query)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("#a", [1, 2, 3, 5]),
+    ("#a #b NOT #c", [3]),
+    ("#small AND #a", [2]),
+    ("#a OR #c", [1, 2, 3, 4, 5]),
+    ("#c OR NOT #a", [0, 2, 4, 5, 6]),
+    ("NOT #a", [0, 4, 6]),
+    ("NOT #a AND NOT #c", [0, 6]),
+    ("NOT (#a OR #b)", [6]),
+    ("#missing OR NOT #missing", list(range(7))),
+    ("#a AND #missing", []),
+])
+def test_evaluate_over_posting_lists(query, expected):
+    postings = {"#a": [1, 2, 3, 5], "#b": [0, 2, 3, 4], "#c": [2, 4, 5], "#small": [2, 6]}
+    universe = range(7)
+    assert evaluate(parse_tag_query(query), lambda tag: postings.get(tag, []),
+                    lambda: universe) == expected
+
+
+def test_query_excludes_flagged_videos():
+    library = VideoLibrary()
+    assert _ids(library.search_tag_query("#animal NOT #dog")) == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert _ids(library.search_tag_query("#DOG or #google")) == [
+        "funny_dogs_video_id", "life_at_google_video_id"]
+    assert _ids(library.search_tag_query("NOT #animal")) == [
+        "life_at_google_video_id", "nothing_video_id"]
+
+    library.get_video("amazing_cats_video_id").flag("dont_like_cats")
+    assert _ids(library.search_tag_query("#cat")) == ["another_cat_video_id"]
+    session = SessionLibrary(library)
+    session.get_video("amazing_cats_video_id").allow()
+    session.get_video("another_cat_video_id").flag("duplicate")
+    assert _ids(session.search_tag_query("#cat")) == ["amazing_cats_video_id"]
+
+
+def test_query_matches_set_operations(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    write_catalog(video_file, 2000, seed=3)
+    library = VideoLibrary(video_file)
+    videos = library.get_all_videos()
+    tags = {video.video_id: {normalize_tag(tag) for tag in video.tags} for video in videos}
+    first, second, third = sorted({tag for video_tags in tags.values() for tag in video_tags})[:3]
+
+    expected = sorted(str(video) for video in videos
+                      if (first in tags[video.video_id] or second in tags[video.video_id])
+                      and third not in tags[video.video_id])
+    query = f"({first} OR {second}) AND NOT {third}"
+    assert [str(video) for video in library.search_tag_query(query)] == expected
+
+
+def test_search_videos_with_tag_query_command():
+    output = BufferWriter()
+    player = VideoPlayer(output=output, interactive=False)
+    parser = CommandParser(player, output)
+    parser.execute_command(["SEARCH_VIDEOS_WITH_TAG_QUERY", "#cat", "AND", "#animal"])
+    assert output.drain().splitlines()[:3] == [
+        "Here are the results for #cat AND #animal:",
+        "1) Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "2) Another Cat Video (another_cat_video_id) [#cat #animal]",
+    ]
+    player.answer("2")
+    assert output.drain() == "Playing video: Another Cat Video\n"
+
+    parser.execute_command(["SEARCH_VIDEOS_WITH_TAG_QUERY", "#cat", "NOT"])
+    parser.execute_command(["SEARCH_VIDEOS_WITH_TAG_QUERY", "#bird"])
+    assert output.drain() == ("Cannot search videos: Expected a tag at the end of the query\n"
+                              "No search results for #bird\n")
@@ -24,3 +24,60 @@ def test_parses_video_correctly_without_tags():
     assert video.title == "Video about nothing"
     assert video.video_id == "nothing_video_id"
     assert video.tags == ()
+
+
+def test_lazy_library_builds_videos_on_demand():
+    library = VideoLibrary(lazy=True)
+    assert len(library) == 5
+    assert library._catalog._rows == {}
+
+    video = library.get_video("life_at_google_video_id")
+    assert video.title == "Life at Google"
+    assert video.tags == ("#google", "#career")
+    assert list(library._catalog._rows) == [3]
+    assert library.get_video("does_not_exist") is None
+
+
+def test_lazy_library_matches_eager_library():
+    eager, lazy = VideoLibrary(), VideoLibrary(lazy=True)
+    assert [video.video_id for video in lazy.search_titles("cat")] == \
+        [video.video_id for video in eager.search_titles("cat")]
+    assert [str(video) for video in lazy.get_all_videos()] == \
+        [str(video) for video in eager.get_all_videos()]
+
+
+def test_later_rows_overwrite_duplicate_ids(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text("First | dup_id | #a\n"
+                          "Other | other_id |\n"
+                          "Second | dup_id | #b\n")
+    for lazy in (False, True):
+        library = VideoLibrary(video_file, lazy=lazy)
+        assert len(library) == 2
+        assert [video.title for video in library.get_all_videos()] == [
+            "Second", "Other"]
+        assert library.search_tag("#a") == []
+        assert [video.title for video in library.search_tag("#b")] == ["Second"]
+
+
+def test_videos_are_views_over_the_library():
+    library = VideoLibrary()
+    video = library.get_video("funny_dogs_video_id")
+    assert video == library.get_all_videos()[0]
+    assert not hasattr(video, "__dict__")
+
+    video.flag("dont_like_dogs")
+    assert library.get_video("funny_dogs_video_id").flagged == "dont_like_dogs"
+    video.allow()
+    assert library.get_video("funny_dogs_video_id").flagged is None
+
+
+def test_lazy_library_parses_quoted_delimiters_like_eager(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text('"A|B" | id1 | #a\n'
+                          "Plain | id2 |\n")
+    eager, lazy = VideoLibrary(video_file), VideoLibrary(video_file, lazy=True)
+    assert lazy.get_video("id1").title == "A|B"
+    assert [str(video) for video in lazy.get_all_videos()] == \
+        [str(video) for video in eager.get_all_videos()]
+    lazy._catalog.close()